@@ -0,0 +1,73 @@
+# Result aggregation
+# Vectorized statistics over the per-client results of a simulation run
+#
+# Copyright (c) 2026 ParaOptimizationNS3 contributors
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy of this software and associated documentation files (the "Software"),
+# to deal in the Software without restriction, including without limitation the rights to use, copy, modify, merge, publish, distribute, sublicense,
+# and/or sell copies of the Software, and to permit persons to whom the Software is furnished to do so, subject to the following conditions:
+# The above copyright notice and this permission notice shall be included in all copies or substantial portions of the Software.
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS
+# IN THE SOFTWARE.
+
+#import
+import numpy as np
+
+METRICS=["Throughput", "Min Throughput", "Latency", "Max Latency", "Packet Loss Rate"]	# Columns 3-7 of a runScript row
+PERCENTILES=[5, 50, 95]
+
+#----------------------------------------------------------------------------------------------------------------------------------------------------------
+#			Run Statistics
+#----------------------------------------------------------------------------------------------------------------------------------------------------------
+class RunStats:
+	"Column-wise statistics of the per-client rows of one run, computed in a single pass over a NumPy array of the clients which reported a non-zero throughput. The standard deviations and percentiles, which no cost reads, are computed on first use"
+
+	def __init__(self, output):
+		self.testNo=output[0][0]
+		self.scriptName=output[0][1]
+		metrics=np.array([row[3:8] for row in output], dtype=np.float64).reshape(-1, len(METRICS))
+		metrics=metrics[metrics[:,0]>0]												# Error rows (dummy client 60000) carry zero throughput
+		self.count=len(metrics)
+		self.metrics=metrics
+		self.spread=None															# (std, percentiles), see std and percentiles
+		if self.count>0:
+			self.mean=metrics.mean(axis=0)
+			self.min=metrics.min(axis=0)
+			self.max=metrics.max(axis=0)
+		else:																		# Same values the incremental averages started from
+			self.mean=np.zeros(len(METRICS))
+			self.min=np.array([60000, 60000, 0, 0, 0], dtype=np.float64)
+			self.max=np.zeros(len(METRICS))
+
+	def std(self):
+		"This function returns the standard deviation of each metric over the clients"
+		return self.spreadStats()[0]
+
+	def percentiles(self):
+		"This function returns the PERCENTILES of each metric over the clients, one row per entry of PERCENTILES"
+		return self.spreadStats()[1]
+
+	def spreadStats(self):
+		"This function computes the standard deviations and percentiles together in one pass over the metrics array, on the first call only"
+		if self.spread is None:
+			if self.count>0:
+				self.spread=(self.metrics.std(axis=0), np.percentile(self.metrics, PERCENTILES, axis=0))
+			else:
+				self.spread=(np.zeros(len(METRICS)), np.zeros((len(PERCENTILES), len(METRICS))))
+		return self.spread
+
+	def averagedMetrics(self):
+		"This function returns the 10 metrics of an Av_Results row: (avAvThroughput, minAvThroughput, avMinThroughput, minMinThroughput, avAvLatency, maxAvLatency, avMaxLatency, maxMaxLatency, avPackLossRate, maxPackLossRate)"
+		mean=[round(float(value),3) for value in self.mean]
+		return (mean[0], float(self.min[0]), mean[1], float(self.min[1]), mean[2], float(self.max[2]), mean[3], float(self.max[3]), mean[4], float(self.max[4]))
+
+	def averagedRow(self, desc):
+		"This function returns the Av_Results row of the run"
+		return [self.testNo, self.scriptName]+list(self.averagedMetrics())+[desc]
+
+	def costMetrics(self):
+		"This function returns the arguments of cost_func (avAvThroughput, minAvThroughput, avAvLatency, maxAvLatency, avPackLossRate)"
+		metrics=self.averagedMetrics()
+		return (metrics[0], metrics[1], metrics[4], metrics[5], metrics[8])
@@ -0,0 +1,273 @@
+#!/usr/bin/env python3
+# Bayesian optimization script
+# Optimizes the tunable parameters of the testbed scripts with a Gaussian process model of the cost, proposing new configurations whenever a simulation slot frees up
+#
+# Copyright (c) 2026 ParaOptimizationNS3 contributors
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy of this software and associated documentation files (the "Software"),
+# to deal in the Software without restriction, including without limitation the rights to use, copy, modify, merge, publish, distribute, sublicense,
+# and/or sell copies of the Software, and to permit persons to whom the Software is furnished to do so, subject to the following conditions:
+# The above copyright notice and this permission notice shall be included in all copies or substantial portions of the Software.
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS
+# IN THE SOFTWARE.
+
+# Uses the parameter space (Get_Param_Space) and executors of genetic_descent.py, and the cost function and runScript of evaluator.py
+
+#import
+import argparse
+import concurrent.futures
+import csv
+import multiprocessing as mp
+import os
+import platform
+import random
+import subprocess
+import time
+
+import numpy as np
+
+import evaluator
+import genetic_descent
+import profiling
+import sim_exec
+from aggregation import RunStats
+from evaluator import ProcessPool, configOptions, cost_func, runScript, runStats, scriptRandom, writeRaw
+from resources import PIN_MODES, ResourceManager
+from result_store import ColumnarStore
+from result_writer import AV_HEADER, ResultWriter
+from scheduler import POLICIES, SharedPool, parseWeights, runCampaign
+from sim_cache import SimCache
+from sim_worker import WorkerPool, parseAddresses
+from surrogate import GaussianProcess, ParamEncoder, expectedImprovement
+
+#----------------------------------------------------------------------------------------------------------------------------------------------------------
+#			BAYESIAN OPTIMIZER (Gaussian process model of the cost with an expected improvement acquisition)
+#----------------------------------------------------------------------------------------------------------------------------------------------------------
+def bayesian_optimizer(scriptName,space,Runs,maxEvals,initialPoints=0,poolSize=1000):
+	"This function accepts a ParamSpace and the number of configurations to simulate, and returns the lowest average cost configuration found by Bayesian optimization"
+	Parameters=space.Parameters
+	values=[space.values(j) for j in range(len(Parameters))]
+	encoder=ParamEncoder(Parameters, values)
+	minVals=[0]*len(Parameters)
+	maxVals=[0]*len(Parameters)
+	for j in range(len(Parameters)):															# Identify minimum and maximum limits
+		if encoder.numeric[j]:
+			minVals[j]=min(values[j])
+			maxVals[j]=max(values[j])
+	if initialPoints==0:
+		initialPoints=max(8, 2*len(Parameters)+2)
+	rng=scriptRandom(scriptName)						# Generator of this script, so scripts optimized in parallel keep their own state
+	initial=[space[i] for i in rng.sample(range(len(space)), min(len(space), initialPoints, maxEvals))]	# Random initial design
+	evaluated={}										# Point -> [sum of run costs, completed runs, client rows of all runs]
+	pending={}											# Point -> runs still running
+	q={}												# Future -> point of every running simulation
+	points=[]											# Point of each genIndex
+	cacheStart=evaluator.simCache.stats() if evaluator.simCache is not None else (0,0)
+	writer=ResultWriter()								# Buffered writer thread for all result files of this optimization
+	if genetic_descent.resultStore is None:
+		writer.create("Raw_Results/Raw_Results_"+scriptName+".csv", genetic_descent.GEN_RAW_HEADER)		# Create Output CSV file in which to store raw results of all simulations for this script
+
+	print("Running {} Bayesian optimization using {} simulation slots".format(scriptName,genetic_descent.simSlots()))	# Terminal Message for visibility of execution
+	with genetic_descent.simExecutor() as executor:			# Parallel execution using as many threads as available cpu cores, or the distributed workers
+		while True:
+			while len(q)<genetic_descent.simSlots() and len(points)<maxEvals:			# Keep every simulation slot busy
+				if len(points)<len(initial):
+					point=initial[len(points)]
+				elif len(evaluated)>=2:
+					phaseStart=time.time()
+					point=proposePoint(encoder, space, evaluated, pending, minVals, maxVals, values, poolSize, rng)
+					profiling.phase("propose", scriptName, phaseStart, evaluated=len(evaluated), pending=len(pending))
+				else:
+					break												# Wait for the initial design before modelling
+				(options, comment)=configOptions(Parameters, point)
+				for j in range(Runs):
+					q[executor.submit(runScript,len(points)+1,scriptName,options+"--RunNo={} ".format(j+1),comment+", and RunNo = {}".format(j+1),len(points))]=point
+				pending[point]=Runs
+				points.append(point)
+
+			if len(q)==0:
+				break
+			(done, running)=concurrent.futures.wait(q, return_when=concurrent.futures.FIRST_COMPLETED)
+			for future in done:
+				point=q.pop(future)
+				output=future.result()
+				if(len(output)==0):
+					print("Bad Output!!!!!!! Due to either malformed/unexpected output or error in parsing. Output is:"+str(output))
+				stats=runStats(output)								# Aggregate the per-client results of this run
+				writeRaw(writer, genetic_descent.resultStore, "Raw_Results/Raw_Results_"+scriptName+".csv", genetic_descent.GEN_RAW_HEADER, output)
+				writer.append("Av_Results/Averaged_Results_"+scriptName+".csv", [stats.averagedRow(output[-1][8])])		# Store averaged results of the simulation for this script
+				cost=cost_func.run(stats)			# Obtain weighted cost from cost function
+				result=evaluated.setdefault(point, [0.0, 0, []])
+				result[0]+=cost
+				result[1]+=1
+				result[2]+=output
+				pending[point]-=1
+				if pending[point]==0:
+					del pending[point]
+
+	ranked=sorted(evaluated, key=lambda point: evaluated[point][0]/evaluated[point][1])
+	if len(ranked)==0:									# Nothing was simulated
+		writer.close()
+		print("No configuration of {} was evaluated".format(scriptName))
+		return ([0, "ERROR", 0, 60000, 0, 60000, 0, 0, 0, 0, 0, 0, "ERROR"], None)
+	optimal=[]
+	for point in ranked[:10]:
+		desc=evaluated[point][2][-1][8].split(', and RunNo')[0]			# Delete RunNo trailer from result description string
+		optimal.append(RunStats(evaluated[point][2]).averagedRow(desc))	# Average over the clients of every run of the configuration
+	writer.close()										# Flush remaining buffered rows
+	if genetic_descent.resultStore is not None:
+		genetic_descent.resultStore.flush()
+	with open("Optimal_Results/Optimal_Results_"+scriptName+".csv", 'w', newline='') as outputFile:		# Create Output CSV file in which to store the best configurations of this script
+		outputWriter = csv.writer(outputFile)
+		outputWriter.writerow(AV_HEADER)
+		outputWriter.writerows(optimal)
+	if evaluator.simCache is not None:
+		(hits, misses)=evaluator.simCache.stats()
+		print("\nSimulation cache for {}: {} hits, {} misses".format(scriptName,hits-cacheStart[0],misses-cacheStart[1]))
+	return (optimal[0], round(evaluated[ranked[0]][0]/evaluated[ranked[0]][1],4))
+
+def proposePoint(encoder, space, evaluated, pending, minVals, maxVals, values, poolSize, rng):
+	"This function returns the candidate configuration with the highest expected improvement. Running configurations are assumed to cost what the model predicts (kriging believer), so proposals made while they run are spread out"
+	known=list(evaluated)
+	costs=np.array([evaluated[point][0]/evaluated[point][1] for point in known])
+	y=np.log(costs-costs.min()+1)						# Error cases cost 10000 and more, compress them so they do not dominate the fit
+	X=encoder.encode(known)
+	model=GaussianProcess()
+	model.fit(X, y)
+	running=[point for point in pending if point not in evaluated]
+	if len(running)>0:
+		Xr=encoder.encode(running)
+		X=np.vstack([X, Xr])
+		y=np.concatenate([y, model.predict(Xr)[0]])
+		model=GaussianProcess()
+		model.fit(X, y)
+	if len(space)<=poolSize:
+		candidates=list(space)														# Every configuration of the space
+	else:
+		candidates=[space[rng.randrange(len(space))] for i in range(poolSize)]	# Random configurations of the space
+	for i in range(poolSize):															# Random configurations over the whole range
+		candidates.append(space.complete([randomTrait(encoder, j, minVals, maxVals, values, rng) for j in space.free]))
+	best=sorted(known, key=lambda point: evaluated[point][0]/evaluated[point][1])[:5]
+	for i in range(poolSize):															# Random configurations near the best so far
+		point=list(rng.choice(best))
+		for j in range(len(point)):
+			if encoder.numeric[j]:
+				point[j]=point[j]+rng.gauss(0, 0.1)*(maxVals[j]-minVals[j])
+				point[j]=min(max(point[j], minVals[j]), maxVals[j])
+				if all(isinstance(value, int) for value in values[j]):
+					point[j]=int(round(point[j]))
+			elif rng.random()<1.0/len(point):
+				point[j]=rng.choice(values[j])
+		candidates.append(space.complete([point[j] for j in space.free]))	# Derived parameters follow their source
+	candidates=[point for point in dict.fromkeys(candidates) if point not in evaluated and point not in pending]
+	if len(candidates)==0:
+		return space[rng.randrange(len(space))]
+	(mean, std)=model.predict(encoder.encode(candidates))
+	return candidates[int(np.argmax(expectedImprovement(mean, std, y.min())))]
+
+def randomTrait(encoder, j, minVals, maxVals, values, rng):
+	"This function returns a uniformly random value of trait j drawn from rng"
+	if not encoder.numeric[j]:
+		return rng.choice(values[j])
+	if all(isinstance(value, int) for value in values[j]):
+		return rng.randint(minVals[j], maxVals[j])
+	return rng.uniform(minVals[j], maxVals[j])
+#----------------------------------------------------------------------------------------------------------------------------------------------------------
+#			MAIN CODE EXECUTION (with performance measurement)
+#----------------------------------------------------------------------------------------------------------------------------------------------------------
+if __name__ == '__main__':
+
+	if platform.system() == "Linux":
+		os.system("taskset -c -p 0-{} {}".format(mp.cpu_count(),os.getpid()))			# Change task affinity so all cores are used [LINUX specific]
+
+	parser=argparse.ArgumentParser(description="Bayesian optimization of ns-3 testbed scripts")
+	parser.add_argument("--MaxEvaluations", type=int, default=100, help="number of configurations to simulate per script (default: 100)")
+	parser.add_argument("--InitialPoints", type=int, default=0, help="random configurations simulated before the model is used (default: max(8, 2*parameters+2))")
+	parser.add_argument("--Runs", type=int, default=4, help="replicates of every configuration (default: 4)")
+	parser.add_argument("--Cache", default="Sim_Cache.db", help="simulation result cache database (default: Sim_Cache.db)")
+	parser.add_argument("--NoCache", action="store_true", help="always run the simulator instead of reusing cached results")
+	parser.add_argument("--UseWaf", action="store_true", help="run every simulation through ./waf --run instead of the compiled scratch program")
+	parser.add_argument("--Workers", help="comma separated host:port list of sim_worker.py daemons to run simulations on")
+	parser.add_argument("--Columnar", metavar="DIR", help="store raw results in a columnar store in DIR instead of per-test CSV files (requires NumPy)")
+	parser.add_argument("--Campaign", action="store_true", help="optimize all scripts at once in one shared simulation pool")
+	parser.add_argument("--Policy", choices=POLICIES, default="fair", help="how free simulation slots are shared between scripts: fewest running simulations per unit weight (fair) or highest weight first (priority) (default: fair)")
+	parser.add_argument("--Weights", type=parseWeights, default={}, help="comma separated script=weight list for the scheduling policy (default weight: 1)")
+	parser.add_argument("--Pin", choices=PIN_MODES, default="none", help="pin each simulation process to its own core (core) or to the least loaded NUMA node (numa) (default: none)")
+	parser.add_argument("--MemoryReserve", type=float, default=0.1, help="fraction of the memory free at start which simulations are not admitted into (default: 0.1)")
+	parser.add_argument("--Timeout", type=float, help="kill simulations running longer than this many wall clock seconds per simulated second (default: no timeout)")
+	parser.add_argument("--MinTimeout", type=float, default=60, help="shortest simulation timeout in seconds (default: 60)")
+	parser.add_argument("--DefaultSimTime", type=float, default=120, help="SimTime in seconds of scripts run without a --SimTime option, for the timeout (default: 120)")
+	parser.add_argument("--Threads", action="store_true", help="run simulations from threads of this process instead of warm worker processes")
+	parser.add_argument("--Trace", metavar="FILE", help="write a JSONL profiling trace of every simulation job and optimizer phase to FILE and print a throughput summary")
+	parser.add_argument("--ResourceUsage", default="Resource_Usage.json", help="file of the peak memory and CPU time recorded per parameter signature, used to admit simulations by free memory (default: Resource_Usage.json)")
+	parser.add_argument("--CostFunction", default="descent", help="cost definition to score configurations with: a built-in (descent or sweep), a name in Cost_Functions/ or a JSON file (default: descent)")
+	args=parser.parse_args()
+	try:
+		cost_func.load(args.CostFunction)
+	except ValueError as error:
+		parser.error(str(error))
+	sim_exec.useWaf=args.UseWaf
+	sim_exec.resources=ResourceManager(args.Pin, args.MemoryReserve, args.ResourceUsage)
+	sim_exec.timeoutFactor=args.Timeout
+	sim_exec.minTimeout=args.MinTimeout
+	sim_exec.defaultSimTime=args.DefaultSimTime
+	if args.Trace:
+		profiling.tracer=profiling.Tracer(args.Trace)
+	if args.Workers:
+		genetic_descent.workerPool=WorkerPool(parseAddresses(args.Workers))
+	if args.Columnar:
+		genetic_descent.resultStore=ColumnarStore(args.Columnar)
+	if not args.NoCache:
+		evaluator.simCache=SimCache(args.Cache)
+	processPool=None
+	if genetic_descent.workerPool is None and not args.Threads:
+		processPool=ProcessPool(mp.cpu_count())			# Warm worker processes, started with the settings in place at the first simulation
+	genetic_descent.sharedPool=SharedPool(mp.cpu_count(), genetic_descent.workerPool or processPool, args.Policy, args.Weights)	# One pool for every script
+
+	for directory in ('Av_Results', 'Raw_Results', 'Optimal_Results'):
+		if not os.path.exists(directory):
+			os.makedirs(directory)
+
+	print("Checking waf build.....")
+	cmd=subprocess.check_output(['./waf build'], shell=True, stderr=subprocess.STDOUT)	# Build waf first
+	print("waf built!")
+	print("Test automation script by Adarsh Hasandka (NREL)\n")
+	starttime=time.time()
+	optimum_results=[]
+	print("Using Bayesian optimization to optimize the simulation result")
+	scripts=["testbed-BPLC-CSMA-v1","testbed-BPLC-WiFi-v1","testbed-BPLC-Wimax-v1","testbed-NPLC-Wimax-v1"]
+	sim_exec.resolvePrograms(scripts)					# Locate compiled scratch programs once so each run skips waf
+	def optimizeScript(script):
+		"This function runs the Bayesian optimizer on one script and returns its optimal result"
+		with open("Av_Results/Averaged_Results_"+script+".csv", 'w', newline='') as outputFile:		# Create Output CSV file in which to store averaged results of all simulations for this script
+			outputWriter = csv.writer(outputFile)
+			outputWriter.writerow(AV_HEADER)
+		space=genetic_descent.Get_Param_Space(script)
+		(optimalResult, cost)=bayesian_optimizer(script,space,args.Runs,args.MaxEvaluations,args.InitialPoints)
+		print("Optimal Result for {}: {} with cost {}".format(script, optimalResult, cost))
+		return optimalResult
+	if args.Campaign:
+		optimum_results=runCampaign(genetic_descent.sharedPool, scripts, optimizeScript)	# All scripts at once, sharing the pool under the scheduling policy
+	else:
+		for script in scripts:
+			genetic_descent.sharedPool.bind(script)
+			optimum_results.append(optimizeScript(script))
+	with open('Optimal_Simulation_Results.csv', 'w', newline='') as outputFile:		# Create Output CSV file in which to store overall results of simulation
+		outputWriter = csv.writer(outputFile)
+		outputWriter.writerow(AV_HEADER)
+		outputWriter.writerows(optimum_results)
+	genetic_descent.sharedPool.shutdown()
+	if processPool is not None:
+		processPool.shutdown()
+	sim_exec.resources.save()
+	print("Resource usage: "+sim_exec.resources.summary())
+	if profiling.tracer is not None:
+		print(profiling.tracer.close(genetic_descent.sharedPool.slots()))
+	if genetic_descent.workerPool is not None:
+		genetic_descent.workerPool.shutdown()
+	if genetic_descent.resultStore is not None:
+		genetic_descent.resultStore.close()
+	endtime=time.time()
+	print("\ntotal execution time: {} seconds\n".format(float(endtime)-float(starttime)))
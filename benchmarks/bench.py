@@ -0,0 +1,234 @@
+# Framework benchmark
+# Measures the overhead the optimization framework adds to simulations, using fake_ns3.py in place of ns-3: jobs per second of runScript,
+# brute_optimizer and genetic_optimizer at several scales and core counts, output parsing cost per line and peak memory, with an optional
+# comparison against saved results as a regression guard
+#
+# Copyright (c) 2026 ParaOptimizationNS3 contributors
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy of this software and associated documentation files (the "Software"),
+# to deal in the Software without restriction, including without limitation the rights to use, copy, modify, merge, publish, distribute, sublicense,
+# and/or sell copies of the Software, and to permit persons to whom the Software is furnished to do so, subject to the following conditions:
+# The above copyright notice and this permission notice shall be included in all copies or substantial portions of the Software.
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS
+# IN THE SOFTWARE.
+
+# Every case runs in a fresh Python process inside a temporary ns-3 tree whose scratch program and waf are fake_ns3.py, so its peak RSS is its own.
+# Cases:
+#   direct    the fake simulations alone, started by a thread pool without the framework (the baseline the others are compared with)
+#   runscript evaluator.runScript through the SharedPool
+#   brute     sampler_BF.brute_optimizer over the whole parameter space
+#   genetic   genetic_descent.genetic_optimizer
+#   parse     sim_output.OutputParser on the output of one simulation, in process
+# The framework cases run on the worker processes of evaluator.ProcessPool like the optimizer scripts, or on threads with --Threads. Peak memory
+# is that of the coordinator process.
+
+#import
+import argparse
+import concurrent.futures
+import csv
+import json
+import multiprocessing as mp
+import os
+import random
+import resource
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT=os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+FAKE=os.path.join(os.path.dirname(os.path.abspath(__file__)), "fake_ns3.py")
+SCRIPT="testbed-Bench-v1"
+CASES=["direct", "runscript", "brute", "genetic", "parse"]
+SCALES={											# Scale -> (values per parameter, replicates, runscript/direct jobs, genetic generations)
+	"small": (4, 2, 64, 3),
+	"medium": (8, 2, 256, 4),
+	"large": (16, 2, 1024, 5)}
+
+#----------------------------------------------------------------------------------------------------------------------------------------------------------
+#			Fake ns-3 Tree
+#----------------------------------------------------------------------------------------------------------------------------------------------------------
+def makeTree(directory):
+	"This function lays out an ns-3 top level directory whose waf and compiled scratch program are the fake simulator"
+	scratch=os.path.join(directory, "build", "scratch")
+	os.makedirs(scratch)
+	os.makedirs(os.path.join(directory, "build", "lib"))
+	os.symlink(FAKE, os.path.join(directory, "waf"))
+	os.symlink(FAKE, os.path.join(scratch, "ns3.29-"+SCRIPT+"-debug"))
+	for name in ("Av_Results", "Raw_Results", "Optimal_Results"):
+		os.makedirs(os.path.join(directory, name))
+
+def benchSpace(scale):
+	from param_space import ParamSpace
+	count=SCALES[scale][0]
+	return ParamSpace(["DataRate", "PacketSize"], [[8000*(k+1) for k in range(count)], [64*(k+1) for k in range(count)]])
+
+def linesPerJob():
+	return 1+int(os.environ.get("FAKE_NS3_CLIENTS", 5))*(2+2*int(os.environ.get("FAKE_NS3_LOGLINES", 0)))
+
+#----------------------------------------------------------------------------------------------------------------------------------------------------------
+#			Cases (run in the child process)
+#----------------------------------------------------------------------------------------------------------------------------------------------------------
+def jobOptions(count):
+	"This function returns the options and comments of count simulations cycling over a small configuration grid"
+	return [("--DataRate={} --PacketSize={} --RunNo={} ".format(8000*(i%8+1), 64*(i//8%8+1), i+1), "Bench job {}".format(i)) for i in range(count)]
+
+def runCase(case, scale, cores, useWaf, threads=False):
+	"This function runs one benchmark case and returns its measurements"
+	sys.path.insert(0, ROOT)
+	import evaluator
+	import genetic_descent
+	import profiling
+	import sampler_BF
+	import sim_exec
+	import sim_output
+	from result_writer import AV_HEADER
+	from scheduler import SharedPool
+	import fake_ns3
+	sim_exec.useWaf=useWaf
+	sim_exec.resolvePrograms([SCRIPT])
+	(count, runs, jobCount, generations)=SCALES[scale]
+	result={"case": case, "scale": scale, "cores": cores}
+	if case=="parse":
+		lines=fake_ns3.outputLines({"DataRate": "24000", "PacketSize": "256", "RunNo": "1"}, int(os.environ.get("FAKE_NS3_CLIENTS", 5)), int(os.environ.get("FAKE_NS3_LOGLINES", 0)))
+		repeats=max(1, 200000//len(lines))
+		start=time.perf_counter()
+		for repeat in range(repeats):
+			parser=sim_output.OutputParser()
+			for line in lines:
+				parser.feed(line)
+			parser.clients()
+		result["usPerLine"]=(time.perf_counter()-start)*1e6/(repeats*len(lines))
+		result["lines"]=repeats*len(lines)
+	elif case=="direct":
+		program=sim_exec.resolveProgram(SCRIPT)
+		def run(options):
+			if program is None:
+				return subprocess.run(['./waf --run "scratch/{} {}"'.format(SCRIPT, options)], shell=True, stdout=subprocess.PIPE).returncode
+			return subprocess.run(program[0]+options.split(), env=program[1], stdout=subprocess.PIPE).returncode
+		start=time.time()
+		with concurrent.futures.ThreadPoolExecutor(cores) as executor:
+			list(executor.map(run, [options for (options, comment) in jobOptions(jobCount)]))
+		result["jobs"]=jobCount
+		result["seconds"]=time.time()-start
+	else:
+		profiling.tracer=profiling.Tracer(os.devnull)			# Parse time of the framework's own simulations
+		processPool=None if threads else evaluator.ProcessPool(cores)
+		pool=SharedPool(cores, processPool)
+		pool.bind(SCRIPT)
+		sampler_BF.sharedPool=pool
+		genetic_descent.sharedPool=pool
+		with open("Av_Results/Averaged_Results_"+SCRIPT+".csv", 'w', newline='') as outputFile:
+			csv.writer(outputFile).writerow(AV_HEADER)
+		start=time.time()
+		if case=="runscript":
+			futures=[pool.submit(SCRIPT, evaluator.runScript, i+1, SCRIPT, options, comment) for (i, (options, comment)) in enumerate(jobOptions(jobCount))]
+			for future in futures:
+				future.result()
+		elif case=="brute":
+			sampler_BF.brute_optimizer(SCRIPT, benchSpace(scale), "Cost", "Minimize", runs)
+		elif case=="genetic":
+			random.seed(0)
+			genetic_descent.genetic_optimizer(SCRIPT, benchSpace(scale), runs, generations, 5, 4*count, 20, 20, 8000, False, False)
+		else:
+			raise ValueError("unknown benchmark case "+case)
+		result["seconds"]=time.time()-start
+		pool.shutdown()
+		if processPool is not None:
+			processPool.shutdown()
+		tracer=profiling.tracer
+		result["jobs"]=sum(tracer.status.values())
+		result["failed"]=tracer.status["failed"]
+		simulated=sum(count for (status, count) in tracer.status.items() if status!="cached")
+		if simulated>0:
+			result["usPerLine"]=tracer.intervals["parse"]*1e6/(simulated*linesPerJob())
+	if "jobs" in result:
+		result["jobsPerSecond"]=result["jobs"]/result["seconds"]
+	result["peakMB"]=resource.getrusage(resource.RUSAGE_SELF).ru_maxrss/(1024 if sys.platform!="darwin" else 1024*1024)
+	return result
+
+#----------------------------------------------------------------------------------------------------------------------------------------------------------
+#			Report and Regression Guard
+#----------------------------------------------------------------------------------------------------------------------------------------------------------
+def caseKey(result):
+	return "{}/{}/{}".format(result["case"], result["scale"], result["cores"])
+
+def report(results):
+	print("{:<24}{:>8}{:>10}{:>12}{:>12}{:>10}".format("case/scale/cores", "jobs", "seconds", "jobs/s", "parse us/l", "peak MB"))
+	for result in results:
+		print("{:<24}{:>8}{:>10.2f}{:>12}{:>12}{:>10.1f}".format(caseKey(result), result.get("jobs", "-"), result.get("seconds", 0.0),
+			"{:.1f}".format(result["jobsPerSecond"]) if "jobsPerSecond" in result else "-", "{:.2f}".format(result["usPerLine"]) if "usPerLine" in result else "-", result["peakMB"]))
+
+def regressions(results, baseline, tolerance):
+	"This function returns a description of every guarded metric which is more than tolerance worse than in the baseline results"
+	previous={caseKey(result): result for result in baseline}
+	found=[]
+	for result in results:
+		old=previous.get(caseKey(result))
+		if old is None:
+			continue
+		if "jobsPerSecond" in result and "jobsPerSecond" in old and result["jobsPerSecond"]<(1-tolerance)*old["jobsPerSecond"]:
+			found.append("{}: {:.1f} jobs/s, baseline {:.1f}".format(caseKey(result), result["jobsPerSecond"], old["jobsPerSecond"]))
+		if "usPerLine" in result and "usPerLine" in old and result["usPerLine"]>(1+tolerance)*old["usPerLine"]:
+			found.append("{}: {:.2f} us/line, baseline {:.2f}".format(caseKey(result), result["usPerLine"], old["usPerLine"]))
+	return found
+
+#----------------------------------------------------------------------------------------------------------------------------------------------------------
+#			MAIN CODE EXECUTION
+#----------------------------------------------------------------------------------------------------------------------------------------------------------
+if __name__ == '__main__':
+	parser=argparse.ArgumentParser(description="Benchmark of the optimization framework with a fake ns-3 simulator")
+	parser.add_argument("--Cases", default=",".join(CASES), help="comma separated cases to run (default: all of "+", ".join(CASES)+")")
+	parser.add_argument("--Scales", default="small,medium", help="comma separated scales of "+", ".join(SCALES)+" (default: small,medium)")
+	parser.add_argument("--Cores", default="1,{}".format(mp.cpu_count()), help="comma separated simulation slot counts (default: 1 and the cpu count)")
+	parser.add_argument("--Clients", type=int, default=5, help="clients per simulation (default: 5)")
+	parser.add_argument("--LogLines", type=int, default=0, help="log lines per client before its results (default: 0)")
+	parser.add_argument("--Runtime", type=float, default=0, help="seconds each fake simulation sleeps (default: 0, pure overhead)")
+	parser.add_argument("--FailRate", type=float, default=0, help="fraction of fake simulations which crash (default: 0)")
+	parser.add_argument("--UseWaf", action="store_true", help="run the fake simulations through the fake ./waf --run")
+	parser.add_argument("--Threads", action="store_true", help="run the framework cases on threads of the benchmark process instead of worker processes")
+	parser.add_argument("--Save", metavar="FILE", help="save the results as JSON to FILE")
+	parser.add_argument("--Baseline", metavar="FILE", help="compare with results saved by --Save and exit with status 1 on a regression")
+	parser.add_argument("--Tolerance", type=float, default=0.2, help="relative slowdown tolerated by --Baseline (default: 0.2)")
+	parser.add_argument("--Case", help=argparse.SUPPRESS)						# Internal: run one case in this process
+	parser.add_argument("--Scale", help=argparse.SUPPRESS)
+	parser.add_argument("--CaseCores", type=int, help=argparse.SUPPRESS)
+	args=parser.parse_args()
+	if args.Case:
+		sys.path.insert(0, os.path.dirname(FAKE))
+		sys.stdout=sys.stderr												# Optimizer progress messages stay out of the result line
+		result=runCase(args.Case, args.Scale, args.CaseCores, args.UseWaf, args.Threads)
+		sys.__stdout__.write(json.dumps(result)+"\n")
+		sys.exit(0)
+
+	env=dict(os.environ, FAKE_NS3_CLIENTS=str(args.Clients), FAKE_NS3_LOGLINES=str(args.LogLines), FAKE_NS3_RUNTIME=str(args.Runtime), FAKE_NS3_FAILRATE=str(args.FailRate))
+	results=[]
+	for scale in args.Scales.split(","):
+		for case in args.Cases.split(","):
+			for cores in ([1] if case=="parse" else [int(cores) for cores in args.Cores.split(",")]):
+				directory=tempfile.mkdtemp(prefix="bench-ns3-")
+				try:
+					makeTree(directory)
+					command=[sys.executable, os.path.abspath(__file__), "--Case", case, "--Scale", scale, "--CaseCores", str(cores)]+(["--UseWaf"] if args.UseWaf else [])+(["--Threads"] if args.Threads else [])
+					child=subprocess.run(command, cwd=directory, env=env, stdout=subprocess.PIPE, stderr=subprocess.PIPE, universal_newlines=True)
+					if child.returncode!=0:
+						print("{}/{}/{} failed:\n{}".format(case, scale, cores, child.stderr[-2000:]))
+						sys.exit(1)
+					results.append(json.loads(child.stdout.strip().splitlines()[-1]))
+				finally:
+					shutil.rmtree(directory)
+				print("{} done".format(caseKey(results[-1])), flush=True)
+	report(results)
+	if args.Save:
+		with open(args.Save, 'w') as saveFile:
+			json.dump(results, saveFile, indent=1)
+	if args.Baseline:
+		with open(args.Baseline) as baselineFile:
+			found=regressions(results, json.load(baselineFile), args.Tolerance)
+		if len(found)>0:
+			print("Regressions beyond {:.0%}:\n  ".format(args.Tolerance)+"\n  ".join(found))
+			sys.exit(1)
+		print("No regressions beyond {:.0%} of {}".format(args.Tolerance, args.Baseline))
@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+# Fake ns-3 simulator
+# Stand-in for a compiled testbed scratch program (and for ./waf) which prints the same client and server lines as the qos-app Client and Server
+# applications, so the framework can be benchmarked without ns-3
+#
+# Copyright (c) 2026 ParaOptimizationNS3 contributors
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy of this software and associated documentation files (the "Software"),
+# to deal in the Software without restriction, including without limitation the rights to use, copy, modify, merge, publish, distribute, sublicense,
+# and/or sell copies of the Software, and to permit persons to whom the Software is furnished to do so, subject to the following conditions:
+# The above copyright notice and this permission notice shall be included in all copies or substantial portions of the Software.
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS
+# IN THE SOFTWARE.
+
+# Run as a scratch program it simulates with the --Name=value options it is given. Run as waf it accepts "build" and --run "scratch/<script> <options>".
+# The output is configured through the environment, so the optimizers can pass their usual parameter options:
+#   FAKE_NS3_CLIENTS    clients reporting results (default 5)
+#   FAKE_NS3_LOGLINES   NS_LOG_INFO lines per client printed before the results, like a run with logging enabled (default 0)
+#   FAKE_NS3_RUNTIME    seconds each simulation sleeps (default 0)
+#   FAKE_NS3_FAILRATE   fraction of simulations which crash with a nonzero exit status (default 0)
+# Results are deterministic for the options, so replicates differ through their RunNo.
+
+#import
+import os
+import random
+import shlex
+import sys
+import time
+
+#----------------------------------------------------------------------------------------------------------------------------------------------------------
+#			Simulated Output
+#----------------------------------------------------------------------------------------------------------------------------------------------------------
+def parseOptions(args):
+	"This function accepts ns-3 command line arguments and returns a dict of their --Name=value options"
+	options={}
+	for arg in args:
+		if arg.startswith("--") and "=" in arg:
+			(name, value)=arg[2:].split("=", 1)
+			options[name]=value
+	return options
+
+def outputLines(options, clients=5, logLines=0):
+	"This function returns the output lines of a simulation with the given options, as printed by a testbed script using the qos-app applications"
+	rng=random.Random(" ".join("{}={}".format(name, value) for (name, value) in sorted(options.items())))
+	dataRate=float(options.get("DataRate", 24000))
+	packetSize=int(float(options.get("PacketSize", 256)))
+	simTime=float(options.get("SimTime", 120))
+	lines=["[DESC] - Fake testbed with {} clients\n".format(clients)]
+	sent={}
+	for client in range(1, clients+1):
+		sent[client]=max(1, int(dataRate*simTime/8/packetSize*(0.8+0.2*rng.random())))*packetSize
+		for k in range(logLines):								# Client::Send log lines, skipped by the parser
+			now=simTime*(k+1)/(logLines+1)
+			lines.append("At time {:g}s client {} sent {} bytes to 10.1.1.1 port 9 total Tx {} bytes\n".format(now, client, packetSize, packetSize*(k+1)))
+			lines.append("At time {:g}s Server received {} bytes from Client {}\n".format(now+0.01, packetSize*(k+1), client))
+	for client in range(1, clients+1):							# Client::StopApplication
+		lines.append("At time {:g}s Client {} Sent {} Packets of total size {} bytes\n".format(simTime, client, sent[client]//packetSize, sent[client]))
+	for client in range(1, clients+1):							# Server::StopApplication
+		received=int(sent[client]*(0.9+0.1*rng.random()))
+		latency=20+abs(dataRate-30000)/500+packetSize/40+10*rng.random()
+		throughput=received*8/1000/simTime
+		lines.append("At time {:g}s Server received {} bytes across {} packets, from Client {}, Average Latency: {:g}ms, Average Throughput: {:g}kbps, Max Latency: {:g}ms, Min Throughput: {:g}kbps\n".format(simTime, received, received//packetSize, client, latency, throughput, 2*latency, throughput/2))
+	return lines
+
+def simulate(args):
+	"This function runs one fake simulation and returns its exit status"
+	options=parseOptions(args)
+	rng=random.Random("fail "+" ".join(args))
+	time.sleep(float(os.environ.get("FAKE_NS3_RUNTIME", 0)))
+	lines=outputLines(options, int(os.environ.get("FAKE_NS3_CLIENTS", 5)), int(os.environ.get("FAKE_NS3_LOGLINES", 0)))
+	if rng.random()<float(os.environ.get("FAKE_NS3_FAILRATE", 0)):
+		sys.stdout.writelines(lines[:len(lines)//2])
+		sys.stdout.write("assert failed. cond=\"m_ptr\", msg=\"Attempted to dereference zero pointer\"\n")
+		return 1
+	sys.stdout.writelines(lines)
+	return 0
+
+#----------------------------------------------------------------------------------------------------------------------------------------------------------
+#			MAIN CODE EXECUTION
+#----------------------------------------------------------------------------------------------------------------------------------------------------------
+if __name__ == '__main__':
+	if os.path.basename(sys.argv[0])=="waf":
+		if sys.argv[1:2]==["build"]:
+			print("'build' finished successfully (0.001s)")
+			sys.exit(0)
+		if sys.argv[1:2]==["--run"]:
+			sys.exit(simulate(shlex.split(sys.argv[2])[1:]))		# Drop scratch/<script>
+		print("fake waf only supports build and --run")
+		sys.exit(2)
+	sys.exit(simulate(sys.argv[1:]))
@@ -0,0 +1,92 @@
+# Optimizer checkpoint
+# Atomic snapshots of optimizer state and a journal of the simulations completed since, so an interrupted optimization can be resumed
+#
+# Copyright (c) 2026 ParaOptimizationNS3 contributors
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy of this software and associated documentation files (the "Software"),
+# to deal in the Software without restriction, including without limitation the rights to use, copy, modify, merge, publish, distribute, sublicense,
+# and/or sell copies of the Software, and to permit persons to whom the Software is furnished to do so, subject to the following conditions:
+# The above copyright notice and this permission notice shall be included in all copies or substantial portions of the Software.
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS
+# IN THE SOFTWARE.
+
+# Files of a checkpoint:
+#   <path>.pkl      pickled state dict, replaced atomically before each batch of simulations is submitted. Holds a batch number and the batch's jobs
+#   <path>.journal  one JSON line [batch, job index, runScript output] per completed simulation of that batch, written after its results reached disk
+
+#import
+import json
+import os
+import pickle
+import time
+
+#----------------------------------------------------------------------------------------------------------------------------------------------------------
+#			Checkpoint
+#----------------------------------------------------------------------------------------------------------------------------------------------------------
+class Checkpoint:
+	"Snapshot of optimizer state taken at each batch boundary plus a journal of the simulations of the current batch which already completed"
+
+	def __init__(self, path, outputs=(), syncInterval=30.0):
+		self.snapshotPath=path+".pkl"
+		self.journalPath=path+".journal"
+		self.outputs=[output for output in outputs if output is not None]		# Result writers flushed before completed runs are journaled
+		self.syncInterval=syncInterval
+		self.batch=0
+		self.pending=[]
+		self.lastSync=time.monotonic()
+		directory=os.path.dirname(path)
+		if directory:
+			os.makedirs(directory, exist_ok=True)
+
+	def load(self):
+		"This function returns the saved state and a dict of job index -> output of the runs of its batch which completed, or (None, {}) if there is no checkpoint"
+		if not os.path.exists(self.snapshotPath):
+			return (None, {})
+		with open(self.snapshotPath, 'rb') as snapshotFile:
+			state=pickle.load(snapshotFile)
+		self.batch=state["batch"]
+		completed={}
+		if os.path.exists(self.journalPath):
+			with open(self.journalPath, 'rb') as journalFile:
+				for line in journalFile:
+					if not line.endswith(b"\n"):										# Partially written trailing line left by a crash
+						break
+					(batch, jobIndex, output)=json.loads(line.decode("UTF-8"))
+					if batch==self.batch:												# Lines of an older batch survive a crash between snapshot and truncation
+						completed[jobIndex]=output
+		return (state, completed)
+
+	def save(self, state):
+		"This function atomically replaces the snapshot with state and starts an empty journal for the batch it describes"
+		self.sync(force=True)
+		for output in self.outputs:												# Everything written up to the snapshot must survive it
+			output.flush()
+		self.batch+=1
+		state["batch"]=self.batch
+		temporaryPath=self.snapshotPath+".tmp"
+		with open(temporaryPath, 'wb') as snapshotFile:
+			pickle.dump(state, snapshotFile, protocol=pickle.HIGHEST_PROTOCOL)
+			snapshotFile.flush()
+			os.fsync(snapshotFile.fileno())
+		os.replace(temporaryPath, self.snapshotPath)
+		with open(self.journalPath, 'wb') as journalFile:
+			journalFile.flush()
+
+	def record(self, jobIndex, output):
+		"This function journals a completed run of the current batch. Lines are written every syncInterval seconds, after the result files are flushed"
+		self.pending.append(json.dumps([self.batch, jobIndex, output])+"\n")
+		self.sync()
+
+	def sync(self, force=False):
+		if len(self.pending)==0 or (not force and time.monotonic()-self.lastSync<self.syncInterval):
+			return
+		for output in self.outputs:												# A journaled run must never be missing from the result files
+			output.flush()
+		with open(self.journalPath, 'ab') as journalFile:
+			journalFile.write("".join(self.pending).encode("UTF-8"))
+			journalFile.flush()
+			os.fsync(journalFile.fileno())
+		self.pending=[]
+		self.lastSync=time.monotonic()
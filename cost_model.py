@@ -0,0 +1,142 @@
+# Configurable cost functions
+# Cost definitions as data (a constant plus linear, threshold and error terms over the averaged metrics of a run), evaluated for one run by the
+# optimizers or for whole arrays of runs at once when an archive is re-scored
+#
+# Copyright (c) 2026 ParaOptimizationNS3 contributors
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy of this software and associated documentation files (the "Software"),
+# to deal in the Software without restriction, including without limitation the rights to use, copy, modify, merge, publish, distribute, sublicense,
+# and/or sell copies of the Software, and to permit persons to whom the Software is furnished to do so, subject to the following conditions:
+# The above copyright notice and this permission notice shall be included in all copies or substantial portions of the Software.
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS
+# IN THE SOFTWARE.
+
+# A definition is a JSON object {"constant": c, "terms": [...]} whose terms are added to the constant in order. A term names one of AV_METRICS and is one of:
+#   {"metric": m, "weight": w}                      w*(m-offset), with an optional "offset" (default 0)
+#   {"metric": m, "above": t, "weight": w}          w*(m-t) when m is above t
+#   {"metric": m, "below": t, "weight": w}          w*(t-m) when m is below t
+#   {"metric": m, "zero": p}                        p when m is 0, the value of the metrics of a failed run
+# and a weight may be given per "per" units, w*(m-t)/per, e.g. 1 per 100 ms of latency.
+# The cost is rounded to 4 decimals. Definitions are given by name (a built-in, or Cost_Functions/<name>.json) or by file path.
+
+#import
+import json
+import math
+import os
+
+import numpy as np
+
+AV_METRICS=["avAvThroughput", "minAvThroughput", "avMinThroughput", "minMinThroughput", "avAvLatency", "maxAvLatency", "avMaxLatency", "maxMaxLatency", "avPackLossRate", "maxPackLossRate"]	# RunStats.averagedMetrics order, columns 3-12 of an Av_Results row
+COST_ARGUMENTS=["avAvThroughput", "minAvThroughput", "avAvLatency", "maxAvLatency", "avPackLossRate"]	# Arguments of a cost function called like cost_func
+COST_DIR="Cost_Functions"
+
+DESCENT_COST={"constant": 0, "terms": [						# Cost of the descent optimizers: latency, loss and the throughput shortfall, plus the requirement penalties
+	{"metric": "avAvLatency", "weight": 1},
+	{"metric": "avPackLossRate", "weight": 1},
+	{"metric": "avAvThroughput", "offset": 60, "weight": -1},
+	{"metric": "avAvLatency", "above": 300, "weight": 1},
+	{"metric": "avAvLatency", "zero": 20000},				# Give large cost to error cases
+	{"metric": "maxAvLatency", "above": 300, "weight": 1, "per": 100},	# Give large cost to cases that peform below minimum requirements
+	{"metric": "avAvThroughput", "below": 9.6, "weight": 100},
+	{"metric": "avAvThroughput", "zero": 10000},
+	{"metric": "minAvThroughput", "below": 9.6, "weight": 1},
+	{"metric": "avPackLossRate", "above": 1, "weight": 10}]}
+SWEEP_COST={"constant": 1, "terms": [						# Cost of the brute force sweep, which only penalizes configurations missing the requirements
+	{"metric": "avAvLatency", "above": 300, "weight": 1},
+	{"metric": "avAvLatency", "zero": 10000},				# Give large cost to error cases
+	{"metric": "maxAvLatency", "above": 300, "weight": 1, "per": 100},
+	{"metric": "avAvThroughput", "below": 9.6, "weight": 10},
+	{"metric": "minAvThroughput", "below": 9.6, "weight": 1},
+	{"metric": "avPackLossRate", "above": 1, "weight": 10}]}
+BUILTIN_COSTS={"descent": DESCENT_COST, "sweep": SWEEP_COST}
+
+#----------------------------------------------------------------------------------------------------------------------------------------------------------
+#			Cost Function
+#----------------------------------------------------------------------------------------------------------------------------------------------------------
+def loadDefinition(spec):
+	"This function accepts a built-in cost name, a name in Cost_Functions or a file path, and returns the (name, definition) of the cost function"
+	if spec in BUILTIN_COSTS:
+		return (spec, BUILTIN_COSTS[spec])
+	path=spec if os.path.exists(spec) else os.path.join(COST_DIR, spec+".json")
+	if not os.path.exists(path):
+		raise ValueError("unknown cost function {}: not one of {} and no file {}".format(spec, ", ".join(BUILTIN_COSTS), path))
+	with open(path) as definitionFile:
+		return (os.path.splitext(os.path.basename(path))[0], json.load(definitionFile))
+
+class CostFunction:
+	"Cost of the averaged metrics of a run under a cost definition, for one run (like cost_func) or for an array of runs"
+
+	def __init__(self, definition, name="custom"):
+		self.define(definition, name)
+
+	def define(self, definition, name="custom"):
+		"This function replaces the definition, so every optimizer holding this cost function uses the new one"
+		terms=[]
+		for term in definition.get("terms", []):
+			if term.get("metric") not in AV_METRICS:
+				raise ValueError("cost term {} does not name one of {}".format(term, ", ".join(AV_METRICS)))
+			index=AV_METRICS.index(term["metric"])
+			if "zero" in term:
+				terms.append(("zero", index, 0.0, float(term["zero"]), 1.0))
+			elif "above" in term:
+				terms.append(("above", index, float(term["above"]), float(term["weight"]), float(term.get("per", 1))))
+			elif "below" in term:
+				terms.append(("below", index, float(term["below"]), float(term["weight"]), float(term.get("per", 1))))
+			else:
+				terms.append(("linear", index, float(term.get("offset", 0)), float(term["weight"]), float(term.get("per", 1))))
+		self.name=name
+		self.constant=float(definition.get("constant", 0))
+		self.terms=terms
+
+	def load(self, spec):
+		"This function replaces the definition by the one of a built-in cost name, a name in Cost_Functions or a file path"
+		(name, definition)=loadDefinition(spec)
+		self.define(definition, name)
+
+	def value(self, metrics):
+		"This function accepts the 10 averaged metrics of a run in AV_METRICS order and returns its cost"
+		cost=self.constant
+		for (kind, index, threshold, weight, per) in self.terms:
+			metric=metrics[index]
+			if kind=="linear":
+				cost+=weight*(metric-threshold)/per
+			elif kind=="zero":
+				if metric==0:
+					cost+=weight
+			elif kind=="above":
+				if metric>threshold:
+					cost+=weight*(metric-threshold)/per
+			elif metric<threshold:
+				cost+=weight*(threshold-metric)/per
+		return round(cost,4)
+
+	def __call__(self, avAvThroughput, minAvThroughput, avAvLatency, maxAvLatency, avPackLossRate):
+		"This function accepts the output metrics of the simulation and returns a cost metric for performance comparison"
+		if any(AV_METRICS[index] not in COST_ARGUMENTS for (kind, index, threshold, weight, per) in self.terms):
+			raise ValueError("cost function {} uses metrics which are not among the arguments of cost_func, call run instead".format(self.name))
+		metrics=[math.nan]*len(AV_METRICS)
+		for (name, metric) in zip(COST_ARGUMENTS, (avAvThroughput, minAvThroughput, avAvLatency, maxAvLatency, avPackLossRate)):
+			metrics[AV_METRICS.index(name)]=metric
+		return self.value(metrics)
+
+	def run(self, stats):
+		"This function returns the cost of the RunStats of a run"
+		return self.value(stats.averagedMetrics())
+
+	def costs(self, metrics):
+		"This function accepts an array with the 10 averaged metrics of each run in its rows and returns the array of their costs, equal to those of value"
+		metrics=np.asarray(metrics, dtype=np.float64).reshape(-1, len(AV_METRICS))
+		cost=np.full(len(metrics), self.constant)
+		for (kind, index, threshold, weight, per) in self.terms:	# Same operations in the same order as value, so the results are identical
+			metric=metrics[:, index]
+			if kind=="linear":
+				cost+=weight*(metric-threshold)/per
+			elif kind=="zero":
+				cost+=np.where(metric==0, weight, 0.0)
+			elif kind=="above":
+				cost+=np.where(metric>threshold, weight*(metric-threshold)/per, 0.0)
+			else:
+				cost+=np.where(metric<threshold, weight*(threshold-metric)/per, 0.0)
+		return np.array([round(value,4) for value in cost.tolist()])	# round(), not np.round, which can differ in the last decimal
@@ -0,0 +1,370 @@
+# Simulation evaluator
+# The evaluation path shared by the optimizers and importable by other Python tooling: runScript, the cost functions, the bookkeeping of
+# every completed run, and a pool of long-lived worker processes which run, parse and aggregate simulations outside the coordinator's GIL
+#
+# Copyright (c) 2017 Regents of the University of Colorado
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy of this software and associated documentation files (the "Software"),
+# to deal in the Software without restriction, including without limitation the rights to use, copy, modify, merge, publish, distribute, sublicense,
+# and/or sell copies of the Software, and to permit persons to whom the Software is furnished to do so, subject to the following conditions:
+# The above copyright notice and this permission notice shall be included in all copies or substantial portions of the Software.
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS
+# IN THE SOFTWARE.
+
+# Based on runScript and cost_func of genetic_descent.py and sampler_BF.py by Adarsh Hasandka (adarsh.hasandka@colorado.edu)
+
+# Example, from the ns-3 top level directory:
+#   with Evaluator(cache="Sim_Cache.db") as evaluator:
+#       runs=evaluator.evaluate("testbed-BPLC-CSMA-v1", ["DataRate", "PacketSize"], [(24000, 256), (32000, 512)], runs=4)
+#       costs=[evaluator.cost(evaluations) for evaluations in runs]
+# Worker processes are started on the first job with the simulation settings (sim_exec, cache, resources) configured at that time.
+
+#import
+import concurrent.futures
+import itertools
+import multiprocessing as mp
+import random
+import signal
+import sys
+import threading
+import time
+import zlib
+
+import profiling
+import sim_exec
+import sim_output
+from aggregation import RunStats
+from cost_model import DESCENT_COST, SWEEP_COST, CostFunction
+from fidelity import fidelityOptions
+from resources import ResourceManager
+from sim_cache import SimCache
+
+MAX_RESUBMITS=2								# Times a job lost with a dead worker process is resubmitted before it is recorded as failed
+simCache=None								# Persistent simulation result cache shared by all runs, opened in main (or by an Evaluator)
+pidQueue=None								# Queue of a worker process to the coordinator's ProcessPool, set by initWorker
+cost_func=CostFunction(DESCENT_COST, "descent")			# Cost of the descent optimizers, redefined in main by --CostFunction
+sweepCost=CostFunction(SWEEP_COST, "sweep")				# Cost of the brute force sweep, which only penalizes configurations missing the requirements
+
+#----------------------------------------------------------------------------------------------------------------------------------------------------------
+#			SCRIPT EXECUTION FUNCTION
+#----------------------------------------------------------------------------------------------------------------------------------------------------------
+class Evaluation(list):
+	"runScript rows of one simulation with the summary computed where it ran: the RunStats of its clients and its status (simulated, cached, failed or timeout)"
+	stats=None
+	status=None
+	record=None								# Profiling marks of a job run in a worker process
+	measurements=()							# Resource measurements of a job run in a worker process
+
+def runScript(rowNo, scriptName, options, comment, *extra):
+	"This function runs the input script file and returns an Evaluation of its rows. Extra arguments (e.g. genIndex) are appended to every row"
+	desc=""
+	sys.stdout.write("\rRunning Case: row no {}\r".format(rowNo))
+	sys.stdout.flush()
+	profiling.mark("options", options)
+	result=Evaluation()
+	extra=list(extra)
+	cacheKey=None
+	cached=None
+	if simCache is not None:								# Reuse a previous simulation of the same configuration if available
+		cacheKey=simCache.key(scriptName, options)
+		cached=simCache.lookup(cacheKey)
+	if cached is not None:
+		desc=cached[0]+" - "+comment
+		for client in cached[1]:
+			result.append([rowNo, scriptName]+client+[desc]+extra)
+		result.status="cached"
+	else:
+		parser=sim_output.OutputParser()
+		try:		#Run the compiled scratch program (or ./waf when it cannot be resolved) and parse its output as it is printed
+			sim_exec.runSimulation(scriptName, options, profiling.timedFeed(parser.feed))
+		except sim_exec.SimulationTimeout as error:
+			result.status="timeout"
+			desc+="[TIMEOUT] - "+str(error)+"\n[COMMENT] - "+comment
+			result.append([rowNo, scriptName, sim_exec.TIMEOUT_CLIENT, 0, 60000, 0, 0, 0, desc]+extra) # Timed out runs are told apart from other failures by the dummy client 60001
+		except Exception as error:
+			result.status="failed"
+			desc+="[ERROR] - "+str(error)+"\n[COMMENT] - "+comment 			# Concatenate Error message to comment
+			result.append([rowNo, scriptName, 60000, 0, 60000, 0, 0, 0, desc]+extra) # To observe error message in output, a dummy client 60000 is used
+		else:
+			# concatenate comment to description if present
+			desc=parser.desc+" - "+comment
+			clients=parser.clients()
+			result.status="simulated" if len(clients)>0 else "failed"
+			for client in clients:
+				result.append([rowNo, scriptName]+client+[desc]+extra)			#write output to queue
+			if simCache is not None:
+				simCache.store(cacheKey, parser.desc, clients)
+	if(len(result)==0):
+		result.append([rowNo, scriptName, 60000, 0, 60000, 0, 0, 0, "FAILED COMMAND: "+sim_exec.commandString(scriptName, options)]+extra)
+	profiling.mark("status", result.status)
+	result.stats=RunStats(result)							# Aggregated here, so a worker process returns it with the rows
+	return result
+
+def runStats(output):
+	"This function returns the RunStats of a run: the one computed with its Evaluation, or computed now for rows replayed from a checkpoint or returned by a worker daemon"
+	stats=getattr(output, "stats", None)
+	return stats if stats is not None else RunStats(output)
+
+#----------------------------------------------------------------------------------------------------------------------------------------------------------
+#			Run Bookkeeping
+#----------------------------------------------------------------------------------------------------------------------------------------------------------
+def configOptions(Parameters, config):
+	"This function returns the (options, comment) strings of a configuration"
+	options=""
+	comment=""
+	for j in range(len(Parameters)):							# Build options string from parameters
+		options+="--{}={} ".format(Parameters[j],config[j])
+		if j==0:									# Build comments string from parameters
+			comment+="Simulated with {} = {}".format(Parameters[j],config[j])
+		else:
+			comment+=", {} = {}".format(Parameters[j],config[j])
+	return (options, comment)
+
+def configRunNo(options, j):
+	"This function returns the RunNo of replicate j of a configuration, offset by a hash of its options so configurations get different seeds but a configuration bred again reuses its cached runs"
+	return zlib.crc32(options.encode())%1000+j+1
+
+def scriptRandom(scriptName):
+	"This function returns the random generator of a script, seeded from the module generator without drawing from it, so a seeded campaign gives each script the same stream whichever thread starts first"
+	return random.Random("{}-{}".format(scriptName, random.getstate()))
+
+def writeRaw(writer, store, path, header, output, generation=-1):
+	"This function stores the raw rows of a run in the columnar store if one is open, otherwise in its own per-test CSV file and in the CSV file of all runs at path"
+	if store is not None:
+		store.append(output, generation)		# Store raw results in the columnar store instead of per-test CSV files
+		return
+	testPath=path[:-len(".csv")]+"_Test_"+str(output[0][0])+".csv"
+	writer.create(testPath, header)				# Create Output CSV file in which to store raw results of this simulation
+	writer.append(testPath, output)
+	writer.append(path, output)					# Write results to csv file
+
+#----------------------------------------------------------------------------------------------------------------------------------------------------------
+#			Worker Process Pool
+#----------------------------------------------------------------------------------------------------------------------------------------------------------
+def workerConfig():
+	"This function returns the simulation settings of this process which worker processes copy when they start"
+	return {"useWaf": sim_exec.useWaf, "buildDir": sim_exec.buildDir, "timeoutFactor": sim_exec.timeoutFactor, "minTimeout": sim_exec.minTimeout,
+			"defaultSimTime": sim_exec.defaultSimTime, "cache": simCache.path if simCache is not None else None, "measure": sim_exec.resources is not None}
+
+def initWorker(config, pids):
+	"This function prepares a new worker process with the coordinator's settings, its own cache connection and the queue to report simulation pids on"
+	global simCache, pidQueue
+	pidQueue=pids
+	signal.signal(signal.SIGINT, signal.SIG_IGN)			# Interrupts are handled by the coordinator, which shuts the pool down
+	for name in ("useWaf", "buildDir", "timeoutFactor", "minTimeout", "defaultSimTime"):
+		setattr(sim_exec, name, config[name])
+	if config["cache"] is not None:
+		simCache=SimCache(config["cache"], config["buildDir"])
+	if config["measure"]:									# Admission and pinning are decided by the coordinator, the worker only measures
+		sim_exec.resources=ResourceManager()
+		sim_exec.resources.measurements=[]
+
+def workerJob(traced, cpus, jobId, fn, *args):
+	"This function runs a job in a worker process on the cpus it was admitted to, and returns its result with the profiling marks and resource measurements made while it ran"
+	record=None
+	if traced:
+		record={"start": time.time()}
+		profiling.local.record=record
+	if sim_exec.resources is not None:
+		sim_exec.resources.assigned=cpus
+		sim_exec.resources.reporter=lambda pid: pidQueue.put((jobId, pid))
+	try:
+		result=fn(*args)
+	finally:
+		profiling.local.record=None
+	if isinstance(result, Evaluation):
+		result.record=record
+		if sim_exec.resources is not None:
+			result.measurements=sim_exec.resources.drain()
+	return result
+
+def lostEvaluation(rowNo, scriptName, options, comment, *extra):
+	"This function returns the failed Evaluation of a simulation whose worker process died every time it was submitted"
+	result=Evaluation([[rowNo, scriptName, 60000, 0, 60000, 0, 0, 0, "FAILED COMMAND: "+sim_exec.commandString(scriptName, options)+" (worker process died)"]+list(extra)])
+	result.status="failed"
+	result.stats=RunStats(result)
+	return result
+
+def setOutcome(setter, value):
+	"This function completes a future unless it was cancelled meanwhile"
+	try:
+		setter(value)
+	except concurrent.futures.InvalidStateError:
+		pass
+
+class PoolFuture(concurrent.futures.Future):
+	"Future of a ProcessPool job, which follows the job when it is resubmitted to a new pool. Like an executor future, it cannot be cancelled once a worker process runs the job, but its simulation can be killed"
+
+	def __init__(self, job=None):
+		super().__init__()
+		self.inner=None
+		self.job=job						# SimJob admitted for the simulation, None without a resource manager
+
+	def cancel(self):
+		if self.inner is not None and not self.inner.cancel():
+			return False
+		return super().cancel()
+
+	def kill(self):
+		"This function kills the running simulation of the job, which then completes as failed, and returns whether it was killed"
+		return self.job is not None and self.job.kill()
+
+class ProcessPool:
+	"Executor-like pool of long-lived worker processes for runScript jobs. Each job runs in a warm interpreter which parses and aggregates its own output and returns an Evaluation, so the coordinator's GIL only handles the summaries"
+
+	def __init__(self, processes):
+		self.processes=processes
+		self.executor=None					# Started on the first job, once main has configured the simulation settings
+		self.lock=threading.Lock()
+		self.closed=False
+		self.pids=None						# Queue of (job id, pid) of the simulations started by the worker processes
+		self.jobs={}						# Job id -> SimJob admitted here for it
+		self.ids=itertools.count()
+
+	def __enter__(self):
+		return self
+
+	def __exit__(self, *exc):
+		return False								# The pool is long-lived and shut down explicitly by its owner
+
+	def start(self):
+		"This function starts the worker processes with a snapshot of the current simulation settings"
+		context=mp.get_context("forkserver" if "forkserver" in mp.get_all_start_methods() else "spawn")	# Not fork, the coordinator already runs threads
+		if self.pids is not None:
+			self.pids.put(None)						# A new queue per pool: a worker killed while writing may leave the old one locked
+		self.pids=context.Queue()
+		threading.Thread(target=self.watchPids, args=(self.pids,), daemon=True).start()
+		self.executor=concurrent.futures.ProcessPoolExecutor(self.processes, mp_context=context, initializer=initWorker, initargs=(workerConfig(), self.pids))
+
+	def watchPids(self, pids):
+		"This function hands the pid of every simulation started by a worker process to the job admitted for it, whose memory then counts as the simulation's RSS plus its expected growth"
+		for (jobId, pid) in iter(pids.get, None):
+			job=self.jobs.get(jobId)
+			if job is not None:
+				job.attached(pid)
+
+	def submit(self, fn, rowNo, scriptName, options, comment, *extra):
+		"This function accepts the same arguments as executor.submit(runScript, ...) and returns a future of its Evaluation. The simulation is admitted and pinned by the resource manager of this process"
+		job=None
+		jobId=next(self.ids)
+		if sim_exec.resources is not None:
+			job=sim_exec.resources.job(scriptName, options)
+			job.__enter__()									# Waits until the simulation fits in free memory
+			self.jobs[jobId]=job
+		args=(profiling.tracer is not None, job.cpus if job is not None else None, jobId, fn, rowNo, scriptName, options, comment)+extra
+		future=PoolFuture(job)
+		try:
+			self.dispatch(future, job, args, MAX_RESUBMITS)
+		except BaseException:
+			if job is not None:
+				del self.jobs[jobId]
+				job.__exit__(None, None, None)
+			raise
+		return future
+
+	def dispatch(self, future, job, args, retries, broken=None):
+		"This function submits a job to the worker processes, starting a new pool if none is running or if broken, the pool the job was lost with, is still in use"
+		with self.lock:
+			if self.executor is None or self.executor is broken:
+				if broken is not None:
+					print("Worker process died, restarting the worker process pool")
+					broken.shutdown(wait=False)
+				self.start()
+			executor=self.executor
+			try:
+				inner=executor.submit(workerJob, *args)
+			except concurrent.futures.process.BrokenProcessPool:	# A worker process died (e.g. killed for memory) since the last job finished
+				print("Worker process pool broken, restarting it")
+				self.start()
+				executor=self.executor
+				inner=executor.submit(workerJob, *args)
+		future.inner=inner
+		inner.add_done_callback(lambda done: self.finished(future, job, args, retries, executor, done))
+
+	def finished(self, future, job, args, retries, executor, done):
+		if not done.cancelled() and isinstance(done.exception(), concurrent.futures.process.BrokenProcessPool) and not future.done():
+			if retries>0 and not self.closed:				# Every job in flight is lost with the pool, not only the one which killed its worker
+				try:
+					self.dispatch(future, job, args, retries-1, executor)
+					return
+				except RuntimeError:						# Shut down meanwhile
+					pass
+			if args[3] is runScript:
+				done=concurrent.futures.Future()
+				done.set_result(lostEvaluation(*args[4:]))
+		if job is not None:
+			del self.jobs[args[2]]
+			job.__exit__(None, None, None)
+		if done.cancelled():
+			future.cancel()
+			return
+		if done.exception() is not None:
+			setOutcome(future.set_exception, done.exception())
+			return
+		result=done.result()
+		if isinstance(result, Evaluation):
+			if sim_exec.resources is not None:
+				sim_exec.resources.merge(result.measurements)
+				result.measurements=()
+			if simCache is not None and result.status is not None:
+				simCache.tally(result.status=="cached")
+		setOutcome(future.set_result, result)
+
+	def slots(self):
+		return self.processes
+
+	def shutdown(self, wait=True):
+		with self.lock:
+			self.closed=True
+			if self.executor is not None:
+				self.executor.shutdown(wait, cancel_futures=True)
+				self.pids.put(None)
+
+#----------------------------------------------------------------------------------------------------------------------------------------------------------
+#			Evaluator API
+#----------------------------------------------------------------------------------------------------------------------------------------------------------
+class Evaluator:
+	"Evaluation of testbed configurations from Python, without running an optimizer script. Uses worker processes by default, or any executor taking runScript jobs (a SharedPool client, a WorkerPool or a thread pool)"
+
+	def __init__(self, processes=None, cache=None, executor=None):
+		global simCache
+		if cache is not None and simCache is None:
+			simCache=SimCache(cache)
+		self.pool=None
+		if executor is None:
+			self.pool=ProcessPool(processes or mp.cpu_count())
+			executor=self.pool
+		self.executor=executor
+		self.rows=itertools.count(1)
+
+	def __enter__(self):
+		return self
+
+	def __exit__(self, *exc):
+		self.close()
+		return False
+
+	def submit(self, scriptName, options, comment="", *extra):
+		"This function starts one simulation with an ns-3 option string and returns a future of its Evaluation"
+		return self.executor.submit(runScript, next(self.rows), scriptName, options, comment, *extra)
+
+	def evaluate(self, scriptName, Parameters, configs, runs=1, simTime=None):
+		"This function simulates runs replicates (RunNo 1 to runs) of every configuration, at simTime seconds if given, and returns the list of Evaluations of each configuration"
+		futures=[]
+		for config in configs:
+			(options, comment)=configOptions(Parameters, config) if simTime is None else fidelityOptions(Parameters, config, simTime)
+			futures.append([self.submit(scriptName, options+"--RunNo={} ".format(j+1), comment+", and RunNo = {}".format(j+1)) for j in range(runs)])
+		return [[future.result() for future in replicates] for replicates in futures]
+
+	def cost(self, evaluations, costFunction=cost_func):
+		"This function returns the mean cost of the Evaluations of one configuration"
+		return round(sum(costFunction.run(runStats(output)) for output in evaluations)/len(evaluations),4)
+
+	def slots(self):
+		return self.executor.slots() if hasattr(self.executor, "slots") else mp.cpu_count()
+
+	def close(self):
+		if self.pool is not None:
+			self.pool.shutdown()
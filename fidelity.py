@@ -0,0 +1,67 @@
+# Multi-fidelity evaluation
+# Successive halving and Hyperband over the ns-3 SimTime: candidates are simulated briefly with few replicates and only the best fraction is
+# promoted to longer simulations with more replicates
+#
+# Copyright (c) 2026 ParaOptimizationNS3 contributors
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy of this software and associated documentation files (the "Software"),
+# to deal in the Software without restriction, including without limitation the rights to use, copy, modify, merge, publish, distribute, sublicense,
+# and/or sell copies of the Software, and to permit persons to whom the Software is furnished to do so, subject to the following conditions:
+# The above copyright notice and this permission notice shall be included in all copies or substantial portions of the Software.
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS
+# IN THE SOFTWARE.
+
+#import
+import math
+
+from result_writer import AV_HEADER
+
+FIDELITY_AV_HEADER=AV_HEADER+['SimTime (s)','Runs','Rung']
+
+#----------------------------------------------------------------------------------------------------------------------------------------------------------
+#			Successive Halving
+#----------------------------------------------------------------------------------------------------------------------------------------------------------
+class Halving:
+	"Rungs of increasing fidelity, each a (SimTime, replicates) pair growing by a factor eta up to (maxSimTime, maxRuns), and the promotion rule between them"
+
+	def __init__(self, minSimTime=10, maxSimTime=120, eta=3, maxRuns=4):
+		self.eta=max(2, eta)
+		simTimes=[]
+		simTime=minSimTime
+		while simTime<maxSimTime:
+			simTimes.append(simTime)
+			simTime*=self.eta
+		simTimes.append(maxSimTime)
+		last=len(simTimes)-1
+		self.rungs=[(simTimes[k], max(1, int(round(maxRuns/self.eta**(last-k))))) for k in range(len(simTimes))]
+
+	def keep(self, count):
+		"This function returns how many of count candidates of a rung are promoted to the next"
+		return max(1, count//self.eta)
+
+	def promote(self, costs, count):
+		"This function accepts a dict of candidate -> cost and returns the count lowest cost candidates"
+		return sorted(costs, key=lambda candidate: costs[candidate])[:count]
+
+	def brackets(self):
+		"This function returns the Hyperband brackets as (number of candidates, first rung), from the most aggressive to plain full fidelity evaluation"
+		last=len(self.rungs)-1
+		return [(int(math.ceil((last+1)/(s+1)*self.eta**s)), last-s) for s in range(last, -1, -1)]
+
+def fidelityOptions(Parameters, config, simTime):
+	"This function returns the (options, comment) strings of a configuration simulated for simTime seconds. A SimTime parameter of the configuration is overridden, otherwise --SimTime is added"
+	options=""
+	comment=""
+	for j in range(len(Parameters)):							# Build options string from parameters
+		value=simTime if Parameters[j]=="SimTime" else config[j]
+		options+="--{}={} ".format(Parameters[j],value)
+		if j==0:									# Build comments string from parameters
+			comment+="Simulated with {} = {}".format(Parameters[j],value)
+		else:
+			comment+=", {} = {}".format(Parameters[j],value)
+	if "SimTime" not in Parameters:
+		options+="--SimTime={} ".format(simTime)
+		comment+=", SimTime = {}".format(simTime)
+	return (options, comment)
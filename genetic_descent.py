@@ -25,221 +25,72 @@ import numbers
 import os
 import platform
 import random
-import re
 import string
 import subprocess
 import sys
 import time
 
-#----------------------------------------------------------------------------------------------------------------------------------------------------------
-#			Metric Cost Function 
-#----------------------------------------------------------------------------------------------------------------------------------------------------------
-def cost_func(avAvThroughput, minAvThroughput, avAvLatency, maxAvLatency, avPackLossRate):
-	"This function accepts the output metrics of the simulation and returns a cost metric for performance comparison"
-	cost=avAvLatency+avPackLossRate+(60-avAvThroughput)
-	if avAvLatency>300:
-		cost+=(avAvLatency-300)
-	if avAvLatency==0:						# Give large cost to error cases
-		cost+=20000
-	if maxAvLatency>300:					# Give large cost to cases that peform below minimum requirements
-		cost+=(maxAvLatency-300)/100
-	if avAvThroughput<9.6:					# Give large cost to cases that peform below minimum requirements
-		cost+=(9.6-avAvThroughput)*100
-	if avAvThroughput==0:					# Give large cost to error cases
-		cost+=10000
-	if minAvThroughput<9.6:
-		cost+=9.6-minAvThroughput
-	if avPackLossRate>1:
-		cost+=(avPackLossRate-1)*10
-	cost=round(cost,4)
-	#print("avAvThroughput={} , maxAvLatency={} , avAvThroughput={} , minAvThroughput={} , avPackLossRate={}".format(avAvLatency,maxAvLatency,avAvThroughput,minAvThroughput,avPackLossRate))
-	return cost;
+import numpy as np
+
+import evaluator
+import sim_exec
+import profiling
+from aggregation import RunStats
+from checkpoint import Checkpoint
+from evaluator import ProcessPool, configOptions, configRunNo, cost_func, runScript, runStats, scriptRandom, writeRaw
+from fidelity import FIDELITY_AV_HEADER, Halving, fidelityOptions
+from param_space import ParamSpace, scriptSpace
+from pareto import OBJECTIVES, ParetoArchive, objectiveVector, selectSurvivors, tournament
+from population import Population
+from resources import PIN_MODES, ResourceManager
+from result_store import ColumnarStore
+from result_writer import AV_HEADER, RAW_HEADER, ResultWriter
+from scheduler import POLICIES, SharedPool, SpeculativeBatch, parseWeights, runCampaign
+from sim_cache import SimCache
+from sim_worker import WorkerPool, parseAddresses
+from surrogate import Surrogate
+
+workerPool=None								# Distributed simulation workers, connected in main when requested
+resultStore=None							# Columnar raw result store, replaces the per-test raw CSV files when enabled in main
+sharedPool=None								# Long-lived simulation pool shared by all scripts, created in main
+speculateTail=0.0							# Fraction of a batch whose stragglers are re-run speculatively, 0 for none
+GEN_RAW_HEADER=RAW_HEADER+['Generation Index']
+INITIAL_LIMIT=1024							# Largest space simulated whole as generation 0, larger spaces start from a random sample of this many configurations
+
 #----------------------------------------------------------------------------------------------------------------------------------------------------------
 #			Parameter and Values Generator 
 #----------------------------------------------------------------------------------------------------------------------------------------------------------
-def Get_Params_Vals(script):
-	"This function accepts the script to be simulated and returns all the tunable parameter options for the script"
-	#DataRates=[24000]
+def Get_Param_Space(script):
+	"This function accepts the script to be simulated and returns the ParamSpace of its tunable parameters, from Param_Spaces/<script>.json if present"
 	#DataRates=[16*1024,24*1024,32*1024,40*1024,48*1024,56*1024]
 	DataRates=[16000,24000,48000,56000]
 	#PacketSizes=[64,128,256,512,1024,2048]
-	#PacketSizes=[512]
 	PacketSizes=[64,256,1024,2048]
-	SimTimes=[120]
-	#SimTimes=[1]
-	TransferProtocols=["UDP","TCP"]
-	
-	# CSMA Protocol-specific parameters
-	ChannelDataRates=["100Mbps","1000Mbps"]
-	ChannelMTUs=[1492,1500]
-	EncapModes=["Dix","Llc"]
-	#EncapModes=["Dix"]
-	
-	# Wimax Protocol-specific parameters
-	ModulationTypes=["BPSK_12","QPSK_12","QPSK_34","QAM16_12","QAM16_34","QAM64_23","QAM64_34"]
-	#ModulationTypes=["QAM16_34","QAM64_23","QAM64_34"]
-	Schedulers=["Simple","RTPS","MBQOS"]
-	#Schedulers=["Simple"]
-	ServiceFlowTypes=["BE","NRTPS","RTPS","UGS"]
-	#ServiceFlowTypes=["UGS"]
-	
-	# PLC Protocol-specific parameters
-	PlcLowFreqs=[0,10,100]
-	PlcHiFreqs=[10e6,50e6,10e7]
-	PlcSubBands=[100,200,300]
-	PlcHeaderMods=["BPSK_1_4","BPSK_1_2","QPSK_1_2","QAM16_1_2","QAM64_16_21","QAM16_RATELESS","QAM32_RATELESS","QAM64_RATELESS"]
-	PlcPayloadMods=["BPSK_1_4","BPSK_1_2","QPSK_1_2","QAM16_1_2","QAM64_16_21","QAM16_RATELESS","QAM32_RATELESS","QAM64_RATELESS"]
-	
-	# if script=="testbed-Lowpan-CSMA-v1":
-		# Params=["DataRate","PacketSize","SimTime","TransferProtocol","ChannelDataRate","EncapMode","ChannelMTU"]
-		# vals=[[],[],[],[],[],[],[]]
-		# for DR in DataRates:
-			# for PS in PacketSizes:
-				# for ST in SimTimes:
-					# for TP in TransferProtocols:
-						# for CDR in ChannelDataRates:
-							# for EM in EncapModes:
-								# if EM=="Dix":
-									# CMTU=1500
-								# else:
-									# CMTU=1492
-								# vals[0].append(DR)
-								# vals[1].append(PS)
-								# vals[2].append(ST)
-								# vals[3].append(TP)
-								# vals[4].append(CDR)
-								# vals[5].append(EM)
-								# vals[6].append(CMTU)
-								
-	# if script=="testbed-Lowpan-Wimax-v1":
-		# Params=["DataRate","PacketSize","SimTime","TransferProtocol","ModulationType","Scheduler","ServiceFlowType"]
-		# vals=[[],[],[],[],[],[],[]]
-		# for DR in DataRates:
-			# for PS in PacketSizes:
-				# for ST in SimTimes:
-					# for TP in TransferProtocols:
-						# for MT in ModulationTypes:
-							# for Sch in Schedulers:
-								# for SFT in ServiceFlowTypes:
-									# vals[0].append(DR)
-									# vals[1].append(PS)
-									# vals[2].append(ST)
-									# vals[3].append(TP)
-									# vals[4].append(MT)
-									# vals[5].append(Sch)
-									# vals[6].append(SFT)
-	# if script=="testbed-Lowpan-WiFi-v1":
-		# Params=["DataRate","PacketSize","SimTime","TransferProtocol"]
-		# vals=[[],[],[],[]]
-		# for DR in DataRates:
-			# for PS in PacketSizes:
-				# for ST in SimTimes:
-					# for TP in TransferProtocols:
-						# vals[0].append(DR)
-						# vals[1].append(PS)
-						# vals[2].append(ST)
-						# vals[3].append(TP)
-	# if script=="testbed-PLC-CSMA-v1":
-		# Params=["DataRate","PacketSize","SimTime","TransferProtocol","ChannelDataRate","EncapMode","ChannelMTU","PlcLowFreq","PlcHiFreq","PlcSubBands","PlcHeaderMod","PlcPayloadMod"]
-		# vals=[[],[],[],[],[],[],[],[],[],[],[],[]]
-		# for DR in DataRates:
-			# for PS in PacketSizes:
-				# for ST in SimTimes:
-					# for TP in TransferProtocols:
-						# for CDR in ChannelDataRates:
-							# for EM in EncapModes:
-								# if EM=="Dix":
-									# CMTU=1500
-								# else:
-									# CMTU=1492
-								# for PLF in PlcLowFreqs:
-									# for PHF in PlcHiFreqs:
-										# for PSB in PlcSubBands:
-											# for PHM in PlcHeaderMods:
-												# for PPM in PlcPayloadMods:
-													# vals[0].append(DR)
-													# vals[1].append(PS)
-													# vals[2].append(ST)
-													# vals[3].append(TP)
-													# vals[4].append(CDR)
-													# vals[5].append(EM)
-													# vals[6].append(CMTU)
-													# vals[7].append(PLF)
-													# vals[8].append(PHF)
-													# vals[9].append(PSB)
-													# vals[10].append(PHM)
-													# vals[11].append(PPM)
-	# if script=="testbed-PLC-Wimax-v1":
-		# Params=["DataRate","PacketSize","SimTime","TransferProtocol","ModulationType","Scheduler","ServiceFlowType","PlcLowFreq","PlcHiFreq","PlcSubBands","PlcHeaderMod","PlcPayloadMod"]
-		# vals=[[],[],[],[],[],[],[],[],[],[],[],[]]
-		# for DR in DataRates:
-			# for PS in PacketSizes:
-				# for ST in SimTimes:
-					# for TP in TransferProtocols:
-						# for MT in ModulationTypes:
-							# for Sch in Schedulers:
-								# for SFT in ServiceFlowTypes:
-									# for PLF in PlcLowFreqs:
-										# for PHF in PlcHiFreqs:
-											# for PSB in PlcSubBands:
-												# for PHM in PlcHeaderMods:
-													# for PPM in PlcPayloadMods:
-														# vals[0].append(DR)
-														# vals[1].append(PS)
-														# vals[2].append(ST)
-														# vals[3].append(TP)
-														# vals[4].append(MT)
-														# vals[5].append(Sch)
-														# vals[6].append(SFT)
-														# vals[7].append(PLF)
-														# vals[8].append(PHF)
-														# vals[9].append(PSB)
-														# vals[10].append(PHM)
-														# vals[11].append(PPM)
-	# if script=="testbed-PLC-WiFi-v1":
-		# Params=["DataRate","PacketSize","SimTime","TransferProtocol","ChannelDataRate","ChannelMTU","EncapMode","PlcLowFreq","PlcHiFreq","PlcSubBands","PlcHeaderMod","PlcPayloadMod"]
-		# vals=[[],[],[],[],[],[],[],[],[]]
-		# for DR in DataRates:
-			# for PS in PacketSizes:
-				# for ST in SimTimes:
-					# for TP in TransferProtocols:	
-						# for PLF in PlcLowFreqs:
-							# for PHF in PlcHiFreqs:
-								# for PSB in PlcSubBands:
-									# for PHM in PlcHeaderMods:
-										# for PPM in PlcPayloadMods:
-											# vals[0].append(DR)
-											# vals[1].append(PS)
-											# vals[2].append(ST)
-											# vals[3].append(TP)
-											# vals[4].append(PLF)
-											# vals[5].append(PHF)
-											# vals[6].append(PSB)
-											# vals[7].append(PHM)
-											# vals[8].append(PPM)
-	Params=["DataRate","PacketSize"]
-	vals=[[],[]]
-	for DR in DataRates:
-		for PS in PacketSizes:
-			vals[0].append(DR)
-			vals[1].append(PS)
-						
-	return (Params, vals)
+	# Larger spaces of the protocol-specific parameters are in Param_Spaces/Examples
+	return scriptSpace(script, ParamSpace(["DataRate","PacketSize"], [DataRates, PacketSizes]))
+
+def Get_Trait_Vals(space):
+	"This function accepts a ParamSpace and returns the names and value choices of its free parameters, the traits the optimizers evolve. Derived parameters are filled in by space.complete"
+	return ([space.Parameters[j] for j in space.free], [space.choices[j] for j in space.free])
+
+def Get_Initial_Traits(space, rng):
+	"This function accepts a ParamSpace and returns the trait values of generation 0, the whole space or a random sample of INITIAL_LIMIT configurations of a larger one"
+	if len(space)<=INITIAL_LIMIT:
+		indices=range(len(space))
+	else:
+		indices=sorted(rng.sample(range(len(space)), INITIAL_LIMIT))
+	return [space.traits(i) for i in indices]
 
 
 #----------------------------------------------------------------------------------------------------------------------------------------------------------
 #			GENETIC OPTIMIZER (Uses Weighted Global Criterion for evaluation)
 #----------------------------------------------------------------------------------------------------------------------------------------------------------	
-def genetic_optimizer(scriptName,Parameters,values,Runs,maxGen,maxElites,maxGenPop,mutationChance,mutationRate,stepSize):
-	"This function accepts a list of parameters, a 2D list of initial values, and the maximum number of iterations to run to find the optimal solution using an evolutionary algorithm"
-	values_nextGen=values
-	values_GenPop={}
-	cost_GenPop={}
-	result_GenPop={}
+def genetic_optimizer(scriptName,space,Runs,maxGen,maxElites,maxGenPop,mutationChance,mutationRate,stepSize,resume=False,patternSearch=False,surrogate=None,halving=None,screenFactor=4):
+	"This function accepts the ParamSpace of a script and the maximum number of iterations to run to find the optimal solution using an evolutionary algorithm"
+	(Parameters, values)=Get_Trait_Vals(space)			# Only the free parameters are evolved, values stays the choice list of each trait
+	population=Population(maxGenPop)					# General Population of potential parents
+	elites=Population(maxElites)						# Lowest cost members used for breeding late generations
 	Lowest_cost=10000
-	values_elites={}
-	cost_elites={}
-	result_elites={}
 	i=0
 	xmin=100000
 	xmax=0
@@ -252,402 +103,691 @@ def genetic_optimizer(scriptName,Parameters,values,Runs,maxGen,maxElites,maxGenP
 			maxVals[j]=max(values[j])
 	Optimum_Found=False
 	bestHash="N/A"
-	for gen in range(maxGen):
+	rng=scriptRandom(scriptName)						# Generator of this script, checkpointed with it, so scripts optimized in parallel keep their own state
+	initial=Get_Initial_Traits(space, rng)
+	values_nextGen=[[traits[j] for traits in initial] for j in range(len(Parameters))]	# Generation 0
+	cacheStart=evaluator.simCache.stats() if evaluator.simCache is not None else (0,0)
+	writer=ResultWriter()								# Buffered writer thread for all result files of this optimization
+	checkpoint=Checkpoint("Checkpoints/Checkpoint_"+scriptName, [writer, resultStore])	# State saved before every batch of simulations
+	(state, completed)=checkpoint.load() if resume else (None, {})
+	startGen=0
+	if state is not None:
+		if state["phase"]=="done":
+			writer.close()
+			print("{} already optimized, using checkpointed result".format(scriptName))
+			return state["optimum"]
+		startGen=state["gen"]
+		population=state["population"]
+		elites=state["elites"]
+		bestHash=state["bestHash"]
+		Lowest_cost=state["Lowest_cost"]
+		values_nextGen=state["values_nextGen"]
+		surrogate=state["surrogate"]
+		rng.setstate(state["random"])
+		print("Resuming {} at Gen {} {}: {} of {} runs already completed".format(scriptName, startGen, state["phase"], len(completed), len(state["jobs"])))
+	for gen in range(startGen, maxGen):
+		resumePhase=state["phase"] if state is not None and state["gen"]==gen else None
 		if Lowest_cost > 0:
-			q=[]
-			runNo=0
-			runRandomizer=random.randrange(1,1000)
-			# Run generation and obtain results
-			
-			with open("Av_Results/Gen"+str(gen)+"_Averaged_Results_"+scriptName+".csv", 'w', newline='') as outputFile:		# Create Output CSV file in which to store raw results of all simulations for this script
-				outputWriter = csv.writer(outputFile)
-				outputWriter.writerow(['Test No', 'Script Name', 'Average Average Throughput (kbps)', 'Minimum Average Throughput (kbps)', 'Average Minimum Device Throughput (kbps)', 'Minimum Minimum Device Throughput (kbps)', 'Average Average Latency (ms)', 'Maximum Average Latency (ms)', 'Average Maximum Device Latency (ms)', 'Maximum Maximum Device Latency (ms)', 'Average Packet Loss Rate (%)', 'Maximum Device Packet Loss Rate (%)', 'Description'])
-		
-			with open("Raw_Results/Gen"+str(gen)+"_Raw_Results_"+scriptName+".csv", 'w', newline='') as outputFile:		# Create Output CSV file in which to store raw results of all simulations for this script
-				outputWriter = csv.writer(outputFile)
-				outputWriter.writerow(['Test No.', 'Script Name', 'Client Id','Average Throughput (kbps)', 'Min Device Throughput (kbps)', 'Average Latency (ms)', 'Max Device Latency (ms)', 'Packet Loss Rate (%)', 'Description', 'Generation Index'])
-		
-			print("Running Gen {} Parallely using {} threads".format(gen,mp.cpu_count()))	# Terminal Message for visibility of execution	
-			with concurrent.futures.ThreadPoolExecutor(mp.cpu_count()) as executor:			# Parallel execution using as many threads as available cpu cores
-				for i in range(len(values_nextGen[0])):
-					options=""
-					comment=""
-					for j in range(len(Parameters)):							# Build options string from parameters
-						options+="--{}={} ".format(Parameters[j],values_nextGen[j][i])
-						if j==0:									# Build comments string from parameters
-							comment+="Simulated with {} = {}".format(Parameters[j],values_nextGen[j][i])
-						else:
-							comment+=", {} = {}".format(Parameters[j],values_nextGen[j][i])
-					for j in range(Runs):
-						q.append(executor.submit(runScript,i+1,scriptName,options+"--RunNo={} ".format(runNo+runRandomizer+1),comment+", and RunNo = {}".format(runNo+runRandomizer+1),i))
-						runNo+=1
-
-				for future in concurrent.futures.as_completed(q):		
-					output=future.result()
-					avCount=0
-					avAvThroughput=0
-					minAvThroughput=60000
-					avMinThroughput=0
-					minMinThroughput=60000
-					avAvLatency=0
-					maxAvLatency=0
-					avMaxLatency=0
-					maxMaxLatency=0
-					avPackLossRate=0
-					maxPackLossRate=0
-					for result in output:		# Read and process Results from output queue as long as results are available
-						avCount+=1;
-						if(avCount==1):
-							testNo=result[0]
-							#scriptName=str(result[1])
-							with open("Raw_Results/Gen"+str(gen)+"_Raw_Results_"+scriptName+"_Test_"+str(testNo)+".csv", 'w', newline='') as outputFile:		# Create Output CSV file in which to store raw results of this simulation
-								outputWriter = csv.writer(outputFile)
-								outputWriter.writerow(['Test No.', 'Script Name', 'Client Id','Average Throughput (kbps)', 'Min Device Throughput (kbps)', 'Average Latency (ms)', 'Max Device Latency (ms)', 'Packet Loss Rate (%)', 'Description', 'Generation Index'])
-								outputWriter.writerow(result)	
-							with open("Raw_Results/Gen"+str(gen)+"_Raw_Results_"+scriptName+".csv", 'a', newline='') as outputFile:		# Write results to csv file
-								outputWriter = csv.writer(outputFile)
-								outputWriter.writerow(result)
-						else:
-							with open("Raw_Results/Gen"+str(gen)+"_Raw_Results_"+scriptName+"_Test_"+str(testNo)+".csv", 'a', newline='') as outputFile:
-								outputWriter = csv.writer(outputFile)
-								outputWriter.writerow(result)	
-							with open("Raw_Results/Gen"+str(gen)+"_Raw_Results_"+scriptName+".csv", 'a', newline='') as outputFile:
-								outputWriter = csv.writer(outputFile)
-								outputWriter.writerow(result)
-						if(result[3]>0):
-							avAvThroughput=round((avAvThroughput*(avCount-1)+result[3])/avCount,3);
-							if(result[3]<minAvThroughput):
-								minAvThroughput=result[3]
-							avMinThroughput=round((avMinThroughput*(avCount-1)+result[4])/avCount,3);
-							if(result[4]<minMinThroughput):
-								minMinThroughput=result[4]
-							avAvLatency=round((avAvLatency*(avCount-1)+result[5])/avCount,3);
-							if(result[5]>maxAvLatency):
-								maxAvLatency=result[5]
-							avMaxLatency=round((avMaxLatency*(avCount-1)+result[6])/avCount,3);
-							if(result[6]>maxMaxLatency):
-								maxMaxLatency=result[6]
-							avPackLossRate=round((avPackLossRate*(avCount-1)+result[7])/avCount,3);
-							if(result[7]>maxPackLossRate):
-								maxPackLossRate=result[7]
-							
-						if ", and RunNo" in result[8]:
-							desc=result[8].split(', and RunNo')[0]			# Delete RunNo trailer from successful result description string
-							desc_unedited=result[8]
-						
-						genIndex=result[9]
-					with open("Av_Results/Gen"+str(gen)+"_Averaged_Results_"+scriptName+".csv", 'a', newline='') as outputFile:		# Create Output CSV file in which to store averaged results of the simulation for this script
-						outputWriter = csv.writer(outputFile)
-						outputWriter.writerow([testNo, scriptName, avAvThroughput, minAvThroughput, avMinThroughput, minMinThroughput, avAvLatency, maxAvLatency, avMaxLatency, maxMaxLatency, avPackLossRate, maxPackLossRate, desc_unedited])		
+			if resumePhase!="descent":
+				if resumePhase=="generation":				# Resubmit the interrupted generation, skipping the runs which completed
+					jobs=state["jobs"]
+				else:
+					# Run generation and obtain results
+
+					writer.create("Av_Results/Gen"+str(gen)+"_Averaged_Results_"+scriptName+".csv", AV_HEADER)		# Create Output CSV file in which to store averaged results of all simulations for this script
+					if resultStore is None:
+						writer.create("Raw_Results/Gen"+str(gen)+"_Raw_Results_"+scriptName+".csv", GEN_RAW_HEADER)		# Create Output CSV file in which to store raw results of all simulations for this script
+					jobs=[]
+					for i in range(len(values_nextGen[0])):
+						(options, comment)=configOptions(space.Parameters, space.complete([values_nextGen[j][i] for j in range(len(Parameters))]))
+						for j in range(Runs):
+							jobs.append((i+1,scriptName,options+"--RunNo={} ".format(configRunNo(options, j)),comment+", and RunNo = {}".format(configRunNo(options, j)),i))
+					checkpoint.save({"gen": gen, "phase": "generation", "jobs": jobs, "population": population, "elites": elites, "bestHash": bestHash, "Lowest_cost": Lowest_cost, "values_nextGen": values_nextGen, "surrogate": surrogate, "random": rng.getstate()})
+
+				print("Running Gen {} Parallely using {} threads".format(gen,mp.cpu_count()))	# Terminal Message for visibility of execution
+				phaseStart=time.time()
+				recordTime=0.0								# Time spent aggregating results and maintaining the population and elites
+				for (output, replayed) in runBatch(jobs, checkpoint, completed):		# Parallel execution using as many threads as available cpu cores, or the distributed workers
+					recordStart=time.time()
+					if(len(output)==0):
+						print("Bad Output!!!!!!! Due to either malformed/unexpected output or error in parsing. Output is:"+str(output))
+					stats=runStats(output)								# Aggregate the per-client results of this run
+					testNo=stats.testNo
+					genIndex=output[0][9]
+					(avAvThroughput, minAvThroughput, avMinThroughput, minMinThroughput, avAvLatency, maxAvLatency, avMaxLatency, maxMaxLatency, avPackLossRate, maxPackLossRate)=stats.averagedMetrics()
+					desc_unedited=output[-1][8]
+					desc=desc_unedited.split(', and RunNo')[0]			# Delete RunNo trailer from result description string
+					if not replayed:									# Results of journaled runs were written before the interruption
+						writeRaw(writer, resultStore, "Raw_Results/Gen"+str(gen)+"_Raw_Results_"+scriptName+".csv", GEN_RAW_HEADER, output, gen)
+						writer.append("Av_Results/Gen"+str(gen)+"_Averaged_Results_"+scriptName+".csv", [stats.averagedRow(desc_unedited)])		# Store averaged results of the simulation for this script
 					#print("Result of testNo {} on script {} is {} {} {} {} {} {} {} {} {} {} {}".format(testNo, scriptName, avAvThroughput, minAvThroughput, avMinThroughput, minMinThroughput, avAvLatency, maxAvLatency, avMaxLatency, maxMaxLatency, avPackLossRate, maxPackLossRate, desc_unedited))
-					cost=cost_func(avAvThroughput, minAvThroughput, avAvLatency, maxAvLatency, avPackLossRate)			# Obtain weighted cost from cost function
+					cost=cost_func.run(stats)			# Obtain weighted cost from cost function
 					hash=""																								# Add result to general population
 					for j in range(len(Parameters)):																		# Get unique hash of this simulation
 						hash+=str(values_nextGen[j][genIndex])
-					if hash in values_GenPop.keys():																	# Check if a result already exists
-						if cost < cost_GenPop[hash]:																	# If new result is better, replace old result
-							cost_GenPop[hash]=cost
-							result_GenPop[hash]=[testNo, scriptName, avAvThroughput, minAvThroughput, avMinThroughput, minMinThroughput, avAvLatency, maxAvLatency, avMaxLatency, maxMaxLatency, avPackLossRate, maxPackLossRate, desc_unedited]
-					else:																								# Add result to list if it already exists
-						result_GenPop[hash]=[testNo, scriptName, avAvThroughput, minAvThroughput, avMinThroughput, minMinThroughput, avAvLatency, maxAvLatency, avMaxLatency, maxMaxLatency, avPackLossRate, maxPackLossRate, desc_unedited]
-						if maxGenPop > 0:																				# Check if General Population is limited
-							if len(cost_GenPop) >= maxGenPop:
-								maxHash=max(cost_GenPop, key=cost_GenPop.get)
-								if cost < cost_GenPop[maxHash]:
-									del cost_GenPop[maxHash]															# Delete highest cost Parent in General Population
-									del values_GenPop[maxHash]
-									values_GenPop[hash]=[values_nextGen[j][genIndex] for j in range(len(Parameters))]	# add to General Population
-									cost_GenPop[hash]=cost
-							else:
-								values_GenPop[hash]=[values_nextGen[j][genIndex] for j in range(len(Parameters))]			# Unconditionally add to General Population
-								cost_GenPop[hash]=cost
-						else:
-							values_GenPop[hash]=[values_nextGen[j][genIndex] for j in range(len(Parameters))]			# Unconditionally add to General Population
-							cost_GenPop[hash]=cost
-					
-					#print("Best Result with HASH={} is : {}".format(hash, result_GenPop[hash]))
-					
-					if len(cost_elites) == 0 or cost < max(list(cost_elites.values())):									# Check if new Elites List is needed
-						elite_hashes=sorted(cost_GenPop, key=cost_GenPop.get)
-						if len(elite_hashes)>maxElites:																	# Slice list if number of elements greater than maxElites
-							elite_hashes=elite_hashes[:maxElites]
-						cost_elites={}
-						result_elites={}
-						values_elites={}
-						#print("Elite Hashes:{}".format(elite_hashes))
-						for eliteHash in elite_hashes:																	# Build new Elites List											
-							values_elites[eliteHash]=values_GenPop[eliteHash]
-							result_elites[eliteHash]=result_GenPop[eliteHash]
-							cost_elites[eliteHash]=cost_GenPop[eliteHash]		
-			
-			
+					childValues=[values_nextGen[j][genIndex] for j in range(len(Parameters))]
+					childResult=stats.averagedRow(desc_unedited)
+					if population.add(hash, childValues, cost, childResult):											# Add or improve, evicting the highest cost Parent if full
+						elites.add(hash, childValues, cost, childResult)												# Elites keep the maxElites lowest cost results
+					if surrogate is not None:
+						surrogate.add(childValues, cost)
+					recordTime+=time.time()-recordStart
+				completed={}
+				profiling.phase("evaluate", scriptName, phaseStart, gen=gen, jobs=len(jobs), record=recordTime)
+
+
 			# Perform Gradient Descent to find best solution
-			minHash=min(cost_elites, key=cost_elites.get)
-			position=values_GenPop[minHash]
-			#print("Gen {} Best Result before Gradient Descent: {}".format(gen, result_elites[minHash]))
-			if minHash != bestHash:
+			minHash=elites.best()
+			position=elites.values(minHash)
+			#print("Gen {} Best Result before Gradient Descent: {}".format(gen, elites.result(minHash)))
+			if resumePhase=="descent" or resumePhase=="pattern" or minHash != bestHash:
+				phaseStart=time.time()
 				improved=True
-				positionResult=result_GenPop[minHash]
+				positionCost=elites.cost(minHash)
+				positionResult=elites.result(minHash)
+				if resumePhase=="descent":													# Continue from the interrupted descent step
+					position=state["position"]
+					positionCost=state["positionCost"]
+					positionResult=state["positionResult"]
+				if resumePhase=="pattern" or (patternSearch and resumePhase!="descent"):		# Replaces the step by step descent below
+					(position, positionCost, positionResult)=pattern_search(scriptName,space,Parameters,values,Runs,position,stepSize,minVals,maxVals,gen,writer,checkpoint,{"gen": gen, "jobs": [], "population": population, "elites": elites, "bestHash": bestHash, "Lowest_cost": Lowest_cost, "values_nextGen": values_nextGen, "surrogate": surrogate},rng,state if resumePhase=="pattern" else None)
+					improved=False
 				#print("Starting position: {}".format(position))
 				while improved == True:
-					for j in range(len(Parameters)):														# Clear List of next generation values
-						values_nextGen[j].clear()
-					val_next=position
-					for j in range(len(Parameters)):
-						trait=val_next[j]
-						if isinstance(trait, numbers.Number):
-						
-							val_next[j]=trait+stepSize														# Create Child with trait one step in positive direction
-							if val_next[j]>maxVals[j]:
-								val_next[j]=maxVals[j]
-							for k in range(len(Parameters)):
-								values_nextGen[k].append(val_next[k])										
-								
-							val_next[j]=trait-stepSize														# Create Child with trait one step in negative direction
-							if val_next[j]<minVals[j]:
-								val_next[j]=minVals[j]
-							for k in range(len(Parameters)):
-								values_nextGen[k].append(val_next[k])	
-						else:
-							randVal=val_next[j]																# Create Child with different trait
-							timeout=0
-							while randVal==val_next[j] and timeout<3:
-								randVal=random.choice(values[j])
-								timeout=timeout+1
-							val_next[j]=randVal
-							for k in range(len(Parameters)):
-								values_nextGen[k].append(val_next[k])
-					q2=[]
-					runRandomizer=random.randrange(1,1000)
-					improved=False
-					print("Running Gradient Descent for Gen {} Parallely using {} threads".format(gen,mp.cpu_count()))	# Terminal Message for visibility of execution	
-					with concurrent.futures.ThreadPoolExecutor(mp.cpu_count()) as executor:			# Parallel execution using as many threads as available cpu cores
+					if resumePhase=="descent":
+						jobs=state["jobs"]
+						resumePhase=None
+					else:
+						for j in range(len(Parameters)):														# Clear List of next generation values
+							values_nextGen[j].clear()
+						val_next=list(position)															# Copy so the population entry is not modified
+						for j in range(len(Parameters)):
+							trait=val_next[j]
+							if isinstance(trait, numbers.Number):
+
+								val_next[j]=trait+stepSize														# Create Child with trait one step in positive direction
+								if val_next[j]>maxVals[j]:
+									val_next[j]=maxVals[j]
+								for k in range(len(Parameters)):
+									values_nextGen[k].append(val_next[k])
+
+								val_next[j]=trait-stepSize														# Create Child with trait one step in negative direction
+								if val_next[j]<minVals[j]:
+									val_next[j]=minVals[j]
+								for k in range(len(Parameters)):
+									values_nextGen[k].append(val_next[k])
+							else:
+								randVal=val_next[j]																# Create Child with different trait
+								timeout=0
+								while randVal==val_next[j] and timeout<3:
+									randVal=rng.choice(values[j])
+									timeout=timeout+1
+								val_next[j]=randVal
+								for k in range(len(Parameters)):
+									values_nextGen[k].append(val_next[k])
+						jobs=[]
 						for i in range(len(values_nextGen[0])):
-							options=""
-							comment=""
-							for j in range(len(Parameters)):							# Build options string from parameters
-								options+="--{}={} ".format(Parameters[j],values_nextGen[j][i])
-								if j==0:									# Build comments string from parameters
-									comment+="Simulated with {} = {}".format(Parameters[j],values_nextGen[j][i])
-								else:
-									comment+=", {} = {}".format(Parameters[j],values_nextGen[j][i])
-							q2.append(executor.submit(runScript,scriptName,i+1,options,comment,i))
-
-
-						for future in concurrent.futures.as_completed(q2):	
-							output=future.result()
-							avCount=0
-							avAvThroughput=0
-							minAvThroughput=60000
-							avMinThroughput=0
-							minMinThroughput=60000
-							avAvLatency=0
-							maxAvLatency=0
-							avMaxLatency=0
-							maxMaxLatency=0
-							avPackLossRate=0
-							maxPackLossRate=0
-							if(len(output)==0):
-								print("Bad Output!!!!!!! Due to either malformed/unexpected output or error in parsing. Output is:"+str(output))
-							for result in output:		# Read and process Results from output queue as long as results are available
-								if(avCount==0):
-									testNo=result[0]
-									#scriptName=str(result[1])
-									with open("Raw_Results/Gen"+str(gen)+"_Raw_Results_"+scriptName+"_Test_"+str(testNo)+".csv", 'w', newline='') as outputFile:		# Create Output CSV file in which to store raw results of this simulation
-										outputWriter = csv.writer(outputFile)
-										outputWriter.writerow(['Test No.', 'Script Name', 'Client Id','Average Throughput (kbps)', 'Min Device Throughput (kbps)', 'Average Latency (ms)', 'Max Device Latency (ms)', 'Packet Loss Rate (%)', 'Description', 'Generation Index'])
-										outputWriter.writerow(result)	
-									with open("Raw_Results/Gen"+str(gen)+"_Raw_Results_"+scriptName+".csv", 'a', newline='') as outputFile:		# Write results to csv file
-										outputWriter = csv.writer(outputFile)
-										outputWriter.writerow(result)
-								else:
-									with open("Raw_Results/Gen"+str(gen)+"_Raw_Results_"+scriptName+"_Test_"+str(testNo)+".csv", 'a', newline='') as outputFile:
-										outputWriter = csv.writer(outputFile)
-										outputWriter.writerow(result)	
-									with open("Raw_Results/Gen"+str(gen)+"_Raw_Results_"+scriptName+".csv", 'a', newline='') as outputFile:
-										outputWriter = csv.writer(outputFile)
-										outputWriter.writerow(result)
-								if(result[3]>0):
-									avCount+=1;
-									avAvThroughput=round((avAvThroughput*(avCount-1)+result[3])/avCount,3);
-									if(result[3]<minAvThroughput):
-										minAvThroughput=result[3]
-									avMinThroughput=round((avMinThroughput*(avCount-1)+result[4])/avCount,3);
-									if(result[4]<minMinThroughput):
-										minMinThroughput=result[4]
-									avAvLatency=round((avAvLatency*(avCount-1)+result[5])/avCount,3);
-									if(result[5]>maxAvLatency):
-										maxAvLatency=result[5]
-									avMaxLatency=round((avMaxLatency*(avCount-1)+result[6])/avCount,3);
-									if(result[6]>maxMaxLatency):
-										maxMaxLatency=result[6]
-									avPackLossRate=round((avPackLossRate*(avCount-1)+result[7])/avCount,3);
-									if(result[7]>maxPackLossRate):
-										maxPackLossRate=result[7]
-									
-								if ", and RunNo" in result[8]:
-									desc=result[8].split(', and RunNo')[0]			# Delete RunNo trailer from successful result description string
-									desc_unedited=result[8]
-								
-								genIndex=result[9]
-							with open("Av_Results/Gen"+str(gen)+"_Averaged_Results_"+scriptName+".csv", 'a', newline='') as outputFile:		# Create Output CSV file in which to store averaged results of the simulation for this script
-								outputWriter = csv.writer(outputFile)
-								outputWriter.writerow([testNo, scriptName, avAvThroughput, minAvThroughput, avMinThroughput, minMinThroughput, avAvLatency, maxAvLatency, avMaxLatency, maxMaxLatency, avPackLossRate, maxPackLossRate, "GD-"+desc_unedited])		
-							
-							cost=cost_func(avAvThroughput, minAvThroughput, avAvLatency, maxAvLatency, avPackLossRate)			# Obtain weighted cost from cost function
-							
-							if cost<positionResult[2]:
-								position=[values_nextGen[j][genIndex] for j in range(len(Parameters))]
-								positionResult=[testNo, scriptName, cost, desc, genIndex]
-								improved=True
-								
-					minHash=min(cost_elites, key=cost_elites.get)		
-					#print("Gen {} Descent Best Result: {} \n Lowest Cost: {}".format(gen, position, positionResult[2]))
+							(options, comment)=configOptions(space.Parameters, space.complete([values_nextGen[j][i] for j in range(len(Parameters))]))
+							jobs.append((i+1,scriptName,options,comment,i))
+						checkpoint.save({"gen": gen, "phase": "descent", "jobs": jobs, "population": population, "elites": elites, "bestHash": bestHash, "Lowest_cost": Lowest_cost, "values_nextGen": values_nextGen, "surrogate": surrogate, "random": rng.getstate(), "position": position, "positionCost": positionCost, "positionResult": positionResult})
+					improved=False
+					print("Running Gradient Descent for Gen {} Parallely using {} threads".format(gen,mp.cpu_count()))	# Terminal Message for visibility of execution
+					for (output, replayed) in runBatch(jobs, checkpoint, completed):		# Parallel execution using as many threads as available cpu cores, or the distributed workers
+						if(len(output)==0):
+							print("Bad Output!!!!!!! Due to either malformed/unexpected output or error in parsing. Output is:"+str(output))
+						stats=runStats(output)								# Aggregate the per-client results of this run
+						genIndex=output[0][9]
+						(avAvThroughput, minAvThroughput, avMinThroughput, minMinThroughput, avAvLatency, maxAvLatency, avMaxLatency, maxMaxLatency, avPackLossRate, maxPackLossRate)=stats.averagedMetrics()
+						desc_unedited=output[-1][8]
+						desc=desc_unedited.split(', and RunNo')[0]			# Delete RunNo trailer from result description string
+						if not replayed:									# Results of journaled runs were written before the interruption
+							writeRaw(writer, resultStore, "Raw_Results/Gen"+str(gen)+"_Raw_Results_"+scriptName+".csv", GEN_RAW_HEADER, output, gen)
+							writer.append("Av_Results/Gen"+str(gen)+"_Averaged_Results_"+scriptName+".csv", [stats.averagedRow("GD-"+desc_unedited)])		# Store averaged results of the simulation for this script
+
+						cost=cost_func.run(stats)			# Obtain weighted cost from cost function
+
+						if surrogate is not None:
+							surrogate.add([values_nextGen[j][genIndex] for j in range(len(Parameters))], cost)
+						if cost<positionCost:
+							position=[values_nextGen[j][genIndex] for j in range(len(Parameters))]
+							positionCost=cost
+							positionResult=stats.averagedRow("GD-"+desc_unedited)
+							improved=True
+					completed={}
+
+					#print("Gen {} Descent Best Result: {} \n Lowest Cost: {}".format(gen, position, positionCost))
 				hash=""																									# Add result to general population
 				for j in range(len(Parameters)):																		# Get unique hash of this simulation
 					hash+=str(position[j])
-				if hash in list(values_GenPop.keys()):
+				if hash in population:
 					print("Result already exists, no descent necessary")
-				if hash not in list(values_GenPop.keys()):	
-					result_GenPop[hash]=positionResult
-					values_GenPop[hash]=position																		# add to General Population
-					cost_GenPop[hash]=positionResult[2]
-					result_elites[hash]=positionResult
-					values_elites[hash]=position																		# add to Elite Population
-					cost_elites[hash]=positionResult[2]
-					#print("Gradient Descent produced better result hash:{}, result:{}!!!".format(hash,result_GenPop[hash]))
-					#print("Position: {}, Position Result: {}".format(position,positionResult))
-					minHash=min(cost_elites, key=cost_elites.get)	
+				else:
+					population.add(hash, position, positionCost, positionResult)									# add to General Population
+					elites.add(hash, position, positionCost, positionResult)										# add to Elite Population
+					#print("Gradient Descent produced better result hash:{}, result:{}!!!".format(hash,positionResult))
+				minHash=elites.best()
 				bestHash=minHash
+				profiling.phase("descent", scriptName, phaseStart, gen=gen)
 			
+			phaseStart=time.time()
 			for j in range(len(Parameters)):																			# Clear List of next generation values
 				values_nextGen[j].clear()
-			#print("\nGen {} Elites Values: {}\n".format(gen, list(values_elites.values())))
-			#print("\nGen {} Elites Cost: {}\n".format(gen, list(cost_elites.values())))
-			#print("\nGen {} Elites Results: {}\n".format(gen, list(result_elites.values())))
+			#print("\nGen {} Elites Costs: {}\n".format(gen, [elites.cost(eliteHash) for eliteHash in elites.top(maxElites)]))
 			
-			if random.randint(0,100)<=(100*gen/(maxGen-5)):								# Simulated Annealing.
-				PopList=values_elites
+			if rng.randint(0,100)<=(100*gen/(maxGen-5)):								# Simulated Annealing.
+				PopList=elites
 			else:
-				PopList=values_GenPop
+				PopList=population
 			if len(PopList)>4*maxElites:
 				for element in range(4*maxElites):									# Limit size of next generation to 4*maxElites
-					parentA=random.choice(list(PopList.keys()))
-					parentB=random.choice(list(PopList.keys()))
+					parentA=PopList.randomHash(rng)
+					parentB=PopList.randomHash(rng)
 					while parentA == parentB:										# Ensure parent B is different from A 
-						parentB=random.choice(list(PopList.keys()))
+						parentB=PopList.randomHash(rng)
+					child=breedChild(PopList[parentA], PopList[parentB], minVals, maxVals, mutationChance, mutationRate, rng)
 					for j in range(len(Parameters)):
-						parentTraitA=PopList[parentA][j]							
-						parentTraitB=PopList[parentB][j]
-						if isinstance(parentTraitA, numbers.Number):						# If numeric, obtain a mixed trait with other random parent
-							childTrait=((parentTraitA+parentTraitB)/2)
-							if random.choice(range(100)) <= mutationChance:					# mutation chance
-								childTrait=childTrait+random.randint(int(-1*mutationRate*childTrait/100), int(mutationRate*childTrait/100))		# introduce mutation for numeric variables
-								if childTrait>maxVals[j]:											# Enforce range limits
-									childTrait=maxVals[j]
-								if childTrait<minVals[j]:
-									childTrait=minVals[j]
-							if isinstance(parentTraitA, int):
-								childTrait=int(childTrait)
-							if isinstance(parentTraitA, float):
-								childTrait=float(childTrait)
-						else:																# If not numeric, randomly select one of the Parent traits for child
-							childTrait=random.choice([parentTraitA, parentTraitB])	
-						values_nextGen[j].append(childTrait)								# Add child trait to list of children to be simulated
+						values_nextGen[j].append(child[j])								# Add child trait to list of children to be simulated
 			else:
-				for parentA in list(PopList.keys()):												# Select as Parent A each element in Population list
-					parentB=random.choice(list(PopList.keys()))
+				for parentA in PopList.hashes():												# Select as Parent A each element in Population list
+					parentB=PopList.randomHash(rng)
 					while parentA == parentB:												# Ensure parent B is different from A
-						parentB=random.choice(list(PopList.keys()))
+						parentB=PopList.randomHash(rng)
+					child=breedChild(PopList[parentA], PopList[parentB], minVals, maxVals, mutationChance, mutationRate, rng)
 					for j in range(len(Parameters)):
-						parentTraitA=PopList[parentA][j]							
-						parentTraitB=PopList[parentB][j]
-						if isinstance(parentTraitA, numbers.Number):						# If numeric, obtain a mixed trait with other random parent
-							childTrait=((parentTraitA+parentTraitB)/2)
-							if random.choice(range(100)) <= mutationChance:					# mutation chance
-								childTrait=childTrait+random.randint(int(-1*mutationRate*childTrait/100), int(mutationRate*childTrait/100))		# introduce mutation for numeric variables
-								if childTrait>maxVals[j]:											# Enforce range limits
-									childTrait=maxVals[j]
-								if childTrait<minVals[j]:
-									childTrait=minVals[j]
-							if isinstance(parentTraitA, int):
-								childTrait=int(childTrait)
-							if isinstance(parentTraitA, float):
-								childTrait=float(childTrait)
-						else:														# If not numeric, randomly select one of the Parent traits for child
-							childTrait=random.choice([parentTraitA, parentTraitB])	
-						values_nextGen[j].append(childTrait)						# Add child trait to list of children to be simulated
+						values_nextGen[j].append(child[j])						# Add child trait to list of children to be simulated
+			if (surrogate is not None or halving is not None) and len(values_nextGen[0])>0 and gen+1<maxGen:		# Over-generate children and simulate those the surrogate or short simulations rank best
+				candidates=[[values_nextGen[j][i] for j in range(len(Parameters))] for i in range(len(values_nextGen[0]))]
+				count=len(candidates)
+				for element in range(((surrogate.screenFactor if surrogate is not None else screenFactor)-1)*count):
+					parentA=PopList.randomHash(rng)
+					parentB=PopList.randomHash(rng)
+					while parentA == parentB:										# Ensure parent B is different from A
+						parentB=PopList.randomHash(rng)
+					candidates.append(breedChild(PopList[parentA], PopList[parentB], minVals, maxVals, mutationChance, mutationRate, rng))
+				if halving is None:
+					chosen=surrogate.select(candidates, count)
+				else:
+					if surrogate is not None:											# The surrogate preselects the children worth a short simulation
+						candidates=surrogate.select(candidates, min(len(candidates), halving.eta*count))
+					chosen=halving_screen(scriptName,space,candidates,count,halving,gen+1,writer)
+				for j in range(len(Parameters)):
+					values_nextGen[j][:]=[child[j] for child in chosen]
+			profiling.phase("breed", scriptName, phaseStart, gen=gen, children=len(values_nextGen[0]))
 			#print("Next Gen - Gen {} Values: {}".format(gen+1, values_nextGen))
-		minHash=min(cost_elites, key=cost_elites.get)
-		Lowest_cost=cost_elites[minHash]
-		print("Gen {} Result: \n Best Result: {} \n Gen {} Lowest Cost: {}".format(gen, result_elites[minHash], gen, cost_elites[minHash]))
-	with open("Optimal_Results/Optimal_Results_"+script+".csv", 'w', newline='') as outputFile:		# Create Output CSV file in which to store raw results of all simulations for this script
+		minHash=elites.best()
+		Lowest_cost=elites.cost(minHash)
+		print("Gen {} Result: \n Best Result: {} \n Gen {} Lowest Cost: {}".format(gen, elites.result(minHash), gen, elites.cost(minHash)))
+	with open("Optimal_Results/Optimal_Results_"+scriptName+".csv", 'w', newline='') as outputFile:		# Create Output CSV file in which to store raw results of all simulations for this script
 		outputWriter = csv.writer(outputFile)
-		outputWriter.writerow(['Test No.', 'Script Name', 'Client Id','Average Throughput (kbps)', 'Min Device Throughput (kbps)', 'Average Latency (ms)', 'Max Device Latency (ms)', 'Packet Loss Rate (%)', 'Description', 'Generation Index'])
-		for	hash in result_elites:
-			outputWriter.writerow(result_elites[hash])
-	minHash=min(cost_elites, key=cost_elites.get)
-	#print("\nElite Results after output written: {} \n".format(result_elites))
-	#print("\nElite Cost after output written: {} \n".format(cost_elites))
-	#print("\nOptimal Result occurs at: {} \nWith cost:{}".format(result_elites[minHash], cost_elites[minHash]))
-	return (result_elites[minHash], cost_elites[minHash])
+		outputWriter.writerow(GEN_RAW_HEADER)
+		for	hash in elites.top(maxElites):
+			outputWriter.writerow(elites.result(hash))
+	minHash=elites.best()
+	if evaluator.simCache is not None:
+		(hits, misses)=evaluator.simCache.stats()
+		print("Simulation cache for {}: {} hits, {} misses".format(scriptName,hits-cacheStart[0],misses-cacheStart[1]))
+	#print("\nOptimal Result occurs at: {} \nWith cost:{}".format(elites.result(minHash), elites.cost(minHash)))
+	checkpoint.save({"gen": maxGen, "phase": "done", "optimum": (elites.result(minHash), elites.cost(minHash))})	# A resumed run returns this result directly
+	writer.close()										# Flush remaining buffered rows
+	if resultStore is not None:
+		resultStore.flush()
+	return (elites.result(minHash), elites.cost(minHash))
 		
 #----------------------------------------------------------------------------------------------------------------------------------------------------------
-#			SCRIPT EXECUTION FUNCTION
-#----------------------------------------------------------------------------------------------------------------------------------------------------------	
-def runScript(rowNo, scriptName, options, comment, genIndex):
-	"This function runs the input script file and stores it in the corresponding row of the csv"
-	# initialize dictionaries
-	totalBytes_Tx={}
-	totalBytes_Rx={}
-	avLatency={}
-	maxLatency={}
-	avThroughput={}
-	minThroughput={}
-	desc=""
-	sys.stdout.write("\rRunning Case: row no {}\r".format(rowNo))
-	sys.stdout.flush()	
-	result=[]
-	try:		#Run ./waf command to obtain output
-		cmd=subprocess.check_output(['./waf --run \"{} {}\"'.format("scratch/"+scriptName,options)], shell=True, stderr=subprocess.STDOUT)
-	except Exception as error:
-		desc+="[ERROR] - "+str(error)+"\n[COMMENT] - "+comment 			# Concatenate Error message to comment
-		result.append([rowNo, scriptName, 60000, 0, 60000, 0, 0, 0, desc, genIndex]) # To observe error message in output, a dummy client 60000 is used
-	else:
-		output=cmd.decode("UTF-8").splitlines()						#parse output
-		for line in output:
-			match = re.search(r'\[DESC\] - (.*)', line)				# Capture script description string
-			if match:
-				desc=match.group(1)
-			
-			match = re.search(r'Client (\d*) Sent (\d*) Packets of total size (\d*) bytes', line)	# Capture reported Client Tx Information
-			if match:
-				if(float(match.group(1))>0):								# Ignore errored values
-					totalBytes_Tx['{}'.format(match.group(1))]=match.group(3)
-			
-			match = re.search(r'Server received (\d*) bytes across \d* packets, from Client (\d*), Average Latency: (\d+\.?\d*)+ms, Average Throughput: (\d+\.?\d*)+kbps, Max Latency: (\d+\.?\d*)+ms, Min Throughput: (\d+\.?\d*)+kbps', line)		# Capture reported Server Rx information
-			if match:
-				if(float(match.group(2))>0):				
-					totalBytes_Rx['{}'.format(match.group(2))]=match.group(1)
-					avLatency['{}'.format(match.group(2))]=match.group(3)
-					avThroughput['{}'.format(match.group(2))]=match.group(4)
-					maxLatency['{}'.format(match.group(2))]=match.group(5)
-					minThroughput['{}'.format(match.group(2))]=match.group(6)	
-
-		# concatenate comment to description if present
-		desc+=" - "+comment
-
-		# calculate max packet loss
-		for dict_key in totalBytes_Rx.keys():
-			Tx_Bytes=int(totalBytes_Tx[dict_key])	
-			Rx_Bytes=int(totalBytes_Rx[dict_key])
-			packLossRate=round((1.0-(Rx_Bytes/Tx_Bytes))*100,3)
-			if packLossRate<0:
-				packLossRate=-1*packLossRate
-			result.append([rowNo, scriptName, int(dict_key), float(avThroughput[dict_key]), float(minThroughput[dict_key]), float(avLatency[dict_key]), float(maxLatency[dict_key]), packLossRate, desc, genIndex])			#write output to queue
-	if(len(result)==0):
-		result.append([rowNo, scriptName, 60000, 0, 60000, 0, 0, 0, "FAILED COMMAND: ./waf --run \"{} {}\"".format("scratch/"+scriptName,options), genIndex])
-	return result
+#			PATTERN SEARCH DESCENT (Speculative, with adaptive step sizes and averaged replicates)
+#----------------------------------------------------------------------------------------------------------------------------------------------------------
+def pattern_search(scriptName,space,Parameters,values,Runs,position,stepSize,minVals,maxVals,gen,writer,checkpoint,baseState,rng,resumeState=None):
+	"This function runs a parallel pattern search from position and returns (position, cost, averaged result row) of the best point found. While a poll is running, the next poll around the first improving point is evaluated speculatively"
+	steps=[stepSize]*len(Parameters)					# Step size of each numeric trait, doubled after a move along it and halved when a poll fails
+	center=tuple(position)
+	evaluated={}										# Point -> [sum of run costs, completed runs, client rows of all runs]
+	if resumeState is not None:							# Restart the interrupted poll
+		center=resumeState["center"]
+		steps=resumeState["steps"]
+		evaluated={point: result for point, result in resumeState["evaluated"].items() if result[1]>=Runs}	# Partly evaluated points are run again
+	q={}												# Future -> point of every running simulation
+	submitted=set()
+	points=[]											# Point of each genIndex
+	print("Running Pattern Search for Gen {} Parallely using {} threads".format(gen,mp.cpu_count()))	# Terminal Message for visibility of execution
+	with simExecutor() as executor:			# Parallel execution using as many threads as available cpu cores, or the distributed workers
+		while True:
+			checkpoint.save(dict(baseState, phase="pattern", center=center, steps=steps, evaluated=evaluated, random=rng.getstate()))
+			poll=[center]+patternNeighbours(center, steps, values, minVals, maxVals, rng)
+			speculated=False
+			for point in poll:
+				if point not in submitted and point not in evaluated:
+					submitPoint(executor, q, points, submitted, scriptName, space, Runs, point)
+			while any(point not in evaluated or evaluated[point][1]<Runs for point in poll):
+				(done, running)=concurrent.futures.wait(q, return_when=concurrent.futures.FIRST_COMPLETED)
+				for future in done:
+					point=q.pop(future)
+					output=future.result()
+					if(len(output)==0):
+						print("Bad Output!!!!!!! Due to either malformed/unexpected output or error in parsing. Output is:"+str(output))
+					stats=runStats(output)								# Aggregate the per-client results of this run
+					writeRaw(writer, resultStore, "Raw_Results/Gen"+str(gen)+"_Raw_Results_"+scriptName+".csv", GEN_RAW_HEADER, output, gen)
+					(avAvThroughput, minAvThroughput, avMinThroughput, minMinThroughput, avAvLatency, maxAvLatency, avMaxLatency, maxMaxLatency, avPackLossRate, maxPackLossRate)=stats.averagedMetrics()
+					writer.append("Av_Results/Gen"+str(gen)+"_Averaged_Results_"+scriptName+".csv", [stats.averagedRow("GD-"+output[-1][8])])		# Store averaged results of the simulation for this script
+					cost=cost_func.run(stats)			# Obtain weighted cost from cost function
+					result=evaluated.setdefault(point, [0.0, 0, []])
+					result[0]+=cost
+					result[1]+=1
+					result[2]+=output
+					if not speculated and point!=center and result[1]>=Runs and center in evaluated and evaluated[center][1]>=Runs and result[0]/result[1]<evaluated[center][0]/evaluated[center][1]:
+						speculated=True												# Improving point found: start its poll, led by a step further along the same direction
+						for nextPoint in [patternExtrapolate(center, point, minVals, maxVals)]+patternNeighbours(point, steps, values, minVals, maxVals, rng):
+							if nextPoint not in submitted and nextPoint not in evaluated:
+								submitPoint(executor, q, points, submitted, scriptName, space, Runs, nextPoint)
+			best=min(poll, key=lambda point: evaluated[point][0]/evaluated[point][1])
+			if best!=center:
+				for j in range(len(Parameters)):
+					if isinstance(center[j], numbers.Number) and best[j]!=center[j]:
+						steps[j]=min(2*steps[j], max(stepSize, maxVals[j]-minVals[j]))		# Expand along the successful direction
+				center=best
+			elif all(steps[j]<=stepSize for j in range(len(Parameters))):
+				break
+			else:
+				steps=[max(stepSize, step/2) for step in steps]								# Contract around the center
+			#print("Pattern Search Center: {} Cost: {} Steps: {}".format(center, evaluated[center][0]/evaluated[center][1], steps))
+		for future in q:													# Speculative runs which were not needed
+			future.cancel()
+	stats=RunStats(evaluated[center][2])										# Average over the clients of every run of the final point
+	desc=evaluated[center][2][-1][8].split(', and RunNo')[0]
+	return (list(center), round(evaluated[center][0]/evaluated[center][1],4), stats.averagedRow("GD-"+desc))
+
+def submitPoint(executor, q, points, submitted, scriptName, space, Runs, point):
+	"This function submits Runs replicates of one pattern search point. Replicate j of every point uses RunNo j+1, so points are compared under common random numbers"
+	(options, comment)=configOptions(space.Parameters, space.complete(point))
+	for j in range(Runs):
+		q[executor.submit(runScript,len(points)+1,scriptName,options+"--RunNo={} ".format(j+1),comment+", and RunNo = {}".format(j+1),len(points))]=point
+	points.append(point)
+	submitted.add(point)
+
+def patternNeighbours(center, steps, values, minVals, maxVals, rng):
+	"This function returns the poll points around center: one step up and down along each numeric trait and a different value of each other trait"
+	neighbours=[]
+	for j in range(len(center)):
+		trait=center[j]
+		if isinstance(trait, numbers.Number):
+			step=int(steps[j]) if isinstance(trait, int) else steps[j]
+			for nextTrait in (min(trait+step, maxVals[j]), max(trait-step, minVals[j])):
+				if nextTrait!=trait:
+					neighbours.append(center[:j]+(nextTrait,)+center[j+1:])
+		else:
+			randVal=trait																# Create Child with different trait
+			timeout=0
+			while randVal==trait and timeout<3:
+				randVal=rng.choice(values[j])
+				timeout=timeout+1
+			if randVal!=trait:
+				neighbours.append(center[:j]+(randVal,)+center[j+1:])
+	return neighbours
+
+def patternExtrapolate(center, point, minVals, maxVals):
+	"This function returns the point one more step from center through point"
+	nextPoint=[]
+	for j in range(len(center)):
+		if isinstance(center[j], numbers.Number):
+			nextPoint.append(min(max(point[j]+(point[j]-center[j]), minVals[j]), maxVals[j]))
+		else:
+			nextPoint.append(point[j])
+	return tuple(nextPoint)
+
+#----------------------------------------------------------------------------------------------------------------------------------------------------------
+#			MULTI-FIDELITY SCREENING (Successive halving of bred children over short SimTimes)
+#----------------------------------------------------------------------------------------------------------------------------------------------------------
+def halving_screen(scriptName,space,candidates,count,halving,gen,writer):
+	"This function simulates bred children (lists of trait values) at the rungs of a Halving below full fidelity, promoting the best 1/eta at each rung, and returns the count children with the lowest cost at the last rung they reached"
+	configs=list(dict.fromkeys(tuple(candidate) for candidate in candidates))
+	fileName="Av_Results/Gen"+str(gen)+"_Halving_Results_"+scriptName+".csv"
+	writer.create(fileName, FIDELITY_AV_HEADER)					# Averaged results of the short simulations with their fidelity
+	print("Screening {} children for Gen {} at SimTimes {}".format(len(configs),gen,[rung[0] for rung in halving.rungs[:-1]]))	# Terminal Message for visibility of execution
+	phaseStart=time.time()
+	with simExecutor() as executor:			# Parallel execution using as many threads as available cpu cores, or the distributed workers
+		for rung in range(len(halving.rungs)-1):
+			if len(configs)<=count:
+				break
+			(simTime, runs)=halving.rungs[rung]
+			batch=SpeculativeBatch(executor, speculateTail)
+			for (i, config) in enumerate(configs):
+				(options, comment)=fidelityOptions(space.Parameters, space.complete(config), simTime)
+				for j in range(runs):
+					batch.submit((config, j), runScript,i+1,scriptName,options+"--RunNo={} ".format(j+1),comment+", and RunNo = {}".format(j+1),gen)
+			costs={}
+			for ((config, j), output) in batch.completed():
+				stats=runStats(output)								# Aggregate the per-client results of this run
+				writer.append(fileName, [stats.averagedRow(output[-1][8])+[simTime, runs, rung]])
+				costs[config]=costs.get(config, 0.0)+cost_func.run(stats)/runs
+			configs=halving.promote(costs, max(count, halving.keep(len(configs))))
+	profiling.phase("screen", scriptName, phaseStart, gen=gen, children=len(candidates))
+	return [list(config) for config in configs[:count]]
+
+#----------------------------------------------------------------------------------------------------------------------------------------------------------
+#			STEADY STATE GENETIC OPTIMIZER (No generation barriers, a child is bred whenever a simulation slot frees up)
+#----------------------------------------------------------------------------------------------------------------------------------------------------------
+def steady_state_optimizer(scriptName,space,Runs,maxGen,maxElites,maxGenPop,mutationChance,mutationRate,resume=False,surrogate=None):
+	"This function accepts the same arguments as genetic_optimizer (without the descent step size) and evolves the population one child at a time, updating it as each result arrives"
+	(Parameters, values)=Get_Trait_Vals(space)			# Only the free parameters are evolved
+	population=Population(maxGenPop)					# General Population of potential parents
+	elites=Population(maxElites)						# Lowest cost members used for breeding late children
+	minVals=[0]*len(Parameters)
+	maxVals=[4000]*len(Parameters)
+	for j in range(len(Parameters)):															# Identify minimum and maximum limits
+		trait=values[j][0]
+		if isinstance(trait, numbers.Number):
+			minVals[j]=min(values[j])
+			maxVals[j]=max(values[j])
+	genSize=4*maxElites									# Children counted as one generation for result files, annealing and checkpoints
+	rng=scriptRandom(scriptName)						# Generator of this script, checkpointed with it, so scripts optimized in parallel keep their own state
+	initial=Get_Initial_Traits(space, rng)				# Generation 0
+	total=len(initial)+(maxGen-1)*genSize				# Same number of children as maxGen generations
+	children={}											# Child no -> trait values, kept while replicates are running
+	remaining={}										# Child no -> replicates still running
+	createdGens=set()									# Generations whose result files were created
+	bred=0
+	savedAt=-1
+	q={}												# Future -> runScript arguments of every running simulation
+	snapshotJobs={}										# Future -> index in the jobs of the last checkpoint
+	cacheStart=evaluator.simCache.stats() if evaluator.simCache is not None else (0,0)
+	writer=ResultWriter()								# Buffered writer thread for all result files of this optimization
+	checkpoint=Checkpoint("Checkpoints/SteadyState_"+scriptName, [writer, resultStore])	# State saved at every generation boundary
+	(state, completed)=checkpoint.load() if resume else (None, {})
+	finished=[]
+	if state is not None:
+		if state["phase"]=="done":
+			writer.close()
+			print("{} already optimized, using checkpointed result".format(scriptName))
+			return state["optimum"]
+		population=state["population"]
+		elites=state["elites"]
+		bred=state["bred"]
+		savedAt=bred
+		children=state["children"]
+		remaining=state["remaining"]
+		createdGens=state["createdGens"]
+		surrogate=state["surrogate"]
+		rng.setstate(state["random"])
+		finished=[(completed[jobIndex], True, None) for jobIndex in sorted(completed)]	# Journaled runs are replayed instead of simulated
+		print("Resuming {} after {} children: {} of {} running simulations already completed".format(scriptName, bred, len(completed), len(state["jobs"])))
+
+	print("Running {} steady state using {} simulation slots".format(scriptName,simSlots()))	# Terminal Message for visibility of execution
+	with simExecutor() as executor:			# Parallel execution using as many threads as available cpu cores, or the distributed workers
+		if state is not None:
+			for jobIndex in range(len(state["jobs"])):
+				if jobIndex not in completed:
+					future=executor.submit(runScript,*state["jobs"][jobIndex])
+					q[future]=state["jobs"][jobIndex]
+					snapshotJobs[future]=jobIndex
+		while True:
+			for (output, replayed, jobIndex) in finished:
+				if(len(output)==0):
+					print("Bad Output!!!!!!! Due to either malformed/unexpected output or error in parsing. Output is:"+str(output))
+				stats=runStats(output)								# Aggregate the per-client results of this run
+				genIndex=output[0][9]								# Child no
+				gen=0 if genIndex<len(initial) else 1+(genIndex-len(initial))//genSize
+				if gen not in createdGens:
+					writer.create("Av_Results/Gen"+str(gen)+"_Averaged_Results_"+scriptName+".csv", AV_HEADER)		# Create Output CSV file in which to store averaged results of all simulations for this generation
+					if resultStore is None:
+						writer.create("Raw_Results/Gen"+str(gen)+"_Raw_Results_"+scriptName+".csv", GEN_RAW_HEADER)
+					createdGens.add(gen)
+				(avAvThroughput, minAvThroughput, avMinThroughput, minMinThroughput, avAvLatency, maxAvLatency, avMaxLatency, maxMaxLatency, avPackLossRate, maxPackLossRate)=stats.averagedMetrics()
+				desc_unedited=output[-1][8]
+				if not replayed:									# Results of journaled runs were written before the interruption
+					writeRaw(writer, resultStore, "Raw_Results/Gen"+str(gen)+"_Raw_Results_"+scriptName+".csv", GEN_RAW_HEADER, output, gen)
+					writer.append("Av_Results/Gen"+str(gen)+"_Averaged_Results_"+scriptName+".csv", [stats.averagedRow(desc_unedited)])		# Store averaged results of the simulation for this script
+				cost=cost_func.run(stats)			# Obtain weighted cost from cost function
+				hash=""																								# Add result to general population
+				for j in range(len(Parameters)):																		# Get unique hash of this simulation
+					hash+=str(children[genIndex][j])
+				childResult=stats.averagedRow(desc_unedited)
+				if population.add(hash, children[genIndex], cost, childResult):										# Add or improve, evicting the highest cost Parent if full
+					elites.add(hash, children[genIndex], cost, childResult)										# Elites keep the maxElites lowest cost results
+				if surrogate is not None:
+					surrogate.add(children[genIndex], cost)
+				remaining[genIndex]-=1
+				if remaining[genIndex]==0:
+					del children[genIndex]
+					del remaining[genIndex]
+				if jobIndex is not None:
+					checkpoint.record(jobIndex, output)
+
+			while len(q)<simSlots() and bred<total:					# Keep every simulation slot busy (workers may connect during the run)
+				if bred<len(initial):
+					child=initial[bred]
+				else:
+					if (bred-len(initial))%genSize==0 and savedAt!=bred:			# Generation boundary
+						gen=1+(bred-len(initial))//genSize
+						if len(elites)>0:
+							minHash=elites.best()
+							print("Gen {} Result: \n Best Result: {} \n Gen {} Lowest Cost: {}".format(gen-1, elites.result(minHash), gen-1, elites.cost(minHash)))
+						snapshotJobs={future: jobIndex for jobIndex, future in enumerate(q)}
+						checkpoint.save({"phase": "steady", "jobs": list(q.values()), "population": population, "elites": elites, "bred": bred, "children": children, "remaining": remaining, "createdGens": createdGens, "surrogate": surrogate, "random": rng.getstate()})
+						savedAt=bred
+					gen=1+(bred-len(initial))//genSize
+					if rng.randint(0,100)<=(100*gen/(maxGen-5)):								# Simulated Annealing.
+						PopList=elites
+					else:
+						PopList=population
+					if len(PopList)<2:
+						PopList=population
+					if len(PopList)<2:									# Wait for results before breeding
+						break
+					candidates=[]
+					for element in range(1 if surrogate is None else surrogate.screenFactor):		# Over-generate children and simulate the one the surrogate ranks best
+						parentA=PopList.randomHash(rng)
+						parentB=PopList.randomHash(rng)
+						while parentA == parentB:										# Ensure parent B is different from A
+							parentB=PopList.randomHash(rng)
+						candidates.append(breedChild(PopList[parentA], PopList[parentB], minVals, maxVals, mutationChance, mutationRate, rng))
+					child=candidates[0] if surrogate is None else surrogate.select(candidates, 1)[0]
+				(options, comment)=configOptions(space.Parameters, space.complete(child))
+				children[bred]=child
+				remaining[bred]=Runs
+				for j in range(Runs):
+					job=(bred+1,scriptName,options+"--RunNo={} ".format(configRunNo(options, j)),comment+", and RunNo = {}".format(configRunNo(options, j)),bred)
+					q[executor.submit(runScript,*job)]=job
+				bred+=1
+
+			if len(q)==0:
+				break
+			(done, running)=concurrent.futures.wait(q, return_when=concurrent.futures.FIRST_COMPLETED)
+			finished=[]
+			for future in done:
+				q.pop(future)
+				finished.append((future.result(), False, snapshotJobs.pop(future, None)))
+
+	minHash=elites.best()
+	print("Steady state result after {} children: \n Best Result: {} \n Lowest Cost: {}".format(bred, elites.result(minHash), elites.cost(minHash)))
+	with open("Optimal_Results/Optimal_Results_"+scriptName+".csv", 'w', newline='') as outputFile:		# Create Output CSV file in which to store raw results of all simulations for this script
+		outputWriter = csv.writer(outputFile)
+		outputWriter.writerow(GEN_RAW_HEADER)
+		for	hash in elites.top(maxElites):
+			outputWriter.writerow(elites.result(hash))
+	if evaluator.simCache is not None:
+		(hits, misses)=evaluator.simCache.stats()
+		print("Simulation cache for {}: {} hits, {} misses".format(scriptName,hits-cacheStart[0],misses-cacheStart[1]))
+	checkpoint.save({"phase": "done", "optimum": (elites.result(minHash), elites.cost(minHash))})	# A resumed run returns this result directly
+	writer.close()										# Flush remaining buffered rows
+	if resultStore is not None:
+		resultStore.flush()
+	return (elites.result(minHash), elites.cost(minHash))
+
+#----------------------------------------------------------------------------------------------------------------------------------------------------------
+#			MULTI-OBJECTIVE EVOLUTION (NSGA-II)
+#----------------------------------------------------------------------------------------------------------------------------------------------------------
+def pareto_optimizer(scriptName,space,Runs,maxGen,maxGenPop,mutationChance,mutationRate,resume=False):
+	"This function evolves a population of maxGenPop configurations by non-dominated sorting and crowding distance over the raw metrics instead of a cost, and returns the (result, cost) of the Pareto front member with the lowest cost"
+	(Parameters, values)=Get_Trait_Vals(space)			# Only the free parameters are evolved
+	parents=[]											# (hash, values, objectives, result) of the surviving configurations
+	ranks=[]											# Front of each parent, 0 is non-dominated
+	crowding=[]											# Crowding distance of each parent within its front
+	archive=ParetoArchive()								# Every non-dominated configuration evaluated so far
+	rng=scriptRandom(scriptName)						# Generator of this script, checkpointed with it, so scripts optimized in parallel keep their own state
+	initial=Get_Initial_Traits(space, rng)
+	values_nextGen=[[traits[j] for traits in initial] for j in range(len(Parameters))]	# Generation 0
+	minVals=[0]*len(Parameters)
+	maxVals=[4000]*len(Parameters)
+	for j in range(len(Parameters)):															# Identify minimum and maximum limits
+		trait=values[j][0]
+		if isinstance(trait, numbers.Number):
+			minVals[j]=min(values[j])
+			maxVals[j]=max(values[j])
+	cacheStart=evaluator.simCache.stats() if evaluator.simCache is not None else (0,0)
+	writer=ResultWriter()								# Buffered writer thread for all result files of this optimization
+	checkpoint=Checkpoint("Checkpoints/Pareto_"+scriptName, [writer, resultStore])	# State saved before every generation
+	(state, completed)=checkpoint.load() if resume else (None, {})
+	startGen=0
+	if state is not None:
+		if state["phase"]=="done":
+			writer.close()
+			print("{} already optimized, using checkpointed result".format(scriptName))
+			return state["optimum"]
+		startGen=state["gen"]
+		parents=state["parents"]
+		ranks=state["ranks"]
+		crowding=state["crowding"]
+		archive=state["archive"]
+		values_nextGen=state["values_nextGen"]
+		rng.setstate(state["random"])
+		print("Resuming {} at Gen {}: {} of {} runs already completed".format(scriptName, startGen, len(completed), len(state["jobs"])))
+	for gen in range(startGen, maxGen):
+		if state is not None and state["gen"]==gen:		# Resubmit the interrupted generation, skipping the runs which completed
+			jobs=state["jobs"]
+		else:
+			writer.create("Av_Results/Gen"+str(gen)+"_Averaged_Results_"+scriptName+".csv", AV_HEADER)		# Create Output CSV file in which to store averaged results of all simulations for this script
+			if resultStore is None:
+				writer.create("Raw_Results/Gen"+str(gen)+"_Raw_Results_"+scriptName+".csv", GEN_RAW_HEADER)		# Create Output CSV file in which to store raw results of all simulations for this script
+			jobs=[]
+			for i in range(len(values_nextGen[0])):
+				(options, comment)=configOptions(space.Parameters, space.complete([values_nextGen[j][i] for j in range(len(Parameters))]))
+				for j in range(Runs):
+					jobs.append((i+1,scriptName,options+"--RunNo={} ".format(configRunNo(options, j)),comment+", and RunNo = {}".format(configRunNo(options, j)),i))
+			checkpoint.save({"gen": gen, "phase": "pareto", "jobs": jobs, "parents": parents, "ranks": ranks, "crowding": crowding, "archive": archive, "values_nextGen": values_nextGen, "random": rng.getstate()})
+
+		print("Running Gen {} Parallely using {} threads".format(gen,mp.cpu_count()))	# Terminal Message for visibility of execution
+		phaseStart=time.time()
+		outputs={}										# Child index -> client rows of all its runs
+		for (output, replayed) in runBatch(jobs, checkpoint, completed):		# Parallel execution using as many threads as available cpu cores, or the distributed workers
+			if(len(output)==0):
+				print("Bad Output!!!!!!! Due to either malformed/unexpected output or error in parsing. Output is:"+str(output))
+			stats=runStats(output)								# Aggregate the per-client results of this run
+			if not replayed:									# Results of journaled runs were written before the interruption
+				writeRaw(writer, resultStore, "Raw_Results/Gen"+str(gen)+"_Raw_Results_"+scriptName+".csv", GEN_RAW_HEADER, output, gen)
+				writer.append("Av_Results/Gen"+str(gen)+"_Averaged_Results_"+scriptName+".csv", [stats.averagedRow(output[-1][8])])		# Store averaged results of the simulation for this script
+			outputs.setdefault(output[0][9], []).extend(output)
+		completed={}
+		profiling.phase("evaluate", scriptName, phaseStart, gen=gen, jobs=len(jobs))
+
+		phaseStart=time.time()
+		members=list(parents)
+		memberHashes=set(member[0] for member in parents)
+		for genIndex in sorted(outputs):
+			childValues=[values_nextGen[j][genIndex] for j in range(len(Parameters))]
+			hash=""																								# Get unique hash of this configuration
+			for j in range(len(Parameters)):
+				hash+=str(childValues[j])
+			stats=RunStats(outputs[genIndex])					# Average over the clients of every run of the child
+			objectives=objectiveVector(stats.averagedMetrics())
+			childResult=stats.averagedRow(outputs[genIndex][-1][8].split(', and RunNo')[0])
+			archive.add(hash, childValues, objectives, childResult)
+			if hash not in memberHashes:						# A child bred again keeps the result it first survived with
+				members.append((hash, childValues, objectives, childResult))
+				memberHashes.add(hash)
+		(chosen, ranks, crowding)=selectSurvivors(np.array([member[2] for member in members]).reshape(-1, len(OBJECTIVES)), maxGenPop)
+		parents=[members[i] for i in chosen]
+		writer.create("Optimal_Results/Gen"+str(gen)+"_Pareto_Front_"+scriptName+".csv", AV_HEADER)		# Non-dominated configurations found up to this generation
+		writer.append("Optimal_Results/Gen"+str(gen)+"_Pareto_Front_"+scriptName+".csv", archive.front())
+		print("Gen {} Result: \n Pareto front of {} configurations, {} in the first front of the population".format(gen, len(archive), ranks.count(0)))
+
+		for j in range(len(Parameters)):																			# Clear List of next generation values
+			values_nextGen[j].clear()
+		if gen+1<maxGen and len(parents)>1:
+			for element in range(maxGenPop):												# Parents by binary tournament on front and crowding distance
+				parentA=tournament(ranks, crowding, rng)
+				parentB=tournament(ranks, crowding, rng)
+				while parentA == parentB:												# Ensure parent B is different from A
+					parentB=tournament(ranks, crowding, rng)
+				child=breedChild(parents[parentA][1], parents[parentB][1], minVals, maxVals, mutationChance, mutationRate, rng)
+				for j in range(len(Parameters)):
+					values_nextGen[j].append(child[j])						# Add child trait to list of children to be simulated
+		profiling.phase("breed", scriptName, phaseStart, gen=gen, children=len(values_nextGen[0]))
+		if len(values_nextGen[0])==0:
+			break
+
+	front=archive.front()
+	with open("Optimal_Results/Pareto_Front_"+scriptName+".csv", 'w', newline='') as outputFile:		# Create Output CSV file in which to store the final Pareto front of this script
+		outputWriter = csv.writer(outputFile)
+		outputWriter.writerow(AV_HEADER)
+		outputWriter.writerows(front)
+	costs=[cost_func.value(result[2:12]) for result in front]
+	optimum=(front[costs.index(min(costs))], min(costs)) if len(front)>0 else (None, None)
+	print("Pareto front of {}: {} configurations, lowest cost {}".format(scriptName, len(front), optimum[1]))
+	if evaluator.simCache is not None:
+		(hits, misses)=evaluator.simCache.stats()
+		print("Simulation cache for {}: {} hits, {} misses".format(scriptName,hits-cacheStart[0],misses-cacheStart[1]))
+	checkpoint.save({"gen": maxGen, "phase": "done", "optimum": optimum})	# A resumed run returns this result directly
+	writer.close()										# Flush remaining buffered rows
+	if resultStore is not None:
+		resultStore.flush()
+	return optimum
+
+#----------------------------------------------------------------------------------------------------------------------------------------------------------
+#			Breeding
+#----------------------------------------------------------------------------------------------------------------------------------------------------------
+def breedChild(parentA, parentB, minVals, maxVals, mutationChance, mutationRate, rng):
+	"This function accepts the trait values of two parents and returns the trait values of their child"
+	child=[]
+	for j in range(len(parentA)):
+		parentTraitA=parentA[j]
+		parentTraitB=parentB[j]
+		if isinstance(parentTraitA, numbers.Number):						# If numeric, obtain a mixed trait with other random parent
+			childTrait=((parentTraitA+parentTraitB)/2)
+			if rng.choice(range(100)) <= mutationChance:					# mutation chance
+				childTrait=childTrait+rng.randint(int(-1*mutationRate*childTrait/100), int(mutationRate*childTrait/100))		# introduce mutation for numeric variables
+				if childTrait>maxVals[j]:											# Enforce range limits
+					childTrait=maxVals[j]
+				if childTrait<minVals[j]:
+					childTrait=minVals[j]
+			if isinstance(parentTraitA, int):
+				childTrait=int(childTrait)
+			if isinstance(parentTraitA, float):
+				childTrait=float(childTrait)
+		else:																# If not numeric, randomly select one of the Parent traits for child
+			childTrait=rng.choice([parentTraitA, parentTraitB])
+		child.append(childTrait)
+	return child
+
+#----------------------------------------------------------------------------------------------------------------------------------------------------------
+#			Simulation Executor
+#----------------------------------------------------------------------------------------------------------------------------------------------------------
+def simExecutor():
+	"This function returns the executor simulations are submitted to: the shared pool client of the script being optimized, the distributed worker pool if one is configured, otherwise one thread per cpu core"
+	if sharedPool is not None:
+		return sharedPool.client()
+	if workerPool is not None:
+		return workerPool
+	return concurrent.futures.ThreadPoolExecutor(mp.cpu_count())
+
+def simSlots():
+	"This function returns the number of simulations the executor runs at once"
+	if sharedPool is not None:
+		return sharedPool.slots()
+	if workerPool is not None:
+		return max(1, workerPool.slots())
+	return mp.cpu_count()
+
+def runBatch(jobs, checkpoint, completed):
+	"This function runs a batch of runScript argument tuples and yields (output, replayed) for each run as it completes. Runs found in the checkpoint journal (completed) are replayed instead of simulated"
+	for jobIndex in sorted(completed):
+		yield (completed[jobIndex], True)
+	with simExecutor() as executor:
+		batch=SpeculativeBatch(executor, speculateTail)		# Stragglers of the batch are duplicated so the generation barrier is not held up
+		for jobIndex in range(len(jobs)):
+			if jobIndex not in completed:
+				batch.submit(jobIndex, runScript, *jobs[jobIndex])
+		for (jobIndex, output) in batch.completed():
+			yield (output, False)
+			checkpoint.record(jobIndex, output)		# Journaled only once the caller has queued its results
 #----------------------------------------------------------------------------------------------------------------------------------------------------------
 #			MAIN CODE EXECUTION (with performance measurement)
 #----------------------------------------------------------------------------------------------------------------------------------------------------------
@@ -659,14 +799,32 @@ if __name__ == '__main__':
 	MG=25
 	MP=60
 	SS=3
+	CachePath="Sim_Cache.db"
+	Resume=False
+	SteadyState=False
+	PatternSearch=False
+	UseSurrogate=False
+	ScreenFactor=4
+	UseHalving=False
+	MinSimTime=10
+	MaxSimTime=120
+	Eta=3
+	Campaign=False
+	Policy="fair"
+	Weights={}
+	Pin="none"
+	MemoryReserve=0.1
+	ResourceUsage="Resource_Usage.json"
+	Threads=False
+	Pareto=False
 	try:
-		opts, args = getopt.getopt(argv,"hMC:MR:ME:MP:MG:SS:",["MutationChance=","MutationRate=","MaxElite=","MaxPopulation=","MaxGeneration=","StepSize="])
+		opts, args = getopt.getopt(argv,"hMC:MR:ME:MP:MG:SS:",["MutationChance=","MutationRate=","MaxElite=","MaxPopulation=","MaxGeneration=","StepSize=","Cache=","NoCache","UseWaf","Workers=","Columnar=","Resume","SteadyState","PatternSearch","Surrogate","ScreenFactor=","Halving","MinSimTime=","MaxSimTime=","Eta=","Campaign","Policy=","Weights=","Pin=","MemoryReserve=","ResourceUsage=","Timeout=","MinTimeout=","DefaultSimTime=","Speculate=","Trace=","Threads","CostFunction=","Pareto"])
 	except getopt.GetoptError:
-		print ('genetic_optimizer_test.py -MC <MutationChance> -MR <MutationRate> -ME <MaxElite> -MP <MaxPopulation> -MG <MaxGeneration> -SS <StepSize>')
+		print ('genetic_optimizer_test.py -MC <MutationChance> -MR <MutationRate> -ME <MaxElite> -MP <MaxPopulation> -MG <MaxGeneration> -SS <StepSize> --Cache <CacheFile> --NoCache --UseWaf --Workers <host:port,...> --Columnar <Directory> --Resume --SteadyState --PatternSearch --Surrogate --ScreenFactor <Children bred per child simulated> --Halving --MinSimTime <Seconds> --MaxSimTime <Seconds> --Eta <Promotion factor> --Campaign --Policy <fair|priority> --Weights <script=weight,...> --Pin <none|core|numa> --MemoryReserve <Fraction> --ResourceUsage <UsageFile> --Timeout <Wall seconds per simulated second> --MinTimeout <Seconds> --DefaultSimTime <Seconds> --Speculate <Batch fraction> --Trace <TraceFile> --Threads --CostFunction <descent|sweep|Name|File> --Pareto')
 		sys.exit(2)
 	for opt, arg in opts:
 		if opt == '-h':
-			print ('genetic_optimizer_test.py -MC <MutationChance> -MR <MutationRate> -ME <MaxElite> -MP <MaxPopulation> -MG <MaxGeneration> -SS <StepSize>')
+			print ('genetic_optimizer_test.py -MC <MutationChance> -MR <MutationRate> -ME <MaxElite> -MP <MaxPopulation> -MG <MaxGeneration> -SS <StepSize> --Cache <CacheFile> --NoCache --UseWaf --Workers <host:port,...> --Columnar <Directory> --Resume --SteadyState --PatternSearch --Surrogate --ScreenFactor <Children bred per child simulated> --Halving --MinSimTime <Seconds> --MaxSimTime <Seconds> --Eta <Promotion factor> --Campaign --Policy <fair|priority> --Weights <script=weight,...> --Pin <none|core|numa> --MemoryReserve <Fraction> --ResourceUsage <UsageFile> --Timeout <Wall seconds per simulated second> --MinTimeout <Seconds> --DefaultSimTime <Seconds> --Speculate <Batch fraction> --Trace <TraceFile> --Threads --CostFunction <descent|sweep|Name|File> --Pareto')
 			sys.exit()
 		elif opt in ("-MC", "--MutationChance"):
 			MC = int(arg)
@@ -680,6 +838,82 @@ if __name__ == '__main__':
 			MG = int(arg)
 		elif opt in ("-SS", "--StepSize"):
 			SS = int(arg)
+		elif opt == "--Cache":
+			CachePath = arg
+		elif opt == "--NoCache":
+			CachePath = None
+		elif opt == "--UseWaf":
+			sim_exec.useWaf = True
+		elif opt == "--Workers":
+			workerPool = WorkerPool(parseAddresses(arg))
+		elif opt == "--Columnar":
+			resultStore = ColumnarStore(arg)
+		elif opt == "--Resume":
+			Resume = True
+		elif opt == "--SteadyState":
+			SteadyState = True
+		elif opt == "--PatternSearch":
+			PatternSearch = True
+		elif opt == "--Surrogate":
+			UseSurrogate = True
+		elif opt == "--ScreenFactor":
+			ScreenFactor = int(arg)
+		elif opt == "--Halving":
+			UseHalving = True
+		elif opt == "--MinSimTime":
+			MinSimTime = float(arg)
+		elif opt == "--MaxSimTime":
+			MaxSimTime = float(arg)
+		elif opt == "--Eta":
+			Eta = int(arg)
+		elif opt == "--Campaign":
+			Campaign = True
+		elif opt == "--Policy":
+			if arg not in POLICIES:
+				print("--Policy must be one of "+", ".join(POLICIES))
+				sys.exit(2)
+			Policy = arg
+		elif opt == "--Weights":
+			Weights = parseWeights(arg)
+		elif opt == "--Pin":
+			if arg not in PIN_MODES:
+				print("--Pin must be one of "+", ".join(PIN_MODES))
+				sys.exit(2)
+			Pin = arg
+		elif opt == "--MemoryReserve":
+			MemoryReserve = float(arg)
+		elif opt == "--ResourceUsage":
+			ResourceUsage = arg
+		elif opt == "--Timeout":
+			sim_exec.timeoutFactor = float(arg)
+		elif opt == "--MinTimeout":
+			sim_exec.minTimeout = float(arg)
+		elif opt == "--DefaultSimTime":
+			sim_exec.defaultSimTime = float(arg)
+		elif opt == "--Speculate":
+			speculateTail = float(arg)
+		elif opt == "--Trace":
+			profiling.tracer = profiling.Tracer(arg)
+		elif opt == "--Threads":
+			Threads = True
+		elif opt == "--CostFunction":
+			try:
+				cost_func.load(arg)							# Shared with the evaluator, so every optimizer scores with it
+			except ValueError as error:
+				print("--CostFunction: "+str(error))
+				sys.exit(2)
+		elif opt == "--Pareto":
+			Pareto = True
+	if CachePath is not None:
+		evaluator.simCache=SimCache(CachePath)
+	processPool=None
+	if workerPool is None and not Threads:
+		processPool=ProcessPool(mp.cpu_count())			# Warm worker processes, started with the settings in place at the first simulation
+	sharedPool=SharedPool(mp.cpu_count(), workerPool or processPool, Policy, Weights)	# One pool for every script, generation and descent step
+	if UseHalving and SteadyState:
+		print("--Halving screens whole generations and is not used with --SteadyState")
+	if Pareto and (SteadyState or PatternSearch or UseSurrogate or UseHalving):
+		print("--Pareto ranks generations by their raw metrics and does not use --SteadyState, --PatternSearch, --Surrogate or --Halving")
 	
 	if not os.path.exists('Av_Results'):
 		os.makedirs('Av_Results')
@@ -690,6 +924,7 @@ if __name__ == '__main__':
 
 	if platform.system() == "Linux":
 		os.system("taskset -c -p 0-{} {}".format(mp.cpu_count(),os.getpid()))			# Change task affinity so all cores are used [LINUX specific]
+	sim_exec.resources=ResourceManager(Pin, MemoryReserve, ResourceUsage)	# After taskset, so every core can be pinned to
 	print("Checking waf build.....")
 	cmd=subprocess.check_output(['./waf build'], shell=True, stderr=subprocess.STDOUT)	# Build waf first
 	print("waf built!")
@@ -703,19 +938,43 @@ if __name__ == '__main__':
 	#cmd=subprocess.check_output(['./waf build'], shell=True, stderr=subprocess.STDOUT)	# Build waf first
 	#scripts=["testbed-Lowpan-CSMA-v1","testbed-Lowpan-WiFi-v1","testbed-Lowpan-Wimax-v1","testbed-PLC-CSMA-v1","testbed-PLC-WiFi-v1","testbed-PLC-Wimax-v1"]
 	scripts=["testbed-BPLC-CSMA-v1","testbed-BPLC-WiFi-v1","testbed-BPLC-Wimax-v1","testbed-NPLC-Wimax-v1"]
-	for script in scripts:
-		with open("Av_Results/Averaged_Results_"+script+".csv", 'w', newline='') as outputFile:		# Create Output CSV file in which to store raw results of all simulations for this script
-			outputWriter = csv.writer(outputFile)
-			outputWriter.writerow(['Test No', 'Script Name', 'Average Average Throughput (kbps)', 'Minimum Average Throughput (kbps)', 'Average Minimum Device Throughput (kbps)', 'Minimum Minimum Device Throughput (kbps)', 'Average Average Latency (ms)', 'Maximum Average Latency (ms)', 'Average Maximum Device Latency (ms)', 'Maximum Maximum Device Latency (ms)', 'Average Packet Loss Rate (%)', 'Maximum Device Packet Loss Rate (%)', 'Description'])
-		(Parameters, values)=Get_Params_Vals(script)	
-		(optimalResult, cost)=genetic_optimizer(script,Parameters,values,4,MG,ME,MP,MC,MR,SS)
-		optimum_results.append(optimalResult) 
+	sim_exec.resolvePrograms(scripts)					# Locate compiled scratch programs once so each run skips waf
+	def optimizeScript(script):
+		"This function runs the selected optimizer on one script and returns its optimal result"
+		if not (Resume and os.path.exists("Av_Results/Averaged_Results_"+script+".csv")):
+			with open("Av_Results/Averaged_Results_"+script+".csv", 'w', newline='') as outputFile:		# Create Output CSV file in which to store raw results of all simulations for this script
+				outputWriter = csv.writer(outputFile)
+				outputWriter.writerow(AV_HEADER)
+		space=Get_Param_Space(script)
+		surrogate=Surrogate(*Get_Trait_Vals(space), ScreenFactor) if UseSurrogate else None
+		halving=Halving(MinSimTime, MaxSimTime, Eta) if UseHalving else None
+		if Pareto:
+			(optimalResult, cost)=pareto_optimizer(script,space,4,MG,MP,MC,MR,Resume)
+		elif SteadyState:
+			(optimalResult, cost)=steady_state_optimizer(script,space,4,MG,ME,MP,MC,MR,Resume,surrogate)
+		else:
+			(optimalResult, cost)=genetic_optimizer(script,space,4,MG,ME,MP,MC,MR,SS,Resume,PatternSearch,surrogate,halving,ScreenFactor)
+		return optimalResult
+	if Campaign:
+		optimum_results=runCampaign(sharedPool, scripts, optimizeScript)	# All scripts at once, sharing the pool under the scheduling policy
+	else:
+		for script in scripts:
+			sharedPool.bind(script)
+			optimum_results.append(optimizeScript(script))
 	with open('Optimal_Simulation_Results.csv', 'w', newline='') as outputFile:		# Create Output CSV file in which to store overall results of simulation
 		outputWriter = csv.writer(outputFile)
-		outputWriter.writerow(['Test No', 'Script Name', 'Average Average Throughput (kbps)', 'Minimum Average Throughput (kbps)', 'Average Minimum Device Throughput (kbps)', 'Minimum Minimum Device Throughput (kbps)', 'Average Average Latency (ms)', 'Maximum Average Latency (ms)', 'Average Maximum Device Latency (ms)', 'Maximum Maximum Device Latency (ms)', 'Average Packet Loss Rate (%)', 'Maximum Device Packet Loss Rate (%)', 'Description'])
-	for optResult in optimum_results:
-		with open('Optimal_Simulation_Results.csv', 'a', newline='') as outputFile:		# Create Output CSV file in which to store overall results of simulations
-			outputWriter = csv.writer(outputFile)
-			outputWriter.writerow(optResult)
+		outputWriter.writerow(AV_HEADER)
+		outputWriter.writerows(optimum_results)
+	sharedPool.shutdown()
+	if processPool is not None:
+		processPool.shutdown()
+	sim_exec.resources.save()
+	print("Resource usage: "+sim_exec.resources.summary())
+	if profiling.tracer is not None:
+		print(profiling.tracer.close(sharedPool.slots()))
+	if workerPool is not None:
+		workerPool.shutdown()
+	if resultStore is not None:
+		resultStore.close()
 	endtime=time.time()
 	print("\ntotal execution time: {} seconds\n".format(float(endtime)-float(starttime)))
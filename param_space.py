@@ -0,0 +1,114 @@
+# Parameter space
+# Cartesian product of the tunable parameter values of a testbed script, loaded from a per-script specification file and enumerated lazily
+#
+# Copyright (c) 2026 ParaOptimizationNS3 contributors
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy of this software and associated documentation files (the "Software"),
+# to deal in the Software without restriction, including without limitation the rights to use, copy, modify, merge, publish, distribute, sublicense,
+# and/or sell copies of the Software, and to permit persons to whom the Software is furnished to do so, subject to the following conditions:
+# The above copyright notice and this permission notice shall be included in all copies or substantial portions of the Software.
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS
+# IN THE SOFTWARE.
+
+# A specification file is a JSON object with one entry per parameter, in option order. The last parameter varies fastest. An entry is one of:
+#   [v1, v2, ...]                                  list of values
+#   {"range": [start, stop, step]}                 integers start, start+step, ... below stop
+#   {"from": "Param", "map": {"a": x, "b": y}}     derived from the value of an earlier parameter, not a dimension of the product
+
+#import
+import itertools
+import json
+import os
+
+SPACE_DIR="Param_Spaces"							# Specification files are looked up as Param_Spaces/<script>.json
+
+#----------------------------------------------------------------------------------------------------------------------------------------------------------
+#			Parameter Space
+#----------------------------------------------------------------------------------------------------------------------------------------------------------
+class ParamSpace:
+	"Parameter names, the values of each free parameter and the derived parameters of a script. Configurations are tuples of values in parameter order, computed from their index on demand"
+
+	def __init__(self, Parameters, choices, derived=None):
+		self.Parameters=list(Parameters)
+		self.choices=list(choices)				# Values of each parameter (a list or range), None for derived parameters
+		self.derived=derived or {}				# Parameter index -> (source parameter index, value map)
+		self.free=[j for j in range(len(self.Parameters)) if j not in self.derived]
+		self.size=1
+		for j in self.free:
+			self.size*=len(self.choices[j])
+
+	def __len__(self):
+		return self.size
+
+	def __getitem__(self, index):
+		"This function returns the configuration at an index, or a generator of the configurations of a slice"
+		if isinstance(index, slice):
+			return (self.config(i) for i in range(self.size)[index])
+		if index<0:
+			index+=self.size
+		if index<0 or index>=self.size:
+			raise IndexError("configuration index out of range")
+		return self.config(index)
+
+	def __iter__(self):
+		for free in itertools.product(*[self.choices[j] for j in self.free]):
+			yield self.complete(free)
+
+	def config(self, index):
+		"This function returns the configuration at an index by mixed radix decoding, last parameter fastest"
+		return self.complete(self.traits(index))
+
+	def traits(self, index):
+		"This function returns the values of the free parameters of the configuration at an index"
+		free=[]
+		for j in reversed(self.free):
+			(index, digit)=divmod(index, len(self.choices[j]))
+			free.append(self.choices[j][digit])
+		return free[::-1]
+
+	def complete(self, free):
+		"This function fills in the derived parameters of the values of the free parameters"
+		config=[None]*len(self.Parameters)
+		for (j, value) in zip(self.free, free):
+			config[j]=value
+		for j in sorted(self.derived):
+			(source, valueMap)=self.derived[j]
+			config[j]=valueMap[str(config[source])]
+		return tuple(config)
+
+	def values(self, j):
+		"This function returns the distinct values parameter j takes"
+		if j in self.derived:
+			return list(dict.fromkeys(self.derived[j][1].values()))
+		return self.choices[j]
+
+def loadSpace(path):
+	"This function accepts the path of a specification file and returns its ParamSpace"
+	with open(path) as specFile:
+		spec=json.load(specFile)
+	Parameters=list(spec)
+	choices=[]
+	derived={}
+	for (j, name) in enumerate(Parameters):
+		entry=spec[name]
+		if isinstance(entry, list):
+			choices.append(entry)
+		elif "range" in entry:
+			choices.append(range(*entry["range"]))
+		elif "from" in entry:
+			if entry["from"] not in Parameters[:j]:
+				raise ValueError("{}: {} is derived from {}, which must be an earlier parameter".format(path, name, entry["from"]))
+			choices.append(None)
+			derived[j]=(Parameters.index(entry["from"]), entry["map"])
+		else:
+			raise ValueError("{}: bad specification of {}".format(path, name))
+	return ParamSpace(Parameters, choices, derived)
+
+def scriptSpace(script, default):
+	"This function returns the ParamSpace in the specification file of a script, or default when the script has none"
+	path=os.path.join(SPACE_DIR, script+".json")
+	if os.path.exists(path):
+		return loadSpace(path)
+	return default
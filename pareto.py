@@ -0,0 +1,126 @@
+# Pareto ranking
+# Non-dominated sorting, crowding distance and a Pareto archive over the raw metrics of configurations, used by the multi-objective (NSGA-II)
+# mode of the genetic optimizer instead of a scalar cost
+#
+# Copyright (c) 2026 ParaOptimizationNS3 contributors
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy of this software and associated documentation files (the "Software"),
+# to deal in the Software without restriction, including without limitation the rights to use, copy, modify, merge, publish, distribute, sublicense,
+# and/or sell copies of the Software, and to permit persons to whom the Software is furnished to do so, subject to the following conditions:
+# The above copyright notice and this permission notice shall be included in all copies or substantial portions of the Software.
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS
+# IN THE SOFTWARE.
+
+# Objectives are kept as a vector to minimize: throughputs are negated. A failed configuration (zero average throughput, the case cost_func
+# penalizes) gets infinite objectives, so it is dominated by every configuration which ran.
+
+#import
+import random
+
+import numpy as np
+
+OBJECTIVES=[("avAvThroughput", 0, -1), ("minAvThroughput", 1, -1), ("avAvLatency", 4, 1), ("maxAvLatency", 5, 1), ("avPackLossRate", 8, 1)]	# (name, index in RunStats.averagedMetrics, sign), maximized when the sign is -1
+
+#----------------------------------------------------------------------------------------------------------------------------------------------------------
+#			Non-dominated Sorting
+#----------------------------------------------------------------------------------------------------------------------------------------------------------
+def objectiveVector(metrics):
+	"This function accepts the 10 averaged metrics of a configuration and returns its objective vector, to be minimized"
+	if metrics[0]==0:
+		return np.full(len(OBJECTIVES), np.inf)
+	return np.array([sign*metrics[index] for (name, index, sign) in OBJECTIVES], dtype=np.float64)
+
+def dominance(objectives):
+	"This function accepts an (n, objectives) array and returns the (n, n) matrix whose [i, j] entry is True when i dominates j"
+	noWorse=(objectives[:, None, :]<=objectives[None, :, :]).all(axis=2)
+	better=(objectives[:, None, :]<objectives[None, :, :]).any(axis=2)
+	return noWorse & better
+
+def nonDominatedSort(objectives):
+	"This function accepts an (n, objectives) array and returns the list of fronts, arrays of row indices, best front first"
+	dominates=dominance(objectives)
+	dominatedBy=dominates.sum(axis=0)						# Number of rows dominating each row, as in the fast non-dominated sort of NSGA-II
+	remaining=np.ones(len(objectives), dtype=bool)
+	fronts=[]
+	while remaining.any():
+		front=np.flatnonzero(remaining & (dominatedBy==0))
+		fronts.append(front)
+		remaining[front]=False
+		dominatedBy-=dominates[front].sum(axis=0)			# Peel the front off with one vectorized update instead of a loop over its members
+	return fronts
+
+def crowdingDistance(objectives):
+	"This function accepts the (n, objectives) array of one front and returns the crowding distance of each member, infinite at the extremes"
+	distance=np.zeros(len(objectives))
+	if len(objectives)<3:
+		distance[:]=np.inf
+		return distance
+	for m in range(objectives.shape[1]):
+		order=np.argsort(objectives[:, m], kind="stable")
+		values=objectives[order, m]
+		distance[order[0]]=distance[order[-1]]=np.inf
+		if np.isfinite(values[[0, -1]]).all() and values[-1]>values[0]:		# Skipped for failed configurations or no spread in this objective
+			distance[order[1:-1]]+=(values[2:]-values[:-2])/(values[-1]-values[0])
+	return distance
+
+def selectSurvivors(objectives, count):
+	"This function returns (indices, ranks, crowding) of the count rows kept by NSGA-II selection: whole fronts first, the last one by crowding distance"
+	chosen=[]
+	ranks=[]
+	crowding=[]
+	for (rank, front) in enumerate(nonDominatedSort(objectives)):
+		if len(chosen)>=count:
+			break
+		distance=crowdingDistance(objectives[front])
+		if len(chosen)+len(front)>count:					# Most isolated members of the front that does not fit
+			keep=np.argsort(-distance, kind="stable")[:count-len(chosen)]
+			(front, distance)=(front[keep], distance[keep])
+		chosen.extend(front.tolist())
+		ranks.extend([rank]*len(front))
+		crowding.extend(distance.tolist())
+	return (chosen, ranks, crowding)
+
+def tournament(ranks, crowding, rng=random):
+	"This function returns the index of the winner of a binary tournament under the crowded comparison (lower rank, then larger crowding distance), drawing the entrants from rng"
+	a=rng.randrange(len(ranks))
+	b=rng.randrange(len(ranks))
+	if (ranks[b], -crowding[b])<(ranks[a], -crowding[a]):
+		return b
+	return a
+
+#----------------------------------------------------------------------------------------------------------------------------------------------------------
+#			Pareto Archive
+#----------------------------------------------------------------------------------------------------------------------------------------------------------
+class ParetoArchive:
+	"Every non-dominated configuration evaluated so far, keyed by hash, with its trait values, objective vector and averaged result row"
+
+	def __init__(self):
+		self.hashes=[]
+		self.values=[]
+		self.results=[]
+		self.objectives=np.zeros((0, len(OBJECTIVES)))
+
+	def __len__(self):
+		return len(self.hashes)
+
+	def __contains__(self, hash):
+		return hash in self.hashes
+
+	def add(self, hash, values, objectives, result):
+		"This function adds a configuration unless an archived one is at least as good in every objective, and drops the members it dominates. Returns True if it was added"
+		if not np.isfinite(objectives).all() or hash in self.hashes:
+			return False
+		if (self.objectives<=objectives).all(axis=1).any():
+			return False
+		keep=~((objectives<=self.objectives).all(axis=1) & (objectives<self.objectives).any(axis=1))
+		self.hashes=[member for (member, kept) in zip(self.hashes, keep) if kept]+[hash]
+		self.values=[member for (member, kept) in zip(self.values, keep) if kept]+[values]
+		self.results=[member for (member, kept) in zip(self.results, keep) if kept]+[result]
+		self.objectives=np.vstack([self.objectives[keep], objectives])
+		return True
+
+	def front(self):
+		"This function returns the averaged result rows of the archive, by decreasing average throughput"
+		return [self.results[i] for i in np.argsort(self.objectives[:, 0], kind="stable")]
@@ -0,0 +1,122 @@
+# Genetic optimizer population
+# Bounded pool of evaluated configurations indexed by a pair of heaps, used for the general population and the elites
+#
+# Copyright (c) 2026 ParaOptimizationNS3 contributors
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy of this software and associated documentation files (the "Software"),
+# to deal in the Software without restriction, including without limitation the rights to use, copy, modify, merge, publish, distribute, sublicense,
+# and/or sell copies of the Software, and to permit persons to whom the Software is furnished to do so, subject to the following conditions:
+# The above copyright notice and this permission notice shall be included in all copies or substantial portions of the Software.
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS
+# IN THE SOFTWARE.
+
+#import
+import heapq
+import random
+
+#----------------------------------------------------------------------------------------------------------------------------------------------------------
+#			Population
+#----------------------------------------------------------------------------------------------------------------------------------------------------------
+class Population:
+	"""Set of configurations keyed by hash, each with its trait values, cost and averaged result row.
+	A min-heap and a max-heap of (cost, seq, hash) give the best and worst member in O(log n); entries replaced or evicted are
+	deleted lazily by checking their seq against the live entry. A list of hashes with an index map gives O(1) random parent selection."""
+
+	def __init__(self, maxSize=0):
+		self.maxSize=maxSize						# 0 means unlimited
+		self.entries={}								# hash -> (cost, seq, values, result)
+		self.minHeap=[]
+		self.maxHeap=[]
+		self.order=[]								# Live hashes for random selection
+		self.position={}							# hash -> index in self.order
+		self.nextSeq=0
+
+	def __len__(self):
+		return len(self.entries)
+
+	def __contains__(self, hash):
+		return hash in self.entries
+
+	def add(self, hash, values, cost, result):
+		"This function inserts or improves a configuration, evicting the worst member if the population is full. Returns True if the population changed"
+		if hash in self.entries:
+			if cost >= self.entries[hash][0]:										# Keep the existing, better result
+				return False
+		elif self.maxSize > 0 and len(self.entries) >= self.maxSize:
+			worstHash=self.worst()
+			if cost >= self.entries[worstHash][0]:
+				return False
+			self.remove(worstHash)													# Delete highest cost member
+		if hash not in self.entries:
+			self.position[hash]=len(self.order)
+			self.order.append(hash)
+		seq=self.nextSeq
+		self.nextSeq+=1
+		self.entries[hash]=(cost, seq, values, result)
+		heapq.heappush(self.minHeap, (cost, seq, hash))
+		heapq.heappush(self.maxHeap, (-cost, seq, hash))
+		if len(self.minHeap) > 4*len(self.entries)+64:								# Rebuild heaps once stale entries dominate
+			self.compact()
+		return True
+
+	def remove(self, hash):
+		del self.entries[hash]
+		index=self.position.pop(hash)
+		last=self.order.pop()
+		if last != hash:															# Swap-remove keeps random selection O(1)
+			self.order[index]=last
+			self.position[last]=index
+
+	def isLive(self, item):
+		return item[2] in self.entries and self.entries[item[2]][1]==item[1]
+
+	def best(self):
+		"This function returns the hash of the lowest cost member"
+		while not self.isLive(self.minHeap[0]):
+			heapq.heappop(self.minHeap)
+		return self.minHeap[0][2]
+
+	def worst(self):
+		"This function returns the hash of the highest cost member"
+		while not self.isLive(self.maxHeap[0]):
+			heapq.heappop(self.maxHeap)
+		return self.maxHeap[0][2]
+
+	def top(self, k):
+		"This function returns the hashes of the k lowest cost members, best first. The min-heap is walked from its root, so only the entries above the k-th member are visited"
+		hashes=[]
+		frontier=[(self.minHeap[0], 0)] if len(self.minHeap)>0 else []		# (entry, index in the heap) of the children of the entries visited
+		while len(frontier)>0 and len(hashes)<k:
+			(item, index)=heapq.heappop(frontier)
+			if self.isLive(item):
+				hashes.append(item[2])
+			for child in (2*index+1, 2*index+2):
+				if child<len(self.minHeap):
+					heapq.heappush(frontier, (self.minHeap[child], child))
+		return hashes
+
+	def compact(self):
+		self.minHeap=[(cost, seq, hash) for hash, (cost, seq, values, result) in self.entries.items()]
+		self.maxHeap=[(-cost, seq, hash) for (cost, seq, hash) in self.minHeap]
+		heapq.heapify(self.minHeap)
+		heapq.heapify(self.maxHeap)
+
+	def cost(self, hash):
+		return self.entries[hash][0]
+
+	def values(self, hash):
+		return self.entries[hash][2]
+
+	def result(self, hash):
+		return self.entries[hash][3]
+
+	def hashes(self):
+		return list(self.order)
+
+	def randomHash(self, rng=random):
+		return rng.choice(self.order)
+
+	def __getitem__(self, hash):
+		return self.entries[hash][2]
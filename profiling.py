@@ -0,0 +1,151 @@
+# Evaluation pipeline profiling
+# Structured JSONL trace of every simulation job (queue wait, admission, spawn, simulation and parse times), of the optimizer phases and of the
+# result writer, with a summary report of simulation throughput per core-hour
+#
+# Copyright (c) 2026 ParaOptimizationNS3 contributors
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy of this software and associated documentation files (the "Software"),
+# to deal in the Software without restriction, including without limitation the rights to use, copy, modify, merge, publish, distribute, sublicense,
+# and/or sell copies of the Software, and to permit persons to whom the Software is furnished to do so, subject to the following conditions:
+# The above copyright notice and this permission notice shall be included in all copies or substantial portions of the Software.
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS
+# IN THE SOFTWARE.
+
+# Trace events are JSON objects, one per line, with a "type" of:
+#   job      one simulation job of the SharedPool: queued, dispatched and finished timestamps, and for jobs run in this process also start,
+#            admitted, spawned and exited timestamps, parse seconds and the status (simulated, cached, failed or timeout)
+#   phase    one optimizer phase (breed, evaluate, descent, screen, sweep, propose ...): start and end timestamps, script and generation
+#   write    one flush of a ResultWriter: rows written and seconds spent writing them
+#   summary  the totals of the summary report, written when the trace is closed
+# Jobs run in worker processes return their marks with their result. Jobs sent to --Workers daemons only have the pool timestamps, the worker
+# side is not traced.
+
+#import
+import collections
+import json
+import threading
+import time
+
+tracer=None								# Tracer of this run, set in main when tracing is requested
+local=threading.local()					# Job record of the simulation running in the calling thread
+
+#----------------------------------------------------------------------------------------------------------------------------------------------------------
+#			Tracer
+#----------------------------------------------------------------------------------------------------------------------------------------------------------
+class Tracer:
+	"JSONL trace file and the running totals of its summary report"
+
+	def __init__(self, path):
+		self.file=open(path, 'w', buffering=1<<16)
+		self.lock=threading.Lock()
+		self.start=time.time()
+		self.status=collections.Counter()				# Job status -> jobs
+		self.intervals=collections.defaultdict(float)	# Job interval name -> total seconds
+		self.phases=collections.defaultdict(float)		# Phase name -> total seconds
+		self.phaseCounts=collections.Counter()
+		self.writeRows=0
+		self.writeSeconds=0.0
+
+	def emit(self, event):
+		line=json.dumps(event)
+		with self.lock:
+			if not self.file.closed:					# Late events of writers closed after the trace are dropped
+				self.file.write(line+"\n")
+
+	def job(self, record):
+		"This function records a finished job and adds its intervals to the totals"
+		intervals={"queue": ("queued", "dispatched"), "admission": ("start", "admitted"), "spawn": ("admitted", "spawned"), "simulation": ("spawned", "exited"), "total": ("queued", "finished")}
+		with self.lock:
+			self.status[record.get("status", "remote")]+=1
+			for (name, (first, last)) in intervals.items():
+				if first in record and last in record:
+					self.intervals[name]+=record[last]-record[first]
+			self.intervals["parse"]+=record.get("parse", 0.0)
+		self.emit(dict(record, type="job"))
+
+	def phase(self, name, script, start, end, **fields):
+		with self.lock:
+			self.phases[name]+=end-start
+			self.phaseCounts[name]+=1
+		self.emit(dict(fields, type="phase", phase=name, script=script, start=start, end=end))
+
+	def write(self, rows, seconds):
+		with self.lock:
+			self.writeRows+=rows
+			self.writeSeconds+=seconds
+		self.emit({"type": "write", "time": time.time(), "rows": rows, "seconds": seconds})
+
+	def summary(self, cores):
+		"This function returns the summary report of the trace so far for a run using cores simulation slots"
+		wall=time.time()-self.start
+		with self.lock:
+			simulated=sum(count for (status, count) in self.status.items() if status!="cached")
+			jobs=sum(self.status.values())
+			report={"wall": wall, "cores": cores, "jobs": dict(self.status), "simsPerCoreHour": simulated*3600/(wall*cores) if wall>0 else 0.0,
+					"jobSeconds": {name: seconds/max(1, jobs) for (name, seconds) in self.intervals.items()},
+					"phaseSeconds": dict(self.phases), "writeRows": self.writeRows, "writeSeconds": self.writeSeconds}
+		lines=["Profile: {} jobs ({}) in {:.1f} s on {} cores: {:.1f} simulations per core-hour".format(jobs, ", ".join("{} {}".format(count, status) for (status, count) in sorted(self.status.items())), wall, cores, report["simsPerCoreHour"])]
+		lines.append("  Mean per job: "+", ".join("{} {:.4f} s".format(name, seconds) for (name, seconds) in sorted(report["jobSeconds"].items())))
+		for name in sorted(self.phases, key=lambda name: -self.phases[name]):
+			lines.append("  Phase {}: {:.2f} s in {} calls".format(name, self.phases[name], self.phaseCounts[name]))
+		lines.append("  Result writer: {} rows in {:.3f} s".format(self.writeRows, self.writeSeconds))
+		return (report, "\n".join(lines))
+
+	def close(self, cores):
+		"This function writes the summary event, closes the trace and returns the summary report"
+		(report, text)=self.summary(cores)
+		self.emit(dict(report, type="summary"))
+		with self.lock:
+			self.file.close()
+		return text
+
+#----------------------------------------------------------------------------------------------------------------------------------------------------------
+#			Instrumentation Points (no-ops when tracing is off)
+#----------------------------------------------------------------------------------------------------------------------------------------------------------
+def jobRecord(client, queued):
+	"This function returns the record of a job dispatched by a SharedPool, or None when tracing is off"
+	if tracer is None:
+		return None
+	return {"script": client, "queued": queued, "dispatched": time.time()}
+
+def within(record, fn):
+	"This function wraps a job function so the marks made while it runs in a pool thread go to its record"
+	def run(*args):
+		local.record=record
+		record["start"]=time.time()
+		try:
+			return fn(*args)
+		finally:
+			local.record=None
+	return run
+
+def finished(record):
+	if record is not None and tracer is not None:
+		record["finished"]=time.time()
+		tracer.job(record)
+
+def mark(name, value=None):
+	"This function sets a field of the record of the job running in the calling thread, by default to the current time"
+	record=getattr(local, "record", None)
+	if record is not None:
+		record[name]=time.time() if value is None else value
+
+def timedFeed(feed):
+	"This function wraps the line parser of a simulation so the time spent parsing is added to the record of its job"
+	record=getattr(local, "record", None)
+	if record is None:
+		return feed
+	record["parse"]=0.0
+	clock=time.perf_counter
+	def timed(line):
+		start=clock()
+		feed(line)
+		record["parse"]+=clock()-start
+	return timed
+
+def phase(name, script, start, **fields):
+	"This function records an optimizer phase which began at start and ends now"
+	if tracer is not None:
+		tracer.phase(name, script, start, time.time(), **fields)
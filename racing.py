@@ -0,0 +1,98 @@
+# Replicate racing
+# Sequential allocation of simulation replicates: configurations are replicated in batches until their cost is known precisely enough or they are
+# statistically dominated by the best configuration seen so far
+#
+# Copyright (c) 2026 ParaOptimizationNS3 contributors
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy of this software and associated documentation files (the "Software"),
+# to deal in the Software without restriction, including without limitation the rights to use, copy, modify, merge, publish, distribute, sublicense,
+# and/or sell copies of the Software, and to permit persons to whom the Software is furnished to do so, subject to the following conditions:
+# The above copyright notice and this permission notice shall be included in all copies or substantial portions of the Software.
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS
+# IN THE SOFTWARE.
+
+#import
+import heapq
+import itertools
+import math
+
+T_975=[12.706, 4.303, 3.182, 2.776, 2.571, 2.447, 2.365, 2.306, 2.262, 2.228, 2.201, 2.179, 2.160, 2.145, 2.131,
+	2.120, 2.110, 2.101, 2.093, 2.086, 2.080, 2.074, 2.069, 2.064, 2.060, 2.056, 2.052, 2.048, 2.045, 2.042]		# Student t quantiles for 95% two-sided intervals, df 1-30
+
+#----------------------------------------------------------------------------------------------------------------------------------------------------------
+#			Race
+#----------------------------------------------------------------------------------------------------------------------------------------------------------
+class Race:
+	"Running mean and 95% confidence interval of the objective of each configuration, and the decision whether it needs another batch of replicates"
+
+	def __init__(self, maximize=False, batchSize=10, maxRuns=1000, tolerance=0.01):
+		self.maximize=maximize
+		self.batchSize=max(2, batchSize)			# Two replicates are needed for an interval
+		self.maxRuns=maxRuns
+		self.tolerance=tolerance					# Stop once the interval half width is within this fraction of the mean
+		self.samples={}								# config -> [n, mean, sum of squared deviations] (Welford)
+		self.stopped={}								# config -> reason replication stopped
+		self.ranking=[]								# Heap of (signed mean, n, sequence, config) of configurations with a full batch, an entry is stale once its configuration has more replicates
+		self.sequence=itertools.count()				# Breaks ties without comparing configurations
+
+	def add(self, config, x):
+		"This function adds the objective value of one replicate of a configuration"
+		sample=self.samples.setdefault(config, [0, 0.0, 0.0])
+		sample[0]+=1
+		delta=x-sample[1]
+		sample[1]+=delta/sample[0]
+		sample[2]+=delta*(x-sample[1])
+		if sample[0]>=self.batchSize:
+			heapq.heappush(self.ranking, (-sample[1] if self.maximize else sample[1], sample[0], next(self.sequence), config))
+			if len(self.ranking)>2*len(self.samples)+self.batchSize:		# Drop stale entries, so the heap stays proportional to the configurations
+				self.ranking=[entry for entry in self.ranking if self.samples[entry[3]][0]==entry[1]]
+				heapq.heapify(self.ranking)
+
+	def interval(self, config):
+		"This function returns (mean, half width of the 95% confidence interval) of a configuration"
+		(n, mean, m2)=self.samples[config]
+		if n<2:
+			return (mean, math.inf)
+		t=T_975[n-2] if n-1<=len(T_975) else 1.96
+		return (mean, t*math.sqrt(m2/(n-1)/n))
+
+	def incumbent(self):
+		"This function returns the configuration with the best mean among those with at least one full batch of replicates"
+		while len(self.ranking)>0 and self.samples[self.ranking[0][3]][0]!=self.ranking[0][1]:
+			heapq.heappop(self.ranking)
+		if len(self.ranking)==0:
+			return None
+		return self.ranking[0][3]
+
+	def nextBatch(self, config):
+		"This function returns the number of replicates to run next for a configuration, or 0 once replication has stopped (the reason is kept in stopped)"
+		if config in self.stopped:
+			return 0
+		n=self.samples[config][0] if config in self.samples else 0
+		if n>=self.maxRuns:
+			self.stopped[config]="budget"
+			return 0
+		if n>=self.batchSize:
+			(mean, halfWidth)=self.interval(config)
+			if halfWidth<=self.tolerance*abs(mean):
+				self.stopped[config]="precise"
+				return 0
+			incumbent=self.incumbent()
+			if incumbent is not None and incumbent!=config:
+				(bestMean, bestHalfWidth)=self.interval(incumbent)
+				if (self.maximize and mean+halfWidth<bestMean-bestHalfWidth) or (not self.maximize and mean-halfWidth>bestMean+bestHalfWidth):
+					self.stopped[config]="dominated"
+					return 0
+		return min(self.batchSize, self.maxRuns-n)
+
+	def runs(self):
+		return sum(sample[0] for sample in self.samples.values())
+
+	def summary(self):
+		"This function returns the number of configurations whose replication stopped for each reason"
+		reasons={}
+		for reason in self.stopped.values():
+			reasons[reason]=reasons.get(reason, 0)+1
+		return reasons
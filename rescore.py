@@ -0,0 +1,137 @@
+# Archive re-scoring
+# Re-scores every run of an existing Av_Results archive under a new cost definition in one vectorized pass and re-ranks the configurations of each
+# script, so a change of weights or thresholds needs no new simulations. Run from the ns-3 top level directory, like the optimizers.
+#
+# Copyright (c) 2026 ParaOptimizationNS3 contributors
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy of this software and associated documentation files (the "Software"),
+# to deal in the Software without restriction, including without limitation the rights to use, copy, modify, merge, publish, distribute, sublicense,
+# and/or sell copies of the Software, and to permit persons to whom the Software is furnished to do so, subject to the following conditions:
+# The above copyright notice and this permission notice shall be included in all copies or substantial portions of the Software.
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS
+# IN THE SOFTWARE.
+
+# Every averaged row of every generation file is one run. Rows of the same script and configuration (the description without its GD- prefix and
+# RunNo trailer) are averaged, like the replicates of a configuration in the optimizers. Successive halving files of the brute force sampler
+# only contribute their full fidelity rows, the rows at the longest SimTime of the file. The Gen<g>_Halving_Results files of the genetic
+# optimizer only hold the screening rungs below full fidelity and are skipped, its full fidelity runs are in Gen<g>_Averaged_Results.
+
+#import
+import argparse
+import csv
+import glob
+import os
+import sys
+import time
+
+import numpy as np
+
+from cost_model import AV_METRICS, CostFunction, loadDefinition
+from result_writer import AV_HEADER
+
+RESCORED_HEADER=['Script Name', 'Rank', 'Previous Rank', 'Runs', 'Cost', 'Previous Cost']+AV_HEADER[2:]
+
+#----------------------------------------------------------------------------------------------------------------------------------------------------------
+#			Archive Reader
+#----------------------------------------------------------------------------------------------------------------------------------------------------------
+def configuration(desc):
+	"This function accepts the description of an Av_Results row and returns the configuration it was simulated with"
+	if desc.startswith("GD-"):
+		desc=desc[3:]
+	return desc.partition(', and RunNo')[0]
+
+def readArchive(archive, scripts=None, files="*.csv"):
+	"This function reads every Av_Results file of the archive and returns the (scripts, configurations, metrics) arrays with one entry per run"
+	names=[]
+	configs=[]
+	metrics=[]
+	for path in sorted(glob.glob(os.path.join(archive, files))):
+		fileName=os.path.basename(path)
+		if fileName.startswith("Gen") and "_Halving_Results_" in fileName:		# Screening rungs only
+			continue
+		with open(path, newline="") as resultFile:
+			rows=[row for row in csv.reader(resultFile) if len(row)>=len(AV_HEADER) and row[0]!=AV_HEADER[0]]
+		if "Halving_Results" in fileName and len(rows)>0:			# Keep the full fidelity rung only
+			simTimes=[float(row[len(AV_HEADER)]) for row in rows]
+			fullFidelity=max(simTimes)
+			rows=[row for (row, simTime) in zip(rows, simTimes) if simTime==fullFidelity]
+		for row in rows:
+			if scripts is not None and row[1] not in scripts:
+				continue
+			names.append(row[1])
+			configs.append(configuration(row[12]))
+			metrics.append(row[2:12])
+	return (np.array(names, dtype=str), np.array(configs, dtype=str), np.array(metrics, dtype=np.float64).reshape(-1, len(AV_METRICS)))
+
+#----------------------------------------------------------------------------------------------------------------------------------------------------------
+#			Re-scoring
+#----------------------------------------------------------------------------------------------------------------------------------------------------------
+def ranks(names, costs):
+	"This function accepts the script and cost of every configuration and returns the rank of each configuration among those of its script (1 is best)"
+	order=np.lexsort((costs, names))						# By script, then by cost
+	sortedNames=names[order]
+	starts=np.flatnonzero(np.r_[True, sortedNames[1:]!=sortedNames[:-1]])
+	position=np.arange(len(order))-np.repeat(starts, np.diff(np.r_[starts, len(order)]))
+	rank=np.empty(len(order), dtype=int)
+	rank[order]=position+1
+	return rank
+
+def rescore(names, configs, metrics, costFunction, previous):
+	"This function returns the Rescored_Results rows of every configuration, averaged over its runs and ranked under both cost functions, best first"
+	keys=np.char.add(np.char.add(names, "\n"), configs)
+	(groups, first, inverse)=np.unique(keys, return_index=True, return_inverse=True)
+	runs=np.bincount(inverse, minlength=len(groups))
+	costs=np.bincount(inverse, costFunction.costs(metrics))/runs
+	previousCosts=np.bincount(inverse, previous.costs(metrics))/runs
+	means=np.column_stack([np.bincount(inverse, metrics[:, k])/runs for k in range(len(AV_METRICS))]) if len(groups)>0 else np.zeros((0, len(AV_METRICS)))
+	groupNames=names[first]
+	rank=ranks(groupNames, costs)
+	previousRank=ranks(groupNames, previousCosts)
+	rows=[]
+	for g in np.lexsort((rank, groupNames)):
+		rows.append([groupNames[g], int(rank[g]), int(previousRank[g]), int(runs[g]), round(float(costs[g]),4), round(float(previousCosts[g]),4)]+[round(float(value),3) for value in means[g]]+[configs[first[g]]])
+	return rows
+
+#----------------------------------------------------------------------------------------------------------------------------------------------------------
+#			MAIN CODE EXECUTION
+#----------------------------------------------------------------------------------------------------------------------------------------------------------
+if __name__ == '__main__':
+	parser=argparse.ArgumentParser(description="Re-score and re-rank the configurations of an Av_Results archive under a new cost definition, without simulating")
+	parser.add_argument("--CostFunction", default="descent", help="cost definition to rank with: a built-in (descent or sweep), a name in Cost_Functions/ or a JSON file (default: descent)")
+	parser.add_argument("--Previous", default="descent", help="cost definition the archive was ranked with, to report rank changes against (default: descent)")
+	parser.add_argument("--Archive", default="Av_Results", help="directory of averaged result files (default: Av_Results)")
+	parser.add_argument("--Files", default="*.csv", help="pattern of the result files in the archive to re-score, e.g. \"Pareto_Front_*.csv\" in Optimal_Results (default: *.csv)")
+	parser.add_argument("--Scripts", help="comma separated list of scripts to re-score (default: every script in the archive)")
+	parser.add_argument("--Output", help="file to write every ranked configuration to (default: Optimal_Results/Rescored_Results_<CostFunction>.csv)")
+	parser.add_argument("--Top", type=int, default=5, help="configurations printed per script (default: 5)")
+	args=parser.parse_args()
+	try:
+		(name, definition)=loadDefinition(args.CostFunction)
+		costFunction=CostFunction(definition, name)
+		(previousName, previousDefinition)=loadDefinition(args.Previous)
+		previous=CostFunction(previousDefinition, previousName)
+	except ValueError as error:
+		parser.error(str(error))
+	if not os.path.isdir(args.Archive):
+		parser.error("no archive directory "+args.Archive)
+	output=args.Output or os.path.join("Optimal_Results", "Rescored_Results_"+name+".csv")
+
+	starttime=time.time()
+	(names, configs, metrics)=readArchive(args.Archive, set(args.Scripts.split(",")) if args.Scripts else None, args.Files)
+	readtime=time.time()
+	rows=rescore(names, configs, metrics, costFunction, previous)
+	if os.path.dirname(output) and not os.path.exists(os.path.dirname(output)):
+		os.makedirs(os.path.dirname(output))
+	with open(output, "w", newline="") as resultFile:
+		writer=csv.writer(resultFile)
+		writer.writerow(RESCORED_HEADER)
+		writer.writerows(rows)
+
+	for script in sorted(set(row[0] for row in rows)):
+		print("\n{} under {} (previous rank and cost under {}):".format(script, name, previousName))
+		for row in [row for row in rows if row[0]==script][:args.Top]:
+			print("  {:>4} ({:>4})  cost {:<12} ({:<12}) {} runs  {}".format(row[1], row[2], row[4], row[5], row[3], row[-1]))
+	print("\nRe-scored {} runs of {} configurations in {:.2f}s ({:.2f}s reading the archive), results in {}".format(len(metrics), len(rows), time.time()-starttime, readtime-starttime, output))
+	sys.exit(0)
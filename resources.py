@@ -0,0 +1,253 @@
+# Simulation resource management
+# Admits simulations by free memory, using the peak memory each parameter signature needed before, pins every simulation process to its own core
+# or NUMA node, and records peak RSS and CPU time per signature
+#
+# Copyright (c) 2026 ParaOptimizationNS3 contributors
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy of this software and associated documentation files (the "Software"),
+# to deal in the Software without restriction, including without limitation the rights to use, copy, modify, merge, publish, distribute, sublicense,
+# and/or sell copies of the Software, and to permit persons to whom the Software is furnished to do so, subject to the following conditions:
+# The above copyright notice and this permission notice shall be included in all copies or substantial portions of the Software.
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS
+# IN THE SOFTWARE.
+
+# Memory admission and pinning use /proc and sched_setaffinity and are skipped on systems without them (e.g. macOS), where only the usage is recorded.
+
+#import
+import glob
+import json
+import os
+import re
+import signal
+import threading
+import time
+
+PIN_MODES=["none", "core", "numa"]
+RUN_OPTION=re.compile(r"--RunNo=\S+\s*")
+
+#----------------------------------------------------------------------------------------------------------------------------------------------------------
+#			System Information
+#----------------------------------------------------------------------------------------------------------------------------------------------------------
+def memAvailable():
+	"This function returns the memory available for new processes in bytes, or None if it cannot be read"
+	try:
+		with open("/proc/meminfo") as meminfo:
+			for line in meminfo:
+				if line.startswith("MemAvailable:"):
+					return int(line.split()[1])*1024
+	except OSError:
+		pass
+	return None
+
+def processRss(pid):
+	"This function returns the resident memory of a process in bytes, or 0 if it cannot be read"
+	try:
+		with open("/proc/{}/status".format(pid)) as status:
+			for line in status:
+				if line.startswith("VmRSS:"):
+					return int(line.split()[1])*1024
+	except (OSError, ValueError):
+		pass
+	return 0
+
+def usableCpus():
+	if hasattr(os, "sched_getaffinity"):
+		return sorted(os.sched_getaffinity(0))
+	return list(range(os.cpu_count() or 1))
+
+def parseCpuList(cpuList):
+	"This function accepts a Linux cpu list such as 0-3,8-11 and returns the list of cpu numbers"
+	cpus=[]
+	for part in cpuList.strip().split(","):
+		if "-" in part:
+			(low, high)=part.split("-")
+			cpus+=range(int(low), int(high)+1)
+		elif part:
+			cpus.append(int(part))
+	return cpus
+
+def numaNodes(cpus):
+	"This function returns the usable cpus of each NUMA node, or all cpus as one node if the topology is unknown"
+	nodes=[]
+	for path in sorted(glob.glob("/sys/devices/system/node/node[0-9]*/cpulist")):
+		with open(path) as cpuList:
+			nodeCpus=[cpu for cpu in parseCpuList(cpuList.read()) if cpu in cpus]
+		if len(nodeCpus)>0:
+			nodes.append(nodeCpus)
+	return nodes if len(nodes)>0 else [cpus]
+
+def signature(scriptName, options):
+	"This function returns the parameter signature of a simulation: the script and its options without the RunNo"
+	return scriptName+" "+RUN_OPTION.sub("", options).strip()
+
+#----------------------------------------------------------------------------------------------------------------------------------------------------------
+#			Resource Manager
+#----------------------------------------------------------------------------------------------------------------------------------------------------------
+class ResourceManager:
+	"Peak RSS and CPU time per parameter signature, and the admission and pinning of simulation processes based on them"
+
+	def __init__(self, pin="none", memoryReserve=0.1, path=None):
+		if pin not in PIN_MODES:
+			raise ValueError("unknown pinning mode "+pin)
+		self.pin=pin
+		self.path=path								# Usage is loaded from and saved to this JSON file so estimates survive between runs
+		self.cpus=usableCpus()
+		self.freeCpus=list(self.cpus)
+		self.nodes=numaNodes(self.cpus)
+		self.nodeJobs=[0]*len(self.nodes)
+		available=memAvailable()
+		self.reserve=memoryReserve*available if available is not None else 0		# Memory kept free for everything else
+		self.usage={}								# Signature -> [peak RSS bytes, total cpu seconds, total wall seconds, runs]
+		self.running={}								# Job -> (memory estimate, pid)
+		self.delayed=0								# Admissions which had to wait for memory or a free core
+		self.measurements=None						# (signature, peak, cpu, wall) of each simulation since the last drain, when collected for a coordinator
+		self.assigned=None							# Cpus a coordinator admitted the job of this worker process to, used instead of pinning here
+		self.reporter=None							# Sends the pid of the simulation of this worker process to the coordinator, which admitted it
+		self.cond=threading.Condition()
+		if path is not None and os.path.exists(path):
+			with open(path) as usageFile:
+				self.usage=json.load(usageFile)
+
+	def estimate(self, sig):
+		"This function returns the expected peak RSS of a signature: its own peak, else the largest peak seen for the same script, else 0"
+		if sig in self.usage:
+			return self.usage[sig][0]
+		script=sig.split(" ", 1)[0]+" "
+		return max([usage[0] for key, usage in self.usage.items() if key.startswith(script)], default=0)
+
+	def admissible(self, estimate):
+		if self.pin=="core" and len(self.freeCpus)==0:
+			return False
+		if len(self.running)==0:
+			return True								# Never starve: one simulation always runs
+		available=memAvailable()
+		if available is None:
+			return True
+		growth=sum(max(0, jobEstimate-processRss(pid)) for (jobEstimate, pid) in self.running.values() if pid is not None)	# Memory running simulations will still take
+		growth+=sum(jobEstimate for (jobEstimate, pid) in self.running.values() if pid is None)
+		return estimate+growth<=available-self.reserve
+
+	def record(self, sig, peak, cpu, wall):
+		"This function adds the measured peak RSS, cpu seconds and wall seconds of one simulation to the usage of its signature"
+		with self.cond:
+			usage=self.usage.setdefault(sig, [0, 0.0, 0.0, 0])
+			usage[0]=max(usage[0], peak)
+			usage[1]+=cpu
+			usage[2]+=wall
+			usage[3]+=1
+			if self.measurements is not None:
+				self.measurements.append((sig, peak, cpu, wall))
+
+	def drain(self):
+		"This function returns the measurements collected since the last drain"
+		with self.cond:
+			(measurements, self.measurements)=(self.measurements or [], [])
+		return measurements
+
+	def merge(self, measurements):
+		"This function records the measurements drained from the manager of a worker process"
+		for measurement in measurements:
+			self.record(*measurement)
+
+	def job(self, scriptName, options):
+		return SimJob(self, signature(scriptName, options))
+
+	def summary(self):
+		"This function returns a one line description of the recorded usage"
+		if len(self.usage)==0:
+			return "no simulations measured"
+		peaks=[usage[0] for usage in self.usage.values()]
+		cpu=sum(usage[1] for usage in self.usage.values())
+		wall=sum(usage[2] for usage in self.usage.values())
+		return "{} signatures, peak RSS up to {:.1f} MB, {:.0f}% cpu per simulation, {} admissions delayed".format(len(self.usage), max(peaks)/2**20, 100*cpu/wall if wall>0 else 0, self.delayed)
+
+	def save(self):
+		if self.path is None:
+			return
+		with self.cond:
+			data=json.dumps(self.usage)
+		with open(self.path+".tmp", 'w') as usageFile:
+			usageFile.write(data)
+		os.replace(self.path+".tmp", self.path)
+
+class SimJob:
+	"Admission, pinning and measurement of one simulation process"
+
+	def __init__(self, manager, sig):
+		self.manager=manager
+		self.sig=sig
+		self.cpus=None
+
+	def __enter__(self):
+		manager=self.manager
+		estimate=manager.estimate(self.sig)
+		with manager.cond:
+			if not manager.admissible(estimate):
+				manager.delayed+=1
+				while not manager.admissible(estimate):
+					manager.cond.wait(0.5)						# Timeout re-reads free memory as running simulations grow and shrink
+			if manager.assigned is not None:
+				self.cpus=manager.assigned
+			elif manager.pin=="core":
+				self.cpus=[manager.freeCpus.pop(0)]
+			elif manager.pin=="numa":
+				self.node=min(range(len(manager.nodes)), key=lambda node: manager.nodeJobs[node])
+				manager.nodeJobs[self.node]+=1
+				self.cpus=manager.nodes[self.node]
+			manager.running[self]=(estimate, None)
+		self.start=time.time()
+		return self
+
+	def attached(self, pid):
+		"This function records the process of a running job, so admission counts the memory it will still take instead of its whole estimate"
+		with self.manager.cond:
+			if self in self.manager.running:
+				self.manager.running[self]=(self.manager.running[self][0], pid)
+
+	def started(self, pid):
+		"This function pins a started simulation process"
+		self.attached(pid)
+		if self.manager.reporter is not None:
+			self.manager.reporter(pid)
+		if self.cpus is not None and hasattr(os, "sched_setaffinity"):
+			try:
+				os.sched_setaffinity(pid, self.cpus)
+			except OSError:								# The process may already have exited
+				pass
+
+	def kill(self):
+		"This function kills the process group of the job's simulation if its process is known and still admitted, and returns whether a signal was sent"
+		with self.manager.cond:
+			if self not in self.manager.running:
+				return False
+			pid=self.manager.running[self][1]
+		if pid is None:											# Not started yet, or its pid is still on the way from the worker process
+			return False
+		try:
+			os.killpg(pid, signal.SIGKILL)						# Each simulation leads its own process group
+		except OSError:											# Already exited
+			return False
+		return True
+
+	def wait(self, process):
+		"This function waits for a simulation process, records its peak RSS and CPU time, and returns its exit code"
+		if not hasattr(os, "wait4"):
+			return process.wait()
+		(pid, status, rusage)=os.wait4(process.pid, 0)
+		process.returncode=os.waitstatus_to_exitcode(status)
+		peak=rusage.ru_maxrss*(1 if os.uname().sysname=="Darwin" else 1024)		# Kilobytes on Linux, bytes on macOS
+		self.manager.record(self.sig, peak, rusage.ru_utime+rusage.ru_stime, time.time()-self.start)
+		return process.returncode
+
+	def __exit__(self, *exc):
+		manager=self.manager
+		with manager.cond:
+			del manager.running[self]
+			if manager.pin=="core":
+				manager.freeCpus+=self.cpus
+			elif manager.pin=="numa":
+				manager.nodeJobs[self.node]-=1
+			manager.cond.notify_all()
+		return False
@@ -0,0 +1,162 @@
+# Columnar result store
+# Appendable, typed store of raw per-client results which replaces the per-test Raw_Results CSV files and is read back as memory mapped NumPy arrays
+#
+# Copyright (c) 2026 ParaOptimizationNS3 contributors
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy of this software and associated documentation files (the "Software"),
+# to deal in the Software without restriction, including without limitation the rights to use, copy, modify, merge, publish, distribute, sublicense,
+# and/or sell copies of the Software, and to permit persons to whom the Software is furnished to do so, subject to the following conditions:
+# The above copyright notice and this permission notice shall be included in all copies or substantial portions of the Software.
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS
+# IN THE SOFTWARE.
+
+# Layout of a store directory:
+#   schema.json         NumPy dtype of a row
+#   rows.bin            fixed size little-endian rows, appended during the run and memory mapped when reading
+#   scripts.jsonl       side table of script names, row field "script" is the line index
+#   descriptions.jsonl  side table of run descriptions, row field "desc" is the line index
+
+#import
+import json
+import os
+import threading
+
+try:
+	import numpy as np
+except ImportError:									# NumPy is only needed when the columnar store is used
+	np=None
+
+ROW_FIELDS=[("testNo","<i4"),("script","<i4"),("clientId","<i4"),("avThroughput","<f8"),("minThroughput","<f8"),("avLatency","<f8"),("maxLatency","<f8"),("packLossRate","<f8"),("generation","<i4"),("genIndex","<i4"),("desc","<i4")]
+
+#----------------------------------------------------------------------------------------------------------------------------------------------------------
+#			Columnar Store
+#----------------------------------------------------------------------------------------------------------------------------------------------------------
+class ColumnarStore:
+	"Raw result store with one fixed size binary row per client result and side tables for script names and descriptions"
+
+	def __init__(self, directory, batchRows=4096):
+		if np is None:
+			raise RuntimeError("the columnar result store requires NumPy (pip install numpy)")
+		self.directory=directory
+		self.batchRows=batchRows
+		self.dtype=np.dtype(ROW_FIELDS)
+		self.lock=threading.Lock()
+		self.pending=[]
+		os.makedirs(directory, exist_ok=True)
+		schemaPath=os.path.join(directory,"schema.json")
+		if os.path.exists(schemaPath):
+			with open(schemaPath) as schemaFile:
+				if [tuple(field) for field in json.load(schemaFile)["fields"]]!=ROW_FIELDS:
+					raise RuntimeError("{} was written with a different row schema".format(directory))
+		else:
+			with open(schemaPath, 'w') as schemaFile:
+				json.dump({"fields": ROW_FIELDS}, schemaFile)
+		rowsPath=os.path.join(directory,"rows.bin")
+		if os.path.exists(rowsPath):											# Drop a partially written trailing row left by a crash
+			size=os.path.getsize(rowsPath)
+			if size%self.dtype.itemsize:
+				os.truncate(rowsPath, size-size%self.dtype.itemsize)
+		self.rowsFile=open(rowsPath, 'ab')
+		self.scripts=SideTable(os.path.join(directory,"scripts.jsonl"))
+		self.descriptions=SideTable(os.path.join(directory,"descriptions.jsonl"))
+
+	def append(self, rows, generation=-1):
+		"This function appends runScript rows [Test No, Script, Client Id, 6 metrics, Description(, Generation Index)] of one run"
+		with self.lock:
+			for row in rows:
+				genIndex=row[9] if len(row)>9 else -1
+				self.pending.append((row[0], self.scripts.index(row[1]), row[2], row[3], row[4], row[5], row[6], row[7], generation, genIndex, self.descriptions.index(row[8])))
+			if len(self.pending)>=self.batchRows:
+				self.writePending()
+
+	def flush(self):
+		with self.lock:
+			self.writePending()
+			self.scripts.flush()
+			self.descriptions.flush()
+
+	def close(self):
+		self.flush()
+		with self.lock:
+			self.rowsFile.close()
+			self.scripts.close()
+			self.descriptions.close()
+
+	def writePending(self):
+		if len(self.pending)>0:
+			self.scripts.flush()												# Side tables reach disk before the rows referencing them
+			self.descriptions.flush()
+			self.rowsFile.write(np.array(self.pending, dtype=self.dtype).tobytes())
+			self.rowsFile.flush()
+			self.pending=[]
+
+class SideTable:
+	"Append-only table of distinct strings stored one JSON string per line, referenced from rows by line index"
+
+	def __init__(self, path):
+		(self.values, validBytes)=readSideTable(path)
+		self.ids={value: i for i, value in enumerate(self.values)}
+		self.tableFile=open(path, 'ab')
+		self.tableFile.truncate(validBytes)									# Drop a partially written trailing line left by a crash
+
+	def index(self, value):
+		if value not in self.ids:
+			self.ids[value]=len(self.values)
+			self.values.append(value)
+			self.tableFile.write((json.dumps(value)+"\n").encode("UTF-8"))
+		return self.ids[value]
+
+	def flush(self):
+		self.tableFile.flush()
+
+	def close(self):
+		self.tableFile.close()
+
+def readSideTable(path):
+	"This function returns the strings of a side table file and the number of bytes holding complete lines"
+	values=[]
+	validBytes=0
+	if os.path.exists(path):
+		with open(path, 'rb') as tableFile:
+			for line in tableFile:
+				if not line.endswith(b"\n"):
+					break
+				values.append(json.loads(line.decode("UTF-8")))
+				validBytes+=len(line)
+	return (values, validBytes)
+
+#----------------------------------------------------------------------------------------------------------------------------------------------------------
+#			Reading
+#----------------------------------------------------------------------------------------------------------------------------------------------------------
+class StoredResults:
+	"Read-only view of a columnar store. rows is a memory mapped structured array, so slices and columns (rows['avLatency']) are zero-copy"
+
+	def __init__(self, directory):
+		if np is None:
+			raise RuntimeError("reading the columnar result store requires NumPy (pip install numpy)")
+		with open(os.path.join(directory,"schema.json")) as schemaFile:
+			self.dtype=np.dtype([tuple(field) for field in json.load(schemaFile)["fields"]])
+		rowsPath=os.path.join(directory,"rows.bin")
+		count=os.path.getsize(rowsPath)//self.dtype.itemsize
+		self.rows=np.memmap(rowsPath, dtype=self.dtype, mode='r', shape=(count,)) if count>0 else np.zeros(0, dtype=self.dtype)
+		self.scripts=readSideTable(os.path.join(directory,"scripts.jsonl"))[0]
+		self.descriptions=readSideTable(os.path.join(directory,"descriptions.jsonl"))[0]
+
+	def __len__(self):
+		return len(self.rows)
+
+	def script(self, scriptName):
+		"This function returns the rows of one script (a copy, as selection by value cannot be a view)"
+		return self.rows[self.rows['script']==self.scripts.index(scriptName)]
+
+	def description(self, row):
+		return self.descriptions[row['desc']]
+
+	def csvRow(self, row):
+		"This function converts a stored row back to the Raw_Results CSV row layout"
+		csvRow=[int(row['testNo']), self.scripts[row['script']], int(row['clientId']), float(row['avThroughput']), float(row['minThroughput']), float(row['avLatency']), float(row['maxLatency']), float(row['packLossRate']), self.description(row)]
+		if row['genIndex']>=0:
+			csvRow.append(int(row['genIndex']))
+		return csvRow
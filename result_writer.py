@@ -0,0 +1,136 @@
+# Result writer
+# Queue fed writer thread which keeps result CSV files open and flushes batched rows, so the result collection loops never block on file I/O
+#
+# Copyright (c) 2026 ParaOptimizationNS3 contributors
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy of this software and associated documentation files (the "Software"),
+# to deal in the Software without restriction, including without limitation the rights to use, copy, modify, merge, publish, distribute, sublicense,
+# and/or sell copies of the Software, and to permit persons to whom the Software is furnished to do so, subject to the following conditions:
+# The above copyright notice and this permission notice shall be included in all copies or substantial portions of the Software.
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS
+# IN THE SOFTWARE.
+
+#import
+import atexit
+import collections
+import csv
+import queue
+import threading
+import time
+
+import profiling
+
+RAW_HEADER=['Test No.', 'Script Name', 'Client Id','Average Throughput (kbps)', 'Min Device Throughput (kbps)', 'Average Latency (ms)', 'Max Device Latency (ms)', 'Packet Loss Rate (%)', 'Description']
+AV_HEADER=['Test No', 'Script Name', 'Average Average Throughput (kbps)', 'Minimum Average Throughput (kbps)', 'Average Minimum Device Throughput (kbps)', 'Minimum Minimum Device Throughput (kbps)', 'Average Average Latency (ms)', 'Maximum Average Latency (ms)', 'Average Maximum Device Latency (ms)', 'Maximum Maximum Device Latency (ms)', 'Average Packet Loss Rate (%)', 'Maximum Device Packet Loss Rate (%)', 'Description']
+
+#----------------------------------------------------------------------------------------------------------------------------------------------------------
+#			Buffered Result Writer
+#----------------------------------------------------------------------------------------------------------------------------------------------------------
+class ResultWriter:
+	"Writer thread fed by a queue. Keeps up to maxOpen CSV files open and flushes them every batchRows rows or flushInterval seconds, and on close or interpreter exit"
+
+	def __init__(self, batchRows=1000, flushInterval=5.0, maxOpen=256):
+		self.batchRows=batchRows
+		self.flushInterval=flushInterval
+		self.maxOpen=maxOpen
+		self.files=collections.OrderedDict()		# path -> (file, csv writer), least recently used first
+		self.queue=queue.Queue()
+		self.error=None
+		self.closed=False
+		self.thread=threading.Thread(target=self.writeLoop, daemon=True)
+		self.thread.start()
+		atexit.register(self.close)					# Flush buffered rows even if the optimizer exits with an exception
+
+	def create(self, path, header):
+		"This function queues the creation (truncation) of a CSV file with the given header row"
+		self.put(("create", path, [header]))
+
+	def append(self, path, rows):
+		"This function queues rows to be appended to a CSV file"
+		self.put(("append", path, rows))
+
+	def flush(self):
+		"This function blocks until every queued row has been written and flushed to disk"
+		done=threading.Event()
+		self.put(("flush", done, None))
+		done.wait()
+		self.checkError()
+
+	def close(self):
+		"This function flushes all queued rows, closes every file and stops the writer thread"
+		if self.closed:
+			return
+		self.closed=True
+		atexit.unregister(self.close)
+		self.queue.put(None)
+		self.thread.join()
+		self.checkError()
+
+	def put(self, item):
+		self.checkError()
+		if self.closed:
+			raise RuntimeError("cannot write to a closed ResultWriter")
+		self.queue.put(item)
+
+	def checkError(self):
+		if self.error is not None:
+			raise self.error
+
+	def writerFor(self, path, mode):
+		"This function returns the csv writer of an open file, opening it (and closing the least recently used file if too many are open)"
+		if mode=='w' and path in self.files:
+			self.files.pop(path)[0].close()
+		if path in self.files:
+			self.files.move_to_end(path)
+			return self.files[path][1]
+		if len(self.files)>=self.maxOpen:
+			self.files.popitem(last=False)[1][0].close()
+		outputFile=open(path, mode, newline='', buffering=1<<16)
+		self.files[path]=(outputFile, csv.writer(outputFile))
+		return self.files[path][1]
+
+	def flushAll(self):
+		for (outputFile, outputWriter) in self.files.values():
+			outputFile.flush()
+
+	def writeLoop(self):
+		pendingRows=0
+		lastFlush=time.monotonic()
+		busy=0.0								# Seconds spent writing since the last flush, for the profiling trace
+		while True:
+			try:
+				item=self.queue.get(timeout=self.flushInterval)
+			except queue.Empty:
+				item=("tick", None, None)
+			if item is None:
+				break
+			(op, target, rows)=item
+			try:
+				start=time.monotonic()
+				if op=="create" or op=="append":
+					self.writerFor(target, 'w' if op=="create" else 'a').writerows(rows)
+					pendingRows+=len(rows)
+				if op=="flush" or pendingRows>=self.batchRows or time.monotonic()-lastFlush>=self.flushInterval:
+					self.flushAll()
+					lastFlush=time.monotonic()
+					if profiling.tracer is not None and (pendingRows>0 or busy>0):
+						profiling.tracer.write(pendingRows, busy+lastFlush-start)
+					pendingRows=0
+					busy=0.0
+				else:
+					busy+=time.monotonic()-start
+			except Exception as error:
+				self.error=error
+			if op=="flush":
+				target.set()
+		start=time.monotonic()
+		for (outputFile, outputWriter) in self.files.values():
+			try:
+				outputFile.close()
+			except Exception as error:
+				self.error=error
+		self.files.clear()
+		if profiling.tracer is not None and pendingRows>0:
+			profiling.tracer.write(pendingRows, busy+time.monotonic()-start)
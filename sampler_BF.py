@@ -24,213 +24,48 @@ import multiprocessing as mp
 import os
 import platform
 import random
-import re
 import string
 import subprocess
-import sys
 import time
 
-#----------------------------------------------------------------------------------------------------------------------------------------------------------
-#			Metric Cost Function 
-#----------------------------------------------------------------------------------------------------------------------------------------------------------
-def cost_func(avAvThroughput, minAvThroughput, avAvLatency, maxAvLatency, avPackLossRate):
-	"This function accepts the output metrics of the simulation and returns a cost metric for performance comparison"
-	cost=1
-	if avAvLatency>300:
-		cost+=(avAvLatency-300)
-	if avAvLatency==0:						# Give large cost to error cases
-		cost+=(10000)
-	if maxAvLatency>300:
-		cost+=(maxAvLatency-300)/100
-	if avAvThroughput<9.6:
-		cost+=(9.6-avAvThroughput)*10
-	if minAvThroughput<9.6:
-		cost+=9.6-minAvThroughput
-	if avPackLossRate>1:
-		cost+=(avPackLossRate-1)*10
-	cost=round(cost,4)
-	#print("avAvThroughput={} , maxAvLatency={} , avAvThroughput={} , minAvThroughput={} , avPackLossRate={}".format(avAvLatency,maxAvLatency,avAvThroughput,minAvThroughput,avPackLossRate))
-	return cost;
-	
+import evaluator
+import sim_exec
+import profiling
+from aggregation import RunStats
+from evaluator import ProcessPool, configOptions, runScript, runStats, scriptRandom, sweepCost, writeRaw
+from fidelity import FIDELITY_AV_HEADER, Halving, fidelityOptions
+from param_space import ParamSpace, scriptSpace
+from racing import Race
+from resources import PIN_MODES, ResourceManager
+from result_store import ColumnarStore
+from result_writer import AV_HEADER, RAW_HEADER, ResultWriter
+from sampling import MODES, loadSample
+from scheduler import POLICIES, SharedPool, parseWeights, runCampaign
+from sim_cache import SimCache
+from sim_worker import WorkerPool, parseAddresses
+
+workerPool=None								# Distributed simulation workers, connected in main when requested
+resultStore=None							# Columnar raw result store, replaces the per-test raw CSV files when enabled in main
+sharedPool=None								# Long-lived simulation pool shared by all scripts, created in main
+
 #----------------------------------------------------------------------------------------------------------------------------------------------------------
 #			Parameter and Values Generator 
 #----------------------------------------------------------------------------------------------------------------------------------------------------------
-def Get_Params_Vals(script):
-	"This function accepts the script to be simulated and returns all the tunable parameter options for the script"
-	#DataRates=[24000]
+def Get_Param_Space(script):
+	"This function accepts the script to be simulated and returns the ParamSpace of its tunable parameters, from Param_Spaces/<script>.json if present"
 	#DataRates=[16*1024,24*1024,32*1024,40*1024,48*1024,56*1024]
 	DataRates=[24000]
 	PacketSizes=[256]
 	#PacketSizes=[2048]
-	SimTimes=[120]
-	#SimTimes=[1]
-	TransferProtocols=["UDP"]
 	Topologies=['Topology_PV_penetration_40.csv']
-	
-	# CSMA Protocol-specific parameters
-	ChannelDataRates=["100Mbps","1000Mbps"]
-	ChannelMTUs=[1492,1500]
-	EncapModes=["Dix","Llc"]
-	#EncapModes=["Dix"]
-	
-	# Wimax Protocol-specific parameters
-	ModulationTypes=["BPSK_12","QPSK_12","QPSK_34","QAM16_12","QAM16_34","QAM64_23","QAM64_34"]
-	#ModulationTypes=["QAM16_34","QAM64_23","QAM64_34"]
-	Schedulers=["Simple","RTPS","MBQOS"]
-	#Schedulers=["Simple"]
-	ServiceFlowTypes=["BE","NRTPS","RTPS","UGS"]
-	#ServiceFlowTypes=["UGS"]
-	
-	# PLC Protocol-specific parameters
-	PlcLowFreqs=[0,10,100]
-	PlcHiFreqs=[10e6,50e6,10e7]
-	PlcSubBands=[100,200,300]
-	PlcHeaderMods=["BPSK_1_4","BPSK_1_2","QPSK_1_2","QAM16_1_2","QAM64_16_21","QAM16_RATELESS","QAM32_RATELESS","QAM64_RATELESS"]
-	PlcPayloadMods=["BPSK_1_4","BPSK_1_2","QPSK_1_2","QAM16_1_2","QAM64_16_21","QAM16_RATELESS","QAM32_RATELESS","QAM64_RATELESS"]
-	
-	# if script=="testbed-Lowpan-CSMA-v1":
-		# Params=["DataRate","PacketSize","SimTime","TransferProtocol","ChannelDataRate","EncapMode","ChannelMTU"]
-		# vals=[[],[],[],[],[],[],[]]
-		# for DR in DataRates:
-			# for PS in PacketSizes:
-				# for ST in SimTimes:
-					# for TP in TransferProtocols:
-						# for CDR in ChannelDataRates:
-							# for EM in EncapModes:
-								# if EM=="Dix":
-									# CMTU=1500
-								# else:
-									# CMTU=1492
-								# vals[0].append(DR)
-								# vals[1].append(PS)
-								# vals[2].append(ST)
-								# vals[3].append(TP)
-								# vals[4].append(CDR)
-								# vals[5].append(EM)
-								# vals[6].append(CMTU)
-								
-	# if script=="testbed-Lowpan-Wimax-v1":
-		# Params=["DataRate","PacketSize","SimTime","TransferProtocol","ModulationType","Scheduler","ServiceFlowType"]
-		# vals=[[],[],[],[],[],[],[]]
-		# for DR in DataRates:
-			# for PS in PacketSizes:
-				# for ST in SimTimes:
-					# for TP in TransferProtocols:
-						# for MT in ModulationTypes:
-							# for Sch in Schedulers:
-								# for SFT in ServiceFlowTypes:
-									# vals[0].append(DR)
-									# vals[1].append(PS)
-									# vals[2].append(ST)
-									# vals[3].append(TP)
-									# vals[4].append(MT)
-									# vals[5].append(Sch)
-									# vals[6].append(SFT)
-	# if script=="testbed-Lowpan-WiFi-v1":
-		# Params=["DataRate","PacketSize","SimTime","TransferProtocol"]
-		# vals=[[],[],[],[]]
-		# for DR in DataRates:
-			# for PS in PacketSizes:
-				# for ST in SimTimes:
-					# for TP in TransferProtocols:
-						# vals[0].append(DR)
-						# vals[1].append(PS)
-						# vals[2].append(ST)
-						# vals[3].append(TP)
-	# if script=="testbed-PLC-CSMA-v1":
-		# Params=["DataRate","PacketSize","SimTime","TransferProtocol","ChannelDataRate","EncapMode","ChannelMTU","PlcLowFreq","PlcHiFreq","PlcSubBands","PlcHeaderMod","PlcPayloadMod"]
-		# vals=[[],[],[],[],[],[],[],[],[],[],[],[]]
-		# for DR in DataRates:
-			# for PS in PacketSizes:
-				# for ST in SimTimes:
-					# for TP in TransferProtocols:
-						# for CDR in ChannelDataRates:
-							# for EM in EncapModes:
-								# if EM=="Dix":
-									# CMTU=1500
-								# else:
-									# CMTU=1492
-								# for PLF in PlcLowFreqs:
-									# for PHF in PlcHiFreqs:
-										# for PSB in PlcSubBands:
-											# for PHM in PlcHeaderMods:
-												# for PPM in PlcPayloadMods:
-													# vals[0].append(DR)
-													# vals[1].append(PS)
-													# vals[2].append(ST)
-													# vals[3].append(TP)
-													# vals[4].append(CDR)
-													# vals[5].append(EM)
-													# vals[6].append(CMTU)
-													# vals[7].append(PLF)
-													# vals[8].append(PHF)
-													# vals[9].append(PSB)
-													# vals[10].append(PHM)
-													# vals[11].append(PPM)
-	# if script=="testbed-PLC-Wimax-v1":
-		# Params=["DataRate","PacketSize","SimTime","TransferProtocol","ModulationType","Scheduler","ServiceFlowType","PlcLowFreq","PlcHiFreq","PlcSubBands","PlcHeaderMod","PlcPayloadMod"]
-		# vals=[[],[],[],[],[],[],[],[],[],[],[],[]]
-		# for DR in DataRates:
-			# for PS in PacketSizes:
-				# for ST in SimTimes:
-					# for TP in TransferProtocols:
-						# for MT in ModulationTypes:
-							# for Sch in Schedulers:
-								# for SFT in ServiceFlowTypes:
-									# for PLF in PlcLowFreqs:
-										# for PHF in PlcHiFreqs:
-											# for PSB in PlcSubBands:
-												# for PHM in PlcHeaderMods:
-													# for PPM in PlcPayloadMods:
-														# vals[0].append(DR)
-														# vals[1].append(PS)
-														# vals[2].append(ST)
-														# vals[3].append(TP)
-														# vals[4].append(MT)
-														# vals[5].append(Sch)
-														# vals[6].append(SFT)
-														# vals[7].append(PLF)
-														# vals[8].append(PHF)
-														# vals[9].append(PSB)
-														# vals[10].append(PHM)
-														# vals[11].append(PPM)
-	# if script=="testbed-PLC-WiFi-v1":
-		# Params=["DataRate","PacketSize","SimTime","TransferProtocol","ChannelDataRate","ChannelMTU","EncapMode","PlcLowFreq","PlcHiFreq","PlcSubBands","PlcHeaderMod","PlcPayloadMod"]
-		# vals=[[],[],[],[],[],[],[],[],[]]
-		# for DR in DataRates:
-			# for PS in PacketSizes:
-				# for ST in SimTimes:
-					# for TP in TransferProtocols:	
-						# for PLF in PlcLowFreqs:
-							# for PHF in PlcHiFreqs:
-								# for PSB in PlcSubBands:
-									# for PHM in PlcHeaderMods:
-										# for PPM in PlcPayloadMods:
-											# vals[0].append(DR)
-											# vals[1].append(PS)
-											# vals[2].append(ST)
-											# vals[3].append(TP)
-											# vals[4].append(PLF)
-											# vals[5].append(PHF)
-											# vals[6].append(PSB)
-											# vals[7].append(PHM)
-											# vals[8].append(PPM)
-	Params=["DataRate","PacketSize","Topology"]
-	vals=[[],[],[]]
-	for DR in DataRates:
-		for PS in PacketSizes:
-			for TOP in Topologies:
-				vals[0].append(DR)
-				vals[1].append(PS)
-				vals[2].append(TOP)
-						
-	return (Params, vals)
+	# Larger spaces of the protocol-specific parameters are in Param_Spaces/Examples
+	return scriptSpace(script, ParamSpace(["DataRate","PacketSize","Topology"], [DataRates, PacketSizes, Topologies]))
 #----------------------------------------------------------------------------------------------------------------------------------------------------------
 #			BRUTE FORCE OPTIMIZER
 #----------------------------------------------------------------------------------------------------------------------------------------------------------
-def brute_optimizer(scriptName,Parameters,values,outParam,maxOrMin,Runs):
-	"This function accepts a list of parameters, a 2D list of values, and a solution criteria to iterate through and find the optimal solution"
-	q=[None]*(len(values[0])*Runs)
+def brute_optimizer(scriptName,space,outParam,maxOrMin,Runs,race=None):
+	"This function accepts a ParamSpace, and a solution criteria to iterate through and find the optimal solution. With a Race, Runs is the maximum number of replicates per configuration"
+	q={}
 	p=[]
 	i=0
 	xmin=100000
@@ -240,167 +75,208 @@ def brute_optimizer(scriptName,Parameters,values,outParam,maxOrMin,Runs):
 	runNo=0
 	
 	optimalResult=[0, "ERROR", 0, 60000, 0, 60000, 0, 0, 0, 0, 0, 0, "ERROR"]
-	with open("Raw_Results/Raw_Results_"+scriptName+".csv", 'w', newline='') as outputFile:		# Create Output CSV file in which to store raw results of all simulations for this script
-		outputWriter = csv.writer(outputFile)
-		outputWriter.writerow(['Test No.', 'Script Name', 'Client Id','Average Throughput (kbps)', 'Min Device Throughput (kbps)', 'Average Latency (ms)', 'Max Device Latency (ms)', 'Packet Loss Rate (%)', 'Description'])
+	cacheStart=evaluator.simCache.stats() if evaluator.simCache is not None else (0,0)
+	writer=ResultWriter()								# Buffered writer thread for all result files of this optimization
+	if resultStore is None:
+		writer.create("Raw_Results/Raw_Results_"+scriptName+".csv", RAW_HEADER)		# Create Output CSV file in which to store raw results of all simulations for this script
 	
 	print("Running {} Parallely using {} threads".format(scriptName,mp.cpu_count()))	# Terminal Message for visibility of execution	
-	with concurrent.futures.ThreadPoolExecutor(mp.cpu_count()) as executor:			# Paralell execution using as many threads as available cpu cores
-		for i in range(len(values[0])):
-			options=""
-			comment=""
-			for j in range(len(Parameters)):							# Build options string from parameters
-				options+="--{}={} ".format(Parameters[j],values[j][i])
-				if j==0:									# Build comments string from parameters
-					comment+="Simulated with {} = {}".format(Parameters[j],values[j][i])
-				else:
-					comment+=", {} = {}".format(Parameters[j],values[j][i])
-			for j in range(Runs):
-				q[runNo]=executor.submit(runScript,i+1,scriptName,options+"--RunNo={} ".format(runNo+1),comment+", and RunNo = {}".format(runNo+1))
-				runNo+=1
+	window=2*simSlots()									# Runs kept in flight, so memory use does not depend on the size of the space
+	phaseStart=time.time()
+	with simExecutor() as executor:			# Parallel execution using as many threads as available cpu cores, or the distributed workers
+		configs=iter(range(len(space)))				# Indices of the configurations not started yet
+		options={}									# State of the configurations with replicates running, dropped when they complete
+		comment={}
+		submitted={}			# Replicates submitted per configuration
+		outstanding={}			# Replicates of the current batch still running
+		sums={}					# Averaged metrics summed over the replicates of each raced configuration
+		optimum=None			# Race mean of the optimal configuration
+		while True:
+			while len(q)<window:
+				i=next(configs, None)
+				if i is None:
+					break
+				config=space[i]
+				(options[i], comment[i])=configOptions(space.Parameters, config)
+				submitted[i]=0
+				batch=Runs if race is None else race.nextBatch(i)
+				for j in range(batch):
+					runNo=i*Runs+submitted[i]				# RunNo of a replicate does not depend on how many replicates other configurations get
+					q[executor.submit(runScript,i+1,scriptName,options[i]+"--RunNo={} ".format(runNo+1),comment[i]+", and RunNo = {}".format(runNo+1))]=i
+					submitted[i]+=1
+				outstanding[i]=batch
+
+			if len(q)==0:
+				break
+			(done, running)=concurrent.futures.wait(q, return_when=concurrent.futures.FIRST_COMPLETED)
+			for future in done:
+				i=q.pop(future)
+				output=future.result()
+				if(len(output)==0):
+					print("Bad Output!!!!!!! Due to either malformed/unexpected output or error in parsing. Output is:"+str(output))
+				stats=runStats(output)								# Aggregate the per-client results of this run
+				testNo=stats.testNo
+				scriptName=stats.scriptName
+				writeRaw(writer, resultStore, "Raw_Results/Raw_Results_"+scriptName+".csv", RAW_HEADER, output)
+				(avAvThroughput, minAvThroughput, avMinThroughput, minMinThroughput, avAvLatency, maxAvLatency, avMaxLatency, maxMaxLatency, avPackLossRate, maxPackLossRate)=stats.averagedMetrics()
+				desc_unedited=output[-1][8]
+				desc=desc_unedited.split(', and RunNo')[0]			# Delete RunNo trailer from result description string
 		
-		for future in concurrent.futures.as_completed(q):		
-			output=future.result()
-			avCount=0
-			avAvThroughput=0
-			minAvThroughput=60000
-			avMinThroughput=0
-			minMinThroughput=60000
-			avAvLatency=0
-			maxAvLatency=0
-			avMaxLatency=0
-			maxMaxLatency=0
-			avPackLossRate=0
-			maxPackLossRate=0
-			if(len(output)==0):
-				print("Bad Output!!!!!!! Due to either malformed/unexpected output or error in parsing. Output is:"+str(output))
-			for result in output:		# Read and process Results from output queue as long as results are available
-				avCount+=1;
-				if(avCount==1):
-					testNo=result[0]
-					scriptName=result[1]
-					with open("Raw_Results/Raw_Results_"+scriptName+"_Test_"+str(testNo)+".csv", 'w', newline='') as outputFile:		# Create Output CSV file in which to store raw results of this simulation
-						outputWriter = csv.writer(outputFile)
-						outputWriter.writerow(['Test No.', 'Script Name', 'Client Id','Average Throughput (kbps)', 'Min Device Throughput (kbps)', 'Average Latency (ms)', 'Max Device Latency (ms)', 'Packet Loss Rate (%)', 'Description'])
-						outputWriter.writerow(result)	
-					with open("Raw_Results/Raw_Results_"+scriptName+".csv", 'a', newline='') as outputFile:		# Write results to csv file
-						outputWriter = csv.writer(outputFile)
-						outputWriter.writerow(result)
-				else:
-					with open("Raw_Results/Raw_Results_"+scriptName+"_Test_"+str(testNo)+".csv", 'a', newline='') as outputFile:
-						outputWriter = csv.writer(outputFile)
-						outputWriter.writerow(result)	
-					with open("Raw_Results/Raw_Results_"+scriptName+".csv", 'a', newline='') as outputFile:
-						outputWriter = csv.writer(outputFile)
-						outputWriter.writerow(result)
-				if(result[3]>0):
-					avAvThroughput=round((avAvThroughput*(avCount-1)+result[3])/avCount,3);
-					if(result[3]<minAvThroughput):
-						minAvThroughput=result[3]
-					avMinThroughput=round((avMinThroughput*(avCount-1)+result[4])/avCount,3);
-					if(result[4]<minMinThroughput):
-						minMinThroughput=result[4]
-					avAvLatency=round((avAvLatency*(avCount-1)+result[5])/avCount,3);
-					if(result[5]>maxAvLatency):
-						maxAvLatency=result[5]
-					avMaxLatency=round((avMaxLatency*(avCount-1)+result[6])/avCount,3);
-					if(result[6]>maxMaxLatency):
-						maxMaxLatency=result[6]
-					avPackLossRate=round((avPackLossRate*(avCount-1)+result[7])/avCount,3);
-					if(result[7]>maxPackLossRate):
-						maxPackLossRate=result[7]
-					
-				if ", and RunNo" in result[8]:
-					desc=result[8].split(', and RunNo')[0]			# Delete RunNo trailer from successful result description string
-					desc_unedited=result[8]
-			
-			with open("Av_Results/Averaged_Results_"+scriptName+".csv", 'a', newline='') as outputFile:		# Create Output CSV file in which to store averaged results of the simulation for this script
-				outputWriter = csv.writer(outputFile)
-				outputWriter.writerow([testNo, scriptName, avAvThroughput, minAvThroughput, avMinThroughput, minMinThroughput, avAvLatency, maxAvLatency, avMaxLatency, maxMaxLatency, avPackLossRate, maxPackLossRate, desc_unedited])		
-			
-			if outParam=="Average Throughput":
-				x=avAvThroughput
-			if outParam=="Min Throughput":
-				x=avMinThroughput
-			
-			if outParam=="Average Latency":
-				x=avAvLatency
-			if outParam=="Max Latency":
-				x=avMaxLatency
-				
-			if outParam=="Average Packet Loss Rate":
-				x=avPackLossRate
-			if outParam=="Max Packet Loss Rate":
-				x=maxPackLossRate
-			if outParam=="Cost":
-				x=cost_func(avAvThroughput, minAvThroughput, avAvLatency, maxAvLatency, avPackLossRate)
-				
-			if maxOrMin=="Maximize":						# Determine optimal result
-				if x>xmax:
-					optimalResult=[testNo, scriptName, avAvThroughput, minAvThroughput, avMinThroughput, minMinThroughput, avAvLatency, maxAvLatency, avMaxLatency, maxMaxLatency, avPackLossRate, maxPackLossRate, desc]
-					xmax=x				
-			if maxOrMin=="Minimize":
-				if x<xmin and x>0:
-					optimalResult=[testNo, scriptName, avAvThroughput, minAvThroughput, avMinThroughput, minMinThroughput, avAvLatency, maxAvLatency, avMaxLatency, maxMaxLatency, avPackLossRate, maxPackLossRate, desc]
-					xmin=x
+				writer.append("Av_Results/Averaged_Results_"+scriptName+".csv", [stats.averagedRow(desc_unedited)])		# Store averaged results of the simulation for this script
 		
+				x=objective(outParam, stats)
+			
+				if race is None and maxOrMin=="Maximize":		# Determine optimal result
+					if x>xmax:
+						optimalResult=[testNo, scriptName, avAvThroughput, minAvThroughput, avMinThroughput, minMinThroughput, avAvLatency, maxAvLatency, avMaxLatency, maxMaxLatency, avPackLossRate, maxPackLossRate, desc]
+						xmax=x				
+				if race is None and maxOrMin=="Minimize":
+					if x<xmin and x>0:
+						optimalResult=[testNo, scriptName, avAvThroughput, minAvThroughput, avMinThroughput, minMinThroughput, avAvLatency, maxAvLatency, avMaxLatency, maxMaxLatency, avPackLossRate, maxPackLossRate, desc]
+						xmin=x
+				outstanding[i]-=1
+				if race is not None:
+					race.add(i, x)						# Objective of this replicate
+					sums[i]=[total+value for (total, value) in zip(sums.get(i, [0]*10), stats.averagedMetrics())]
+					if outstanding[i]==0:						# Batch complete, replicate again unless the configuration is precise enough or dominated
+						batch=race.nextBatch(i)
+						for j in range(batch):
+							runNo=i*Runs+submitted[i]
+							q[executor.submit(runScript,i+1,scriptName,options[i]+"--RunNo={} ".format(runNo+1),comment[i]+", and RunNo = {}".format(runNo+1))]=i
+							submitted[i]+=1
+						outstanding[i]=batch
+						if batch==0 and race.stopped[i]!="dominated":	# Optimal result by the final mean over all replicates of the surviving configurations
+							(mean, halfWidth)=race.interval(i)
+							if (maxOrMin=="Maximize" or mean>0) and (optimum is None or (mean>optimum if maxOrMin=="Maximize" else mean<optimum)):
+								optimalResult=[testNo, scriptName]+[round(total/race.samples[i][0],3) for total in sums[i]]+[desc]
+								optimum=mean
+				if outstanding[i]==0:
+					del options[i], comment[i], submitted[i], outstanding[i]
+					sums.pop(i, None)
+	profiling.phase("sweep", scriptName, phaseStart, configurations=len(space))
+	
+	writer.close()										# Flush remaining buffered rows
+	if resultStore is not None:
+		resultStore.flush()
+	if evaluator.simCache is not None:
+		(hits, misses)=evaluator.simCache.stats()
+		print("\nSimulation cache for {}: {} hits, {} misses".format(script,hits-cacheStart[0],misses-cacheStart[1]))
+	if race is not None:
+		reasons=race.summary()
+		print("Racing for {}: {} of {} runs simulated ({} configurations dominated, {} precise, {} at the replicate limit)".format(script,race.runs(),Runs*len(space),reasons.get("dominated",0),reasons.get("precise",0),reasons.get("budget",0)))
+	if optimum is not None:
+		x=optimum
 	return (optimalResult, x);								# Return optimal result
 #----------------------------------------------------------------------------------------------------------------------------------------------------------
-#			SCRIPT EXECUTION FUNCTION
-#----------------------------------------------------------------------------------------------------------------------------------------------------------	
-def runScript(rowNo, scriptName, options, comment):
-	"This function runs the input script file and stores it in the corresponding row of the csv"
-	# initialize dictionaries
-	totalBytes_Tx={}
-	totalBytes_Rx={}
-	avLatency={}
-	maxLatency={}
-	avThroughput={}
-	minThroughput={}
-	desc=""
-	sys.stdout.write("\rRunning Case: row no {}\r".format(rowNo))
-	sys.stdout.flush()	
-	result=[]
-	try:		#Run ./waf command to obtain output
-		cmd=subprocess.check_output(['./waf --run \"{} {}\"'.format("scratch/"+scriptName,options)], shell=True, stderr=subprocess.STDOUT)
-	except Exception as error:
-		desc+="[ERROR] - "+str(error)+"\n[COMMENT] - "+comment 			# Concatenate Error message to comment
-		result.append([rowNo, scriptName, 60000, 0, 60000, 0, 0, 0, desc]) # To observe error message in output, a dummy client 60000 is used
-	else:
-		output=cmd.decode("UTF-8").splitlines()						#parse output
-		for line in output:
-			match = re.search(r'\[DESC\] - (.*)', line)				# Capture script description string
-			if match:
-				desc=match.group(1)
-			
-			match = re.search(r'Client (\d*) Sent (\d*) Packets of total size (\d*) bytes', line)	# Capture reported Client Tx Information
-			if match:
-				if(float(match.group(1))>0):								# Ignore errored values
-					totalBytes_Tx['{}'.format(match.group(1))]=match.group(3)
-			
-			match = re.search(r'Server received (\d*) bytes across \d* packets, from Client (\d*), Average Latency: (\d+\.?\d*)+ms, Average Throughput: (\d+\.?\d*)+kbps, Max Latency: (\d+\.?\d*)+ms, Min Throughput: (\d+\.?\d*)+kbps', line)		# Capture reported Server Rx information
-			if match:
-				if(float(match.group(2))>0):				
-					totalBytes_Rx['{}'.format(match.group(2))]=match.group(1)
-					avLatency['{}'.format(match.group(2))]=match.group(3)
-					avThroughput['{}'.format(match.group(2))]=match.group(4)
-					maxLatency['{}'.format(match.group(2))]=match.group(5)
-					minThroughput['{}'.format(match.group(2))]=match.group(6)	
+#			MULTI-FIDELITY OPTIMIZER (Successive halving and Hyperband over SimTime)
+#----------------------------------------------------------------------------------------------------------------------------------------------------------
+def halving_optimizer(scriptName,space,outParam,maxOrMin,halving,hyperband=False):
+	"This function accepts a ParamSpace, a solution criteria and a Halving, and returns the optimal configuration among those promoted to full fidelity. Without hyperband every configuration starts at the shortest SimTime, with it each Hyperband bracket draws its own random configurations"
+	cacheStart=evaluator.simCache.stats() if evaluator.simCache is not None else (0,0)
+	writer=ResultWriter()								# Buffered writer thread for all result files of this optimization
+	writer.create("Av_Results/Halving_Results_"+scriptName+".csv", FIDELITY_AV_HEADER)		# Averaged results of every run with its fidelity
+	if resultStore is None:
+		writer.create("Raw_Results/Raw_Results_"+scriptName+".csv", RAW_HEADER)		# Create Output CSV file in which to store raw results of all simulations for this script
+	sign=-1 if maxOrMin=="Maximize" else 1				# Candidates are ranked by sign*objective, lowest first
+	optimalResult=[0, "ERROR", 0, 60000, 0, 60000, 0, 0, 0, 0, 0, 0, "ERROR"]
+	optimum=None
+	simulated=[0]*len(halving.rungs)
+	brackets=halving.brackets() if hyperband else [(len(space), 0)]
+	rng=scriptRandom(scriptName)						# Generator of this script, so scripts optimized in parallel draw the same brackets whichever starts first
+	print("Running {} successive halving over SimTimes {} using {} simulation slots".format(scriptName,[rung[0] for rung in halving.rungs],simSlots()))	# Terminal Message for visibility of execution
+	with simExecutor() as executor:			# Parallel execution using as many threads as available cpu cores, or the distributed workers
+		for (count, first) in brackets:
+			if hyperband:
+				configs=rng.sample(range(len(space)), min(count, len(space)))
+			else:
+				configs=range(len(space))
+			for rung in range(first, len(halving.rungs)):
+				(simTime, runs)=halving.rungs[rung]
+				phaseStart=time.time()
+				results={}									# Configuration index -> [sum of objective values, client rows of all runs at full fidelity]
+				fullFidelity=rung==len(halving.rungs)-1
+				pending=((i, j) for i in configs for j in range(runs))	# Runs of this rung, generated as they are submitted
+				q={}
+				while True:
+					while len(q)<2*simSlots():				# Runs kept in flight
+						job=next(pending, None)
+						if job is None:
+							break
+						(i, j)=job
+						(options, comment)=fidelityOptions(space.Parameters, space[i], simTime)
+						q[executor.submit(runScript,i+1,scriptName,options+"--RunNo={} ".format(j+1),comment+", and RunNo = {}".format(j+1))]=i	# Replicate j uses RunNo j+1 at every rung
+					if len(q)==0:
+						break
+					(done, running)=concurrent.futures.wait(q, return_when=concurrent.futures.FIRST_COMPLETED)
+					for future in done:
+						i=q.pop(future)
+						output=future.result()
+						if(len(output)==0):
+							print("Bad Output!!!!!!! Due to either malformed/unexpected output or error in parsing. Output is:"+str(output))
+						stats=runStats(output)								# Aggregate the per-client results of this run
+						writeRaw(writer, resultStore, "Raw_Results/Raw_Results_"+scriptName+".csv", RAW_HEADER, output)
+						writer.append("Av_Results/Halving_Results_"+scriptName+".csv", [stats.averagedRow(output[-1][8])+[simTime, runs, rung]])
+						result=results.setdefault(i, [0.0, []])
+						result[0]+=objective(outParam, stats)
+						if fullFidelity:								# Screening rungs only need the objective sums
+							result[1]+=output
+						simulated[rung]+=1
+				if fullFidelity:
+					for i in results:
+						x=results[i][0]/runs
+						if optimum is None or sign*x<sign*optimum:
+							desc=results[i][1][-1][8].split(', and RunNo')[0]			# Delete RunNo trailer from result description string
+							optimalResult=RunStats(results[i][1]).averagedRow(desc)
+							optimum=round(x,4)
+				else:
+					configs=halving.promote({i: sign*results[i][0]/runs for i in results}, halving.keep(len(results)))
+				profiling.phase("rung", scriptName, phaseStart, rung=rung, simTime=simTime, configurations=len(results))
+	writer.close()										# Flush remaining buffered rows
+	if resultStore is not None:
+		resultStore.flush()
+	if evaluator.simCache is not None:
+		(hits, misses)=evaluator.simCache.stats()
+		print("\nSimulation cache for {}: {} hits, {} misses".format(scriptName,hits-cacheStart[0],misses-cacheStart[1]))
+	print("Successive halving for {}: runs per rung {}".format(scriptName,", ".join("{} at SimTime {}".format(simulated[rung], halving.rungs[rung][0]) for rung in range(len(halving.rungs)))))
+	return (optimalResult, optimum)
+def objective(outParam, stats):
+	"This function accepts the name of the solution criteria and the RunStats of a run and returns the value of the criteria"
+	(avAvThroughput, minAvThroughput, avMinThroughput, minMinThroughput, avAvLatency, maxAvLatency, avMaxLatency, maxMaxLatency, avPackLossRate, maxPackLossRate)=stats.averagedMetrics()
+	if outParam=="Average Throughput":
+		x=avAvThroughput
+	if outParam=="Min Throughput":
+		x=avMinThroughput
 
-		# concatenate comment to description if present
-		desc+=" - "+comment
+	if outParam=="Average Latency":
+		x=avAvLatency
+	if outParam=="Max Latency":
+		x=avMaxLatency
 
-		# calculate max packet loss
-		for dict_key in totalBytes_Rx.keys():
-			Tx_Bytes=int(totalBytes_Tx[dict_key])	
-			Rx_Bytes=int(totalBytes_Rx[dict_key])
-			packLossRate=round((1.0-(Rx_Bytes/Tx_Bytes))*100,3)
-			if packLossRate<0:
-				packLossRate=-1*packLossRate
-			result.append([rowNo, scriptName, int(dict_key), float(avThroughput[dict_key]), float(minThroughput[dict_key]), float(avLatency[dict_key]), float(maxLatency[dict_key]), packLossRate, desc])			#write output to queue
-	if(len(result)==0):
-		result.append([rowNo, scriptName, 60000, 0, 60000, 0, 0, 0, "FAILED COMMAND: ./waf --run \"{} {}\"".format("scratch/"+scriptName,options)])
-	return result
+	if outParam=="Average Packet Loss Rate":
+		x=avPackLossRate
+	if outParam=="Max Packet Loss Rate":
+		x=maxPackLossRate
+	if outParam=="Cost":
+		x=sweepCost.run(stats)
+	return x
+#----------------------------------------------------------------------------------------------------------------------------------------------------------
+#			Simulation Executor
+#----------------------------------------------------------------------------------------------------------------------------------------------------------
+def simExecutor():
+	"This function returns the executor simulations are submitted to: the shared pool client of the script being optimized, the distributed worker pool if one is configured, otherwise one thread per cpu core"
+	if sharedPool is not None:
+		return sharedPool.client()
+	if workerPool is not None:
+		return workerPool
+	return concurrent.futures.ThreadPoolExecutor(mp.cpu_count())
+
+def simSlots():
+	"This function returns the number of simulations the executor runs at once"
+	if sharedPool is not None:
+		return sharedPool.slots()
+	if workerPool is not None:
+		return max(1, workerPool.slots())
+	return mp.cpu_count()
 #----------------------------------------------------------------------------------------------------------------------------------------------------------
 #			MAIN CODE EXECUTION (with performance measurement)
 #----------------------------------------------------------------------------------------------------------------------------------------------------------
@@ -409,10 +285,65 @@ if __name__ == '__main__':
 	if platform.system() == "Linux":
 		os.system("taskset -c -p 0-{} {}".format(mp.cpu_count(),os.getpid()))			# Change task affinity so all cores are used [LINUX specific]
 
+	parser=argparse.ArgumentParser(description="Brute force parameter sweep of ns-3 testbed scripts")
+	parser.add_argument("--Cache", default="Sim_Cache.db", help="simulation result cache database (default: Sim_Cache.db)")
+	parser.add_argument("--NoCache", action="store_true", help="always run the simulator instead of reusing cached results")
+	parser.add_argument("--UseWaf", action="store_true", help="run every simulation through ./waf --run instead of the compiled scratch program")
+	parser.add_argument("--Workers", help="comma separated host:port list of sim_worker.py daemons to run simulations on")
+	parser.add_argument("--Columnar", metavar="DIR", help="store raw results in a columnar store in DIR instead of per-test CSV files (requires NumPy)")
+	parser.add_argument("--Racing", action="store_true", help="replicate each configuration in batches until its cost is precise or it is dominated, instead of a fixed number of runs")
+	parser.add_argument("--RaceBatch", type=int, default=10, help="replicates per racing batch (default: 10)")
+	parser.add_argument("--RaceTolerance", type=float, default=0.01, help="stop replicating once the 95%% confidence interval half width is within this fraction of the mean (default: 0.01)")
+	parser.add_argument("--Sample", choices=["factorial"]+MODES, default="factorial", help="simulate every configuration (factorial, the default) or a fixed budget Latin hypercube (lhs), scrambled Sobol (sobol) or uniformly random (random) sample of them")
+	parser.add_argument("--Samples", type=int, default=100, help="configurations per script in a sample; a sample recorded in Samples/ with the same mode and seed is extended (default: 100)")
+	parser.add_argument("--Seed", type=int, default=0, help="seed of the sample and of the Hyperband brackets (default: 0)")
+	parser.add_argument("--Halving", action="store_true", help="successive halving: simulate every configuration at the shortest SimTime and promote the best 1/Eta to each longer SimTime")
+	parser.add_argument("--Hyperband", action="store_true", help="Hyperband: successive halving brackets of random configurations starting at each SimTime")
+	parser.add_argument("--MinSimTime", type=float, default=10, help="shortest SimTime of successive halving in seconds (default: 10)")
+	parser.add_argument("--MaxSimTime", type=float, default=120, help="full fidelity SimTime in seconds (default: 120)")
+	parser.add_argument("--Eta", type=int, default=3, help="SimTime and replicate growth per rung, 1/Eta of the configurations are promoted (default: 3)")
+	parser.add_argument("--HalvingRuns", type=int, default=4, help="replicates per configuration at full fidelity (default: 4)")
+	parser.add_argument("--Campaign", action="store_true", help="optimize all scripts at once in one shared simulation pool")
+	parser.add_argument("--Policy", choices=POLICIES, default="fair", help="how free simulation slots are shared between scripts: fewest running simulations per unit weight (fair) or highest weight first (priority) (default: fair)")
+	parser.add_argument("--Weights", type=parseWeights, default={}, help="comma separated script=weight list for the scheduling policy (default weight: 1)")
+	parser.add_argument("--Pin", choices=PIN_MODES, default="none", help="pin each simulation process to its own core (core) or to the least loaded NUMA node (numa) (default: none)")
+	parser.add_argument("--MemoryReserve", type=float, default=0.1, help="fraction of the memory free at start which simulations are not admitted into (default: 0.1)")
+	parser.add_argument("--Timeout", type=float, help="kill simulations running longer than this many wall clock seconds per simulated second (default: no timeout)")
+	parser.add_argument("--MinTimeout", type=float, default=60, help="shortest simulation timeout in seconds (default: 60)")
+	parser.add_argument("--DefaultSimTime", type=float, default=120, help="SimTime in seconds of scripts run without a --SimTime option, for the timeout (default: 120)")
+	parser.add_argument("--Threads", action="store_true", help="run simulations from threads of this process instead of warm worker processes")
+	parser.add_argument("--Trace", metavar="FILE", help="write a JSONL profiling trace of every simulation job and optimizer phase to FILE and print a throughput summary")
+	parser.add_argument("--ResourceUsage", default="Resource_Usage.json", help="file of the peak memory and CPU time recorded per parameter signature, used to admit simulations by free memory (default: Resource_Usage.json)")
+	parser.add_argument("--CostFunction", default="sweep", help="cost definition to score configurations with: a built-in (descent or sweep), a name in Cost_Functions/ or a JSON file (default: sweep)")
+	args=parser.parse_args()
+	try:
+		sweepCost.load(args.CostFunction)
+	except ValueError as error:
+		parser.error(str(error))
+	random.seed(args.Seed)								# Each script's generator is seeded from this, see scriptRandom
+	sim_exec.useWaf=args.UseWaf
+	sim_exec.resources=ResourceManager(args.Pin, args.MemoryReserve, args.ResourceUsage)
+	sim_exec.timeoutFactor=args.Timeout
+	sim_exec.minTimeout=args.MinTimeout
+	sim_exec.defaultSimTime=args.DefaultSimTime
+	if args.Trace:
+		profiling.tracer=profiling.Tracer(args.Trace)
+	if args.Workers:
+		workerPool=WorkerPool(parseAddresses(args.Workers))
+	if args.Columnar:
+		resultStore=ColumnarStore(args.Columnar)
+	if not args.NoCache:
+		evaluator.simCache=SimCache(args.Cache)
+	processPool=None
+	if workerPool is None and not args.Threads:
+		processPool=ProcessPool(mp.cpu_count())			# Warm worker processes, started with the settings in place at the first simulation
+	sharedPool=SharedPool(mp.cpu_count(), workerPool or processPool, args.Policy, args.Weights)	# One pool for every script
+
 	print("Test automation script by Adarsh Hasandka (NREL)\n")
 	starttime=time.time()
 	mode="Brute_Force"
 	variable="Cost"
+	maxOrMin="Minimize"
 	optimum_results=[]
 
 	if not os.path.exists('Av_Results'):
@@ -426,22 +357,44 @@ if __name__ == '__main__':
 
 	#scripts=["testbed-Lowpan-Wimax-v1","testbed-BPLC-Wimax-v1"]
 	scripts=["testbed-Lowpan-CSMA-v1","testbed-BPLC-CSMA-v1","testbed-Lowpan-Wimax-v1","testbed-BPLC-Wimax-v1","testbed-NPLC-Wimax-v1","testbed-NPLC-CSMA-v1","testbed-BPLC-WiFi-v1","testbed-NPLC-WiFi-v1","testbed-Lowpan-WiFi-v1"]
-	for script in scripts:
+	sim_exec.resolvePrograms(scripts)					# Locate compiled scratch programs once so each run skips waf
+	def optimizeScript(script):
+		"This function runs the selected optimizer on one script and returns its optimal result"
 		with open("Av_Results/Averaged_Results_"+script+".csv", 'w', newline='') as outputFile:		# Create Output CSV file in which to store raw results of all simulations for this script
 			outputWriter = csv.writer(outputFile)
-			outputWriter.writerow(['Test No', 'Script Name', 'Average Average Throughput (kbps)', 'Minimum Average Throughput (kbps)', 'Average Minimum Device Throughput (kbps)', 'Minimum Minimum Device Throughput (kbps)', 'Average Average Latency (ms)', 'Maximum Average Latency (ms)', 'Average Maximum Device Latency (ms)', 'Maximum Maximum Device Latency (ms)', 'Average Packet Loss Rate (%)', 'Maximum Device Packet Loss Rate (%)', 'Description'])
-		(Parameters, values)=Get_Params_Vals(script)		
-		(optimalResult, cost)=brute_optimizer(script,Parameters,values,variable,"Minimize",1000)
-		optimum_results.append(optimalResult) 
+			outputWriter.writerow(AV_HEADER)
+		space=Get_Param_Space(script)
+		if args.Sample!="factorial":
+			space=loadSample(script, space, args.Sample, args.Samples, args.Seed)
+			print("Sampling {} of {} configurations of {} ({} stages)".format(len(space), len(space.space), script, len(space.stages)))
+		if args.Halving or args.Hyperband:
+			(optimalResult, cost)=halving_optimizer(script,space,variable,maxOrMin,Halving(args.MinSimTime, args.MaxSimTime, args.Eta, args.HalvingRuns),args.Hyperband)
+		else:
+			race=Race(maxOrMin=="Maximize", args.RaceBatch, 1000, args.RaceTolerance) if args.Racing else None
+			(optimalResult, cost)=brute_optimizer(script,space,variable,maxOrMin,1000,race)
 		print("\nOptimal Result occurs at: \nTest No.\t\t\t\t:\t{}\nScript Name\t\t\t\t:\t{}\nAverage Average Throughput (kbps)\t:\t{}\nMinimum Average Throughput (kbps)\t:\t{}\nAverage Minimum Device Throughput (kbps):\t{}\nMinimum Minimum Device Throughput (kbps):\t{}\nAverage Average Latency (ms)\t\t:\t{}\nMaximum Average Latency (ms)\t\t:\t{}\nAverage Maximum Device Latency (ms)\t:\t{}\nMaximum Maximum Device Latency (ms)\t:\t{}\nAverage Packet Loss Rate\t\t:\t{}\nMaximum Device Packet Loss Rate\t\t:\t{}\nDescription\t\t\t\t:\t{}\nPerformance Metric Cost\t\t\t:\t{}\n".format(optimalResult[0],optimalResult[1],optimalResult[2],optimalResult[3],optimalResult[4],optimalResult[5],optimalResult[6],optimalResult[7],optimalResult[8],optimalResult[9],optimalResult[10],optimalResult[11],optimalResult[12],cost))
+		return optimalResult
+	if args.Campaign:
+		optimum_results=runCampaign(sharedPool, scripts, optimizeScript)	# All scripts at once, sharing the pool under the scheduling policy
+	else:
+		for script in scripts:
+			sharedPool.bind(script)
+			optimum_results.append(optimizeScript(script))
 	
 	with open('Optimal_Simulation_Results.csv', 'w', newline='') as outputFile:		# Create Output CSV file in which to store overall results of simulation
 		outputWriter = csv.writer(outputFile)
-		outputWriter.writerow(['Test No', 'Script Name', 'Average Average Throughput (kbps)', 'Minimum Average Throughput (kbps)', 'Average Minimum Device Throughput (kbps)', 'Minimum Minimum Device Throughput (kbps)', 'Average Average Latency (ms)', 'Maximum Average Latency (ms)', 'Average Maximum Device Latency (ms)', 'Maximum Maximum Device Latency (ms)', 'Average Packet Loss Rate (%)', 'Maximum Device Packet Loss Rate (%)', 'Description'])
-
-	for optResult in optimum_results:
-		with open('Optimal_Simulation_Results.csv', 'a', newline='') as outputFile:		# Create Output CSV file in which to store overall results of simulations
-			outputWriter = csv.writer(outputFile)
-			outputWriter.writerow(optResult)
+		outputWriter.writerow(AV_HEADER)
+		outputWriter.writerows(optimum_results)
+	sharedPool.shutdown()
+	if processPool is not None:
+		processPool.shutdown()
+	sim_exec.resources.save()
+	print("Resource usage: "+sim_exec.resources.summary())
+	if profiling.tracer is not None:
+		print(profiling.tracer.close(sharedPool.slots()))
+	if workerPool is not None:
+		workerPool.shutdown()
+	if resultStore is not None:
+		resultStore.close()
 	endtime=time.time()
 	print("\ntotal execution time: {} seconds\n".format(float(endtime)-float(starttime)))
@@ -0,0 +1,196 @@
+# Space-filling sampling
+# Fixed budget samples of a parameter space (Latin hypercube, scrambled Sobol or uniformly random) which are deterministic for a seed and can be
+# extended without changing the points already sampled
+#
+# Copyright (c) 2026 ParaOptimizationNS3 contributors
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy of this software and associated documentation files (the "Software"),
+# to deal in the Software without restriction, including without limitation the rights to use, copy, modify, merge, publish, distribute, sublicense,
+# and/or sell copies of the Software, and to permit persons to whom the Software is furnished to do so, subject to the following conditions:
+# The above copyright notice and this permission notice shall be included in all copies or substantial portions of the Software.
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS
+# IN THE SOFTWARE.
+
+# Points are drawn in the unit hypercube, one dimension per free parameter, and coordinate u of a parameter with n values selects value floor(u*n).
+# A sample grows in stages. Sobol and random points depend only on their index, a Latin hypercube stage places its points in the strata of the
+# enlarged sample which the earlier stages left empty. With few values per parameter many points select the same configuration, so a sample keeps
+# one point per configuration and draws more points in place of the duplicates, which keeps the configurations of earlier stages when it grows.
+
+#import
+import json
+import os
+import random
+
+MODES=["lhs", "sobol", "random"]
+SAMPLE_DIR="Samples"								# Stages of each sample are recorded as Samples/Sample_<script>.json
+SOBOL_BITS=30
+STREAM_CHUNK=256									# Points drawn at a time when a sample skips duplicate configurations
+
+SOBOL_DIRECTIONS=[									# Joe and Kuo direction numbers (new-joe-kuo-6.21201) of dimensions 2-21: (degree s, coefficients a, initial m)
+	(1, 0, [1]), (2, 1, [1, 3]), (3, 1, [1, 3, 1]), (3, 2, [1, 1, 1]), (4, 1, [1, 1, 3, 3]), (4, 4, [1, 3, 5, 13]), (5, 2, [1, 1, 5, 5, 17]),
+	(5, 4, [1, 1, 5, 5, 5]), (5, 7, [1, 1, 7, 11, 19]), (5, 11, [1, 1, 5, 1, 1]), (5, 13, [1, 1, 1, 3, 11]), (5, 14, [1, 3, 5, 5, 31]),
+	(6, 1, [1, 3, 3, 9, 7, 49]), (6, 13, [1, 1, 1, 15, 21, 21]), (6, 16, [1, 3, 1, 13, 27, 49]), (6, 19, [1, 1, 1, 15, 7, 5]),
+	(6, 22, [1, 3, 1, 15, 13, 25]), (6, 25, [1, 1, 5, 5, 19, 61]), (7, 1, [1, 3, 7, 11, 23, 15, 103]), (7, 4, [1, 3, 7, 13, 13, 15, 69])]
+
+#----------------------------------------------------------------------------------------------------------------------------------------------------------
+#			Unit Hypercube Samples
+#----------------------------------------------------------------------------------------------------------------------------------------------------------
+def sobolDirections(dims):
+	"This function returns the SOBOL_BITS direction integers of each of the first dims Sobol dimensions"
+	if dims>len(SOBOL_DIRECTIONS)+1:
+		raise ValueError("Sobol sampling supports at most {} free parameters".format(len(SOBOL_DIRECTIONS)+1))
+	directions=[[1<<(SOBOL_BITS-k) for k in range(1, SOBOL_BITS+1)]]		# First dimension is the van der Corput sequence
+	for (s, a, m) in SOBOL_DIRECTIONS[:dims-1]:
+		m=list(m)
+		for k in range(s, SOBOL_BITS):
+			value=m[k-s]^(m[k-s]<<s)
+			for i in range(1, s):
+				if (a>>(s-1-i))&1:
+					value^=m[k-i]<<i
+			m.append(value)
+		directions.append([m[k]<<(SOBOL_BITS-1-k) for k in range(SOBOL_BITS)])
+	return directions
+
+def scrambleDirections(directions, rng):
+	"This function applies a random linear matrix scramble (lower triangular, unit diagonal) to the direction integers of each dimension"
+	scrambled=[]
+	for dimension in directions:
+		rows=[(rng.getrandbits(SOBOL_BITS)&((1<<(SOBOL_BITS-1-k))-1))|(1<<(SOBOL_BITS-1-k)) for k in range(SOBOL_BITS)]	# Row k (from the most significant bit) keeps bit k and random lower bits
+		column=[]
+		for v in dimension:
+			value=0
+			for k in range(SOBOL_BITS):
+				if v&(1<<(SOBOL_BITS-1-k)):
+					value^=rows[k]
+			column.append(value)
+		scrambled.append(column)
+	return scrambled
+
+def sobolPoints(dims, start, stop, seed):
+	"This function returns points start to stop-1 of the scrambled Sobol sequence of a seed"
+	rng=random.Random("sobol-{}".format(seed))
+	directions=scrambleDirections(sobolDirections(dims), rng)
+	shifts=[rng.getrandbits(SOBOL_BITS) for j in range(dims)]				# Random digital shift
+	points=[]
+	for i in range(start, stop):
+		point=[]
+		for j in range(dims):
+			value=shifts[j]
+			k=0
+			index=i
+			while index:
+				if index&1:
+					value^=directions[j][k]
+				index>>=1
+				k+=1
+			point.append(value/(1<<SOBOL_BITS))
+		points.append(point)
+	return points
+
+def randomPoints(dims, start, stop, seed):
+	"This function returns points start to stop-1 of the uniformly random sample of a seed. Each point has its own generator, so any range of points can be drawn"
+	return [[rng.random() for j in range(dims)] for rng in (random.Random("random-{}-{}".format(seed, i)) for i in range(start, stop))]
+
+def latinHypercube(dims, stages, seed):
+	"This function returns the points of a Latin hypercube sample grown in stages of the given sizes. Each stage stratifies every dimension into as many strata as the sample has points after it and fills strata the earlier points left empty"
+	points=[]
+	for (stage, size) in enumerate(stages):
+		rng=random.Random("lhs-{}-{}".format(seed, stage))
+		total=len(points)+size
+		columns=[]
+		for j in range(dims):
+			occupied=set(int(point[j]*total) for point in points)
+			empty=[k for k in range(total) if k not in occupied]
+			strata=rng.sample(empty, size) if len(empty)>=size else empty+rng.sample(range(total), size-len(empty))
+			rng.shuffle(strata)
+			columns.append([(k+rng.random())/total for k in strata])
+		points+=[[columns[j][i] for j in range(dims)] for i in range(size)]
+	return points
+
+def pointStream(draw, dims, seed):
+	"This function yields the points of a sequence drawn by index (sobolPoints or randomPoints) one at a time, without end"
+	start=0
+	while True:
+		yield from draw(dims, start, start+STREAM_CHUNK, seed)
+		start+=STREAM_CHUNK
+
+def distinctSample(space, mode, stages, seed):
+	"This function returns the unit hypercube points of a sample of the given mode grown in stages, one point per configuration. Points falling on a configuration already sampled are skipped and further points drawn until every stage adds as many configurations as its size, or the space is exhausted"
+	sizes=[len(space.choices[j]) for j in space.free]
+	points=[]
+	seen=set()
+	def take(candidates, target):
+		for point in candidates:
+			if len(points)>=target:
+				return
+			cell=tuple(min(int(u*n), n-1) for (u, n) in zip(point, sizes))
+			if cell not in seen:
+				seen.add(cell)
+				points.append(point)
+	if mode=="lhs":
+		raw=latinHypercube(len(sizes), stages, seed)
+		(first, target)=(0, 0)
+		for (stage, size) in enumerate(stages):
+			target=min(target+size, len(space))
+			take(raw[first:first+size], target)
+			take(pointStream(randomPoints, len(sizes), "lhs-{}-{}".format(seed, stage)), target)	# Random configurations in place of the duplicates of the stage
+			first+=size
+	elif mode=="sobol":
+		take(pointStream(sobolPoints, len(sizes), seed), min(sum(stages), len(space)))			# Later Sobol points in place of duplicates
+	elif mode=="random":
+		take(pointStream(randomPoints, len(sizes), seed), min(sum(stages), len(space)))			# Sampling without replacement
+	else:
+		raise ValueError("unknown sampling mode "+mode)
+	return points
+
+#----------------------------------------------------------------------------------------------------------------------------------------------------------
+#			Sampled Space
+#----------------------------------------------------------------------------------------------------------------------------------------------------------
+class SampledSpace:
+	"Configurations of a ParamSpace at the points of a unit hypercube sample, indexable like the space itself"
+
+	def __init__(self, space, mode, stages, seed=0):
+		self.Parameters=space.Parameters
+		self.space=space
+		self.mode=mode
+		self.stages=list(stages)
+		self.seed=seed
+		self.points=distinctSample(space, mode, self.stages, seed)
+
+	def __len__(self):
+		return len(self.points)
+
+	def __getitem__(self, index):
+		free=[]
+		for (j, u) in zip(self.space.free, self.points[index]):
+			choices=self.space.choices[j]
+			free.append(choices[min(int(u*len(choices)), len(choices)-1)])
+		return self.space.complete(free)
+
+	def __iter__(self):
+		for i in range(len(self)):
+			yield self[i]
+
+def loadSample(script, space, mode, count, seed=0):
+	"This function returns the SampledSpace of count points of a script, extending the sample recorded in Samples/Sample_<script>.json when it has the same mode and seed and fewer points, and records its stages"
+	path=os.path.join(SAMPLE_DIR, "Sample_"+script+".json")
+	stages=[]
+	if os.path.exists(path):
+		with open(path) as sampleFile:
+			record=json.load(sampleFile)
+		if record["mode"]==mode and record["seed"]==seed and record["parameters"]==space.Parameters and record["size"]==len(space):
+			stages=record["stages"]
+	if sum(stages)>count:
+		if mode=="lhs":
+			count=sum(stages)								# Latin hypercube stages cannot be cut short
+		else:
+			stages=[count]
+	elif sum(stages)<count:
+		stages.append(count-sum(stages))
+	if not os.path.exists(SAMPLE_DIR):
+		os.makedirs(SAMPLE_DIR)
+	with open(path, 'w') as sampleFile:
+		json.dump({"mode": mode, "seed": seed, "parameters": space.Parameters, "size": len(space), "stages": stages}, sampleFile)
+	return SampledSpace(space, mode, stages, seed)
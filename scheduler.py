@@ -0,0 +1,248 @@
+# Campaign scheduler
+# Long-lived simulation pool shared by the optimizers of all testbed scripts, which run concurrently. Each script queues its jobs separately and
+# free simulation slots are handed out between scripts by a fair-share or priority policy
+#
+# Copyright (c) 2026 ParaOptimizationNS3 contributors
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy of this software and associated documentation files (the "Software"),
+# to deal in the Software without restriction, including without limitation the rights to use, copy, modify, merge, publish, distribute, sublicense,
+# and/or sell copies of the Software, and to permit persons to whom the Software is furnished to do so, subject to the following conditions:
+# The above copyright notice and this permission notice shall be included in all copies or substantial portions of the Software.
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS
+# IN THE SOFTWARE.
+
+#import
+import collections
+import concurrent.futures
+import itertools
+import threading
+import time
+
+import profiling
+
+POLICIES=["fair", "priority"]
+
+#----------------------------------------------------------------------------------------------------------------------------------------------------------
+#			Shared Pool
+#----------------------------------------------------------------------------------------------------------------------------------------------------------
+class SharedPool:
+	"Executor shared by all scripts of a campaign. Jobs wait in one queue per client and a dispatcher thread forwards them to the backend (a thread pool, a ProcessPool or a WorkerPool) whenever it has a free slot"
+
+	def __init__(self, slots, backend=None, policy="fair", weights=None):
+		if policy not in POLICIES:
+			raise ValueError("unknown scheduling policy "+policy)
+		self.policy=policy
+		self.weights=weights or {}				# Client name -> fair-share weight, or priority under the priority policy (default 1)
+		if backend is None:
+			self.backend=concurrent.futures.ThreadPoolExecutor(slots)
+			self.limit=lambda: slots
+		else:
+			self.backend=backend
+			self.limit=lambda: max(1, backend.slots())
+		self.queues=collections.OrderedDict()	# Client name -> deque of (future, fn, args)
+		self.running=collections.Counter()		# Client name -> jobs in the backend
+		self.served={}							# Client name -> dispatch sequence number of its last job, breaks ties by least recently served
+		self.sequence=itertools.count(1)
+		self.inflight=0
+		self.cond=threading.Condition()
+		self.closed=False
+		self.local=threading.local()			# Client bound to the calling thread
+		self.dispatcher=threading.Thread(target=self.dispatchLoop, daemon=True)
+		self.dispatcher.start()
+
+	def client(self, name=None):
+		"This function returns the executor-like client of a name, or of the name bound to the calling thread"
+		if name is None:
+			name=getattr(self.local, "name", "")
+		return PoolClient(self, name)
+
+	def bind(self, name):
+		"This function makes name the client of the calling thread"
+		self.local.name=name
+
+	def slots(self):
+		return self.limit()
+
+	def submit(self, name, fn, *args):
+		future=SharedFuture()
+		with self.cond:
+			if self.closed:
+				raise RuntimeError("cannot submit to a closed SharedPool")
+			self.queues.setdefault(name, collections.deque()).append((future, fn, args, time.time()))
+			self.served.setdefault(name, 0)
+			self.cond.notify_all()
+		return future
+
+	def nextClient(self):
+		"This function returns the name of the client whose job runs next: the fewest running jobs per unit weight (fair), or the highest priority and then the fewest running jobs (priority)"
+		waiting=[name for name, queue in self.queues.items() if len(queue)>0]
+		if len(waiting)==0:
+			return None
+		if self.policy=="priority":
+			top=max(self.weights.get(name, 1) for name in waiting)
+			waiting=[name for name in waiting if self.weights.get(name, 1)==top]
+		return min(waiting, key=lambda name: (self.running[name]/self.weights.get(name, 1), self.served[name]))
+
+	def dispatchLoop(self):
+		while True:
+			with self.cond:
+				while not self.closed and (self.inflight>=self.limit() or self.nextClient() is None):
+					self.cond.wait(1.0)							# Timeout picks up WorkerPool capacity changes
+				if self.closed:
+					return
+				name=self.nextClient()
+				(future, fn, args, queued)=self.queues[name].popleft()
+				if not future.set_running_or_notify_cancel():	# Cancelled while queued
+					continue
+				self.inflight+=1
+				self.running[name]+=1
+				self.served[name]=next(self.sequence)
+			record=profiling.jobRecord(name, queued)
+			if record is not None and isinstance(self.backend, concurrent.futures.ThreadPoolExecutor):
+				fn=profiling.within(record, fn)				# Jobs run in this process also record their own timestamps
+			backendFuture=self.backend.submit(fn, *args)
+			future.backendFuture=backendFuture
+			backendFuture.add_done_callback(lambda done, name=name, future=future, record=record: self.finished(name, future, done, record))
+
+	def finished(self, name, future, done, record=None):
+		with self.cond:
+			self.inflight-=1
+			self.running[name]-=1
+			self.cond.notify_all()
+		if record is not None and not done.cancelled() and done.exception() is None:
+			record.update(getattr(done.result(), "record", None) or {})	# Marks made by a job in a worker process
+		profiling.finished(record)
+		if done.cancelled():
+			future.set_exception(concurrent.futures.CancelledError())
+		elif done.exception() is not None:
+			future.set_exception(done.exception())
+		else:
+			future.set_result(done.result())
+
+	def shutdown(self, wait=True):
+		with self.cond:
+			self.closed=True
+			for queue in self.queues.values():
+				for (future, fn, args, queued) in queue:
+					future.cancel()
+				queue.clear()
+			self.cond.notify_all()
+		if isinstance(self.backend, concurrent.futures.ThreadPoolExecutor):
+			self.backend.shutdown(wait)
+
+class SharedFuture(concurrent.futures.Future):
+	"Future of a SharedPool job, which can kill the job's simulation through the future of the backend running it"
+
+	def __init__(self):
+		super().__init__()
+		self.backendFuture=None
+
+	def kill(self):
+		"This function kills the running simulation of the job if its backend supports it (a ProcessPool with a resource manager), and returns whether it was killed"
+		kill=getattr(self.backendFuture, "kill", None)
+		return kill is not None and kill()
+
+class PoolClient:
+	"Executor view of a SharedPool for one client. Using it as a context manager does not shut the pool down"
+
+	def __init__(self, pool, name):
+		self.pool=pool
+		self.name=name
+
+	def __enter__(self):
+		return self
+
+	def __exit__(self, *exc):
+		return False
+
+	def submit(self, fn, *args):
+		return self.pool.submit(self.name, fn, *args)
+
+#----------------------------------------------------------------------------------------------------------------------------------------------------------
+#			Speculative Execution
+#----------------------------------------------------------------------------------------------------------------------------------------------------------
+class SpeculativeBatch:
+	"Jobs of a batch which must all finish before the optimizer continues. Once only the tail of the batch is unfinished, each remaining running job is submitted a second time and the first copy to finish is used. The simulation of the losing copy is killed when the executor's futures support it (a SharedPool or ProcessPool with a resource manager); in a thread pool or on worker daemons it runs to completion and its result is discarded"
+
+	def __init__(self, executor, tail=0.0):
+		self.executor=executor
+		self.tail=tail							# Fraction of the batch (at least one job) whose stragglers are duplicated, 0 disables speculation
+		self.jobs={}							# Future -> job key, for every copy still awaited
+		self.calls={}							# Job key -> (fn, args)
+		self.copies={}							# Job key -> futures of its unfinished job
+		self.duplicated=0
+
+	def submit(self, key, fn, *args):
+		future=self.executor.submit(fn, *args)
+		self.jobs[future]=key
+		self.calls[key]=(fn, args)
+		self.copies[key]=[future]
+
+	def speculate(self, total):
+		"This function duplicates the running jobs of the tail of the batch which have no copy yet"
+		if len(self.copies)>max(1, int(self.tail*total)):
+			return
+		for (key, futures) in self.copies.items():
+			if len(futures)==1 and futures[0].running():		# Queued jobs are left alone, a copy would only queue behind them
+				(fn, args)=self.calls[key]
+				copy=self.executor.submit(fn, *args)
+				self.jobs[copy]=key
+				futures.append(copy)
+				self.duplicated+=1
+
+	def completed(self):
+		"This function yields (key, result) for every job of the batch as the first of its copies finishes. The other copy is cancelled if still queued, otherwise its simulation is killed where possible and its result discarded"
+		total=len(self.calls)
+		while len(self.jobs)>0:
+			armed=self.tail>0 and len(self.copies)<total			# Speculation starts after the first job finishes
+			(done, running)=concurrent.futures.wait(self.jobs, timeout=1.0 if armed else None, return_when=concurrent.futures.FIRST_COMPLETED)
+			for future in done:
+				key=self.jobs.pop(future)
+				if key not in self.copies:						# Loser of a job already yielded
+					continue
+				futures=self.copies[key]
+				if future.exception() is not None and len(futures)>1:		# The other copy may still succeed
+					futures.remove(future)
+					continue
+				del self.copies[key]
+				for other in futures:
+					if other is not future:
+						if not other.cancel() and hasattr(other, "kill"):
+							other.kill()
+						self.jobs.pop(other, None)
+				yield (key, future.result())
+			if self.tail>0 and len(self.copies)<total:
+				self.speculate(total)
+
+#----------------------------------------------------------------------------------------------------------------------------------------------------------
+#			Campaign
+#----------------------------------------------------------------------------------------------------------------------------------------------------------
+def runCampaign(pool, scripts, optimize):
+	"This function runs optimize(script) for every script concurrently, each thread bound to the pool client of its script, and returns the results in script order"
+	results={}
+	errors={}
+	def optimizeScript(script):
+		pool.bind(script)
+		try:
+			results[script]=optimize(script)
+		except BaseException as error:
+			errors[script]=error
+	threads=[threading.Thread(target=optimizeScript, args=(script,), name=script) for script in scripts]
+	for thread in threads:
+		thread.start()
+	for thread in threads:
+		thread.join()
+	for script in scripts:
+		if script in errors:
+			raise errors[script]
+	return [results[script] for script in scripts]
+
+def parseWeights(weights):
+	"This function accepts a comma separated list of script=weight pairs and returns a dict of script -> weight"
+	parsed={}
+	for pair in weights.split(","):
+		(script, sep, weight)=pair.strip().rpartition("=")
+		parsed[script]=float(weight)
+	return parsed
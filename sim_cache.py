@@ -0,0 +1,129 @@
+# Simulation result cache
+# Persistent, content-addressed store of parsed simulation results shared by the brute force and genetic optimizers
+#
+# Copyright (c) 2026 ParaOptimizationNS3 contributors
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy of this software and associated documentation files (the "Software"),
+# to deal in the Software without restriction, including without limitation the rights to use, copy, modify, merge, publish, distribute, sublicense,
+# and/or sell copies of the Software, and to permit persons to whom the Software is furnished to do so, subject to the following conditions:
+# The above copyright notice and this permission notice shall be included in all copies or substantial portions of the Software.
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS
+# IN THE SOFTWARE.
+
+#import
+import glob
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+
+from sim_exec import findScratchBinary
+
+#----------------------------------------------------------------------------------------------------------------------------------------------------------
+#			Build Fingerprint
+#----------------------------------------------------------------------------------------------------------------------------------------------------------
+fingerprints={}
+fingerprintLock=threading.Lock()
+
+def buildFingerprint(scriptName, buildDir="build"):
+	"This function accepts the script name and returns a digest of the compiled scratch program and ns-3 libraries, or None if it has not been built"
+	with fingerprintLock:
+		if scriptName in fingerprints:
+			return fingerprints[scriptName]
+		binary=findScratchBinary(scriptName, buildDir)
+		if binary is None:
+			fingerprints[scriptName]=None
+			return None
+		digest=hashlib.sha1()
+		with open(binary, 'rb') as binaryFile:										# Hash program contents so a rebuild with the same mtime is still detected
+			for block in iter(lambda: binaryFile.read(1<<20), b''):
+				digest.update(block)
+		for lib in sorted(glob.glob(os.path.join(buildDir,"lib","libns3*"))):		# Module libraries are hashed by name, size and mtime to keep startup cheap
+			stat=os.stat(lib)
+			digest.update("{}:{}:{}".format(os.path.basename(lib),stat.st_size,stat.st_mtime_ns).encode("UTF-8"))
+		fingerprints[scriptName]=digest.hexdigest()
+		return fingerprints[scriptName]
+
+#----------------------------------------------------------------------------------------------------------------------------------------------------------
+#			Option String Canonicalization
+#----------------------------------------------------------------------------------------------------------------------------------------------------------
+def canonicalParams(options):
+	"This function accepts an ns-3 option string and returns a canonical (parameters, RunNo) pair independent of option order and spacing"
+	params=[]
+	runNo=""
+	for option in options.split():
+		name, sep, value=option.lstrip("-").partition("=")
+		if name=="RunNo":
+			runNo=value
+		else:
+			params.append((name, value))
+	return (json.dumps(sorted(params)), runNo)
+
+#----------------------------------------------------------------------------------------------------------------------------------------------------------
+#			SQLite Result Cache
+#----------------------------------------------------------------------------------------------------------------------------------------------------------
+class SimCache:
+	"Persistent cache of per-client simulation results keyed by script, canonical parameters, RunNo and build fingerprint"
+
+	def __init__(self, path="Sim_Cache.db", buildDir="build"):
+		self.path=path
+		self.buildDir=buildDir
+		self.hits=0
+		self.misses=0
+		self.lock=threading.Lock()
+		self.conn=sqlite3.connect(path, timeout=60, check_same_thread=False)	# Shared by all executor threads, serialized by self.lock
+		with self.lock:
+			self.conn.execute("PRAGMA journal_mode=WAL")							# Allow concurrent campaigns to share one cache file
+			self.conn.execute("CREATE TABLE IF NOT EXISTS results (script TEXT, params TEXT, runNo TEXT, build TEXT, desc TEXT, clients TEXT, created REAL, PRIMARY KEY (script, params, runNo, build))")
+			self.conn.commit()
+
+	def key(self, scriptName, options):
+		"This function returns the cache key of a simulation, or None if the script has no build to fingerprint"
+		build=buildFingerprint(scriptName, self.buildDir)
+		if build is None:
+			return None
+		(params, runNo)=canonicalParams(options)
+		return (scriptName, params, runNo, build)
+
+	def lookup(self, key):
+		"This function returns the cached (description, clients) pair for a key, or None on a miss"
+		if key is None:
+			with self.lock:
+				self.misses+=1
+			return None
+		with self.lock:
+			row=self.conn.execute("SELECT desc, clients FROM results WHERE script=? AND params=? AND runNo=? AND build=?", key).fetchone()
+			if row is None:
+				self.misses+=1
+				return None
+			self.hits+=1
+		return (row[0], json.loads(row[1]))
+
+	def store(self, key, desc, clients):
+		"This function stores the script description and per-client rows [Client Id, Av Throughput, Min Throughput, Av Latency, Max Latency, Packet Loss Rate] of a successful simulation"
+		if key is None or len(clients)==0:
+			return
+		with self.lock:
+			self.conn.execute("INSERT OR REPLACE INTO results VALUES (?,?,?,?,?,?,?)", key+(desc, json.dumps(clients), time.time()))
+			self.conn.commit()
+
+	def tally(self, hit):
+		"This function counts a lookup made by a worker process with its own connection"
+		with self.lock:
+			if hit:
+				self.hits+=1
+			else:
+				self.misses+=1
+
+	def stats(self):
+		"This function returns the current (hits, misses) counters"
+		with self.lock:
+			return (self.hits, self.misses)
+
+	def close(self):
+		with self.lock:
+			self.conn.close()
@@ -0,0 +1,160 @@
+# Simulation execution backend
+# Runs compiled ns-3 scratch programs directly, falling back to ./waf --run when a program cannot be resolved
+#
+# Copyright (c) 2017 Regents of the University of Colorado
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy of this software and associated documentation files (the "Software"),
+# to deal in the Software without restriction, including without limitation the rights to use, copy, modify, merge, publish, distribute, sublicense,
+# and/or sell copies of the Software, and to permit persons to whom the Software is furnished to do so, subject to the following conditions:
+# The above copyright notice and this permission notice shall be included in all copies or substantial portions of the Software.
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS
+# IN THE SOFTWARE.
+
+# Based on the simulation execution of runScript in genetic_descent.py and sampler_BF.py by Adarsh Hasandka (adarsh.hasandka@colorado.edu)
+
+#import
+import contextlib
+import glob
+import io
+import os
+import platform
+import re
+import shlex
+import signal
+import subprocess
+import threading
+
+import profiling
+
+useWaf=False						# Force every simulation through ./waf --run
+buildDir="build"
+programs={}							# scriptName -> (argv prefix, environment), or None if only waf can run it
+programLock=threading.Lock()
+resources=None						# ResourceManager admitting, pinning and measuring simulations, if any
+timeoutFactor=None					# Wall clock seconds allowed per simulated second, None for no timeout
+minTimeout=60						# Shortest timeout in seconds, covers program startup and short SimTimes
+defaultSimTime=120					# SimTime of simulations without a --SimTime option
+KILL_GRACE=5						# Seconds between SIGTERM and SIGKILL of a timed out process group
+TIMEOUT_CLIENT=60001				# Dummy client of timed out runs, failed runs use 60000
+SIM_TIME_OPTION=re.compile(r"--SimTime=(\S+)")
+SCRIPT_NAME=re.compile(r"[A-Za-z0-9][A-Za-z0-9_.+-]*$")	# Scratch program names, without path separators or shell syntax
+
+class SimulationTimeout(subprocess.TimeoutExpired):
+	"A simulation killed for running longer than its timeout"
+
+#----------------------------------------------------------------------------------------------------------------------------------------------------------
+#			Program Resolution
+#----------------------------------------------------------------------------------------------------------------------------------------------------------
+def findScratchBinary(scriptName, buildDir="build"):
+	"This function accepts the script name and returns the path of the compiled ns-3 scratch program, or None if it has not been built"
+	candidates=[]
+	for pattern in ("scratch/{0}","scratch/*-{0}-*","scratch/{0}/{0}","scratch/{0}/*-{0}-*"):	# waf names scratch programs ns3.<ver>-<script>-<profile>
+		candidates+=glob.glob(os.path.join(buildDir,pattern.format(scriptName)))
+	candidates=[path for path in candidates if os.path.isfile(path) and os.access(path, os.X_OK)]
+	if len(candidates)==0:
+		return None
+	return max(candidates, key=os.path.getmtime)									# Newest build wins if several profiles exist
+
+def simEnvironment():
+	"This function returns the process environment with the ns-3 library directory on the dynamic loader path, as ./waf --run would set it"
+	env=os.environ.copy()
+	libVar="DYLD_LIBRARY_PATH" if platform.system()=="Darwin" else "LD_LIBRARY_PATH"
+	libDir=os.path.abspath(os.path.join(buildDir,"lib"))
+	env[libVar]=libDir+os.pathsep+env[libVar] if env.get(libVar) else libDir
+	return env
+
+def resolveProgram(scriptName):
+	"This function accepts the script name and returns the (argv prefix, environment) used to run it directly, or None if it must be run through waf"
+	with programLock:
+		if scriptName not in programs:
+			binary=None if useWaf else findScratchBinary(scriptName, buildDir)
+			programs[scriptName]=None if binary is None else ([os.path.abspath(binary)], simEnvironment())
+		return programs[scriptName]
+
+def knownScript(scriptName):
+	"This function returns True if scriptName names a scratch program of this ns-3 tree: a compiled program, or a scratch source waf can build and run"
+	if not isinstance(scriptName, str) or not SCRIPT_NAME.match(scriptName):
+		return False
+	if resolveProgram(scriptName) is not None:
+		return True
+	return os.path.isfile(os.path.join("scratch", scriptName+".cc")) or os.path.isdir(os.path.join("scratch", scriptName))
+
+def resolvePrograms(scripts):
+	"This function resolves the programs of all scripts up front (after ./waf build) and reports the ones falling back to waf"
+	with programLock:
+		programs.clear()
+	for scriptName in scripts:
+		if resolveProgram(scriptName) is None and not useWaf:
+			print("No compiled program found for {}, running it through waf".format(scriptName))
+
+#----------------------------------------------------------------------------------------------------------------------------------------------------------
+#			Simulation Execution
+#----------------------------------------------------------------------------------------------------------------------------------------------------------
+def commandString(scriptName, options):
+	"This function returns a human readable command line for a simulation, used in error descriptions"
+	program=resolveProgram(scriptName)
+	if program is None:
+		return "./waf --run \"{} {}\"".format("scratch/"+scriptName,options)
+	return " ".join(program[0]+shlex.split(options))
+
+def simTimeout(options):
+	"This function returns the wall clock timeout of a simulation in seconds, scaled by its SimTime, or None if timeouts are off"
+	if timeoutFactor is None:
+		return None
+	match=SIM_TIME_OPTION.search(options)
+	simTime=float(match.group(1)) if match else defaultSimTime
+	return max(minTimeout, timeoutFactor*simTime)
+
+def signalGroup(process, sig):
+	"This function sends a signal to the process group of a simulation if it is still running"
+	if process.returncode is None:
+		try:
+			os.killpg(process.pid, sig)
+		except OSError:								# Already exited
+			pass
+
+def stopSimulation(process, timedOut):
+	"This function asks the process group of a timed out simulation to terminate and kills it after KILL_GRACE seconds"
+	timedOut.set()
+	signalGroup(process, signal.SIGTERM)
+	killer=threading.Timer(KILL_GRACE, signalGroup, (process, signal.SIGKILL))
+	killer.daemon=True
+	killer.start()
+
+def runSimulation(scriptName, options, feed):
+	"This function runs a simulation, passing each line of its combined stdout and stderr to feed as it is printed, and raises subprocess.CalledProcessError on failure or SimulationTimeout if it had to be killed"
+	program=resolveProgram(scriptName)
+	timeout=simTimeout(options)
+	timedOut=threading.Event()
+	job=resources.job(scriptName, options) if resources is not None else contextlib.nullcontext()
+	with job:										# Waits until the simulation fits in free memory
+		profiling.mark("admitted")
+		if program is None:							# Each simulation leads its own process group, so waf and the program it starts are killed together
+			args=['./waf', '--run', "scratch/"+scriptName+" "+options]	# No shell, so options are only ever arguments of the program
+			process=subprocess.Popen(args, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, start_new_session=True)
+		else:
+			args=program[0]+shlex.split(options)
+			process=subprocess.Popen(args, env=program[1], stdout=subprocess.PIPE, stderr=subprocess.STDOUT, start_new_session=True)
+		profiling.mark("spawned")
+		if resources is not None:
+			job.started(process.pid)
+		timer=None
+		if timeout is not None:
+			timer=threading.Timer(timeout, stopSimulation, (process, timedOut))
+			timer.daemon=True
+			timer.start()
+		try:
+			with process:
+				for line in io.TextIOWrapper(process.stdout, encoding="UTF-8", errors="replace"):	# Read the pipe incrementally instead of buffering the whole output
+					feed(line)
+				returncode=process.wait() if resources is None else job.wait(process)
+			profiling.mark("exited")
+		finally:
+			if timer is not None:
+				timer.cancel()
+	if timedOut.is_set():
+		raise SimulationTimeout(args, timeout)
+	if returncode:
+		raise subprocess.CalledProcessError(returncode, args)
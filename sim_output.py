@@ -0,0 +1,64 @@
+# Simulation output parser
+# Incrementally parses the stdout of the qos-app client and server models into per-client result records
+#
+# Copyright (c) 2017 Regents of the University of Colorado
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy of this software and associated documentation files (the "Software"),
+# to deal in the Software without restriction, including without limitation the rights to use, copy, modify, merge, publish, distribute, sublicense,
+# and/or sell copies of the Software, and to permit persons to whom the Software is furnished to do so, subject to the following conditions:
+# The above copyright notice and this permission notice shall be included in all copies or substantial portions of the Software.
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS
+# IN THE SOFTWARE.
+
+# Based on the output parsing of genetic_descent.py and sampler_BF.py by Adarsh Hasandka (adarsh.hasandka@colorado.edu)
+
+#import
+import re
+
+#----------------------------------------------------------------------------------------------------------------------------------------------------------
+#			Output Line Patterns (printed by scratch scripts, Client::StopApplication and Server::StopApplication)
+#----------------------------------------------------------------------------------------------------------------------------------------------------------
+DESC_PATTERN=re.compile(r'\[DESC\] - (.*)')
+CLIENT_PATTERN=re.compile(r'Client (\d*) Sent (\d*) Packets of total size (\d*) bytes')
+SERVER_PATTERN=re.compile(r'Server received (\d*) bytes across \d* packets, from Client (\d*), Average Latency: (\d+\.?\d*)+ms, Average Throughput: (\d+\.?\d*)+kbps, Max Latency: (\d+\.?\d*)+ms, Min Throughput: (\d+\.?\d*)+kbps')
+
+#----------------------------------------------------------------------------------------------------------------------------------------------------------
+#			Streaming Parser
+#----------------------------------------------------------------------------------------------------------------------------------------------------------
+class OutputParser:
+	"Line by line parser of simulation output which keeps only the latest record of each client, so memory does not grow with log volume"
+
+	def __init__(self):
+		self.desc=""
+		self.totalBytes_Tx={}				# Client id -> bytes sent
+		self.serverRx={}					# Client id -> (bytes received, av latency, av throughput, max latency, min throughput)
+
+	def feed(self, line):
+		"This function parses one line of output. A substring test selects the single pattern which can match, so most log lines cost no regex at all"
+		if "[DESC] - " in line:														# Capture script description string
+			match=DESC_PATTERN.search(line)
+			self.desc=match.group(1).rstrip("\r\n")
+		elif " bytes across " in line:												# Capture reported Server Rx information
+			match=SERVER_PATTERN.search(line)
+			if match and float(match.group(2))>0:
+				self.serverRx[match.group(2)]=(match.group(1), match.group(3), match.group(4), match.group(5), match.group(6))
+		elif " Sent " in line:														# Capture reported Client Tx Information (progress logs use lower case "sent")
+			match=CLIENT_PATTERN.search(line)
+			if match and float(match.group(1))>0:									# Ignore errored values
+				self.totalBytes_Tx[match.group(1)]=match.group(3)
+
+	def clients(self):
+		"This function returns the per-client rows [Client Id, Av Throughput, Min Throughput, Av Latency, Max Latency, Packet Loss Rate] of the parsed output"
+		rows=[]
+		for clientId, (rxBytes, avLatency, avThroughput, maxLatency, minThroughput) in self.serverRx.items():
+			if clientId not in self.totalBytes_Tx:									# Server reported a client which never reported its Tx totals
+				continue
+			Tx_Bytes=int(self.totalBytes_Tx[clientId])
+			Rx_Bytes=int(rxBytes)
+			packLossRate=round((1.0-(Rx_Bytes/Tx_Bytes))*100,3)						# calculate packet loss
+			if packLossRate<0:
+				packLossRate=-1*packLossRate
+			rows.append([int(clientId), float(avThroughput), float(minThroughput), float(avLatency), float(maxLatency), packLossRate])
+		return rows
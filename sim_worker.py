@@ -0,0 +1,294 @@
+#!/usr/bin/env python3
+# Distributed simulation workers
+# Worker daemon which runs simulation jobs received over a socket, and the coordinator side pool which dispatches jobs to a set of workers
+#
+# Copyright (c) 2026 ParaOptimizationNS3 contributors
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy of this software and associated documentation files (the "Software"),
+# to deal in the Software without restriction, including without limitation the rights to use, copy, modify, merge, publish, distribute, sublicense,
+# and/or sell copies of the Software, and to permit persons to whom the Software is furnished to do so, subject to the following conditions:
+# The above copyright notice and this permission notice shall be included in all copies or substantial portions of the Software.
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS
+# IN THE SOFTWARE.
+
+# Protocol: newline delimited JSON over TCP. On connect the coordinator sends {"token": t}, the shared token in SIM_WORKER_TOKEN (null if unset),
+# and the worker announces {"threads": n} if the token matches its own, otherwise it answers {"error"} and disconnects. The coordinator sends jobs
+# {"id", "rowNo", "script", "options", "comment"} and the worker answers each with {"id", "rows"} or {"id", "error"}.
+# The worker also sends {"heartbeat": t} periodically so a coordinator can detect a lost host.
+
+#import
+import argparse
+import collections
+import concurrent.futures
+import hmac
+import ipaddress
+import itertools
+import json
+import multiprocessing as mp
+import os
+import socket
+import socketserver
+import sys
+import threading
+import time
+
+heartbeatInterval=10					# Seconds between worker heartbeats
+heartbeatTimeout=3*heartbeatInterval	# Seconds of silence after which a worker is considered lost
+TOKEN_ENV="SIM_WORKER_TOKEN"			# Environment variable holding the token shared by the coordinator and its workers
+
+#----------------------------------------------------------------------------------------------------------------------------------------------------------
+#			Coordinator Side Worker Pool
+#----------------------------------------------------------------------------------------------------------------------------------------------------------
+def parseAddresses(workers):
+	"This function accepts a comma separated list of host:port worker addresses and returns a list of (host, port) tuples"
+	addresses=[]
+	for worker in workers.split(","):
+		host, sep, port=worker.strip().rpartition(":")
+		addresses.append((host or "localhost", int(port)))
+	return addresses
+
+class WorkerPool:
+	"Executor-like pool which dispatches runScript jobs to remote worker daemons, re-queuing the jobs of lost workers and reconnecting to them"
+
+	def __init__(self, addresses, reconnectDelay=5, token=None):
+		self.reconnectDelay=reconnectDelay
+		self.token=token if token is not None else os.environ.get(TOKEN_ENV)	# Sent to every worker before it accepts jobs
+		self.pending=collections.deque()		# Job ids waiting for a free worker slot
+		self.jobs={}							# Job id -> (future, job message, extra row fields)
+		self.ids=itertools.count(1)
+		self.cond=threading.Condition()
+		self.closed=False
+		self.capacity={}						# Address -> thread count of each connected worker
+		self.threads=[]
+		for address in addresses:
+			thread=threading.Thread(target=self.workerLoop, args=(address,), daemon=True)
+			thread.start()
+			self.threads.append(thread)
+
+	def __enter__(self):
+		return self
+
+	def __exit__(self, *exc):
+		return False								# The pool is long-lived and shut down explicitly by its owner
+
+	def submit(self, fn, rowNo, scriptName, options, comment, *extra):
+		"This function accepts the same arguments as executor.submit(runScript, ...) and returns a future of the runScript rows. Extra arguments (e.g. genIndex) are appended to every row"
+		future=concurrent.futures.Future()
+		with self.cond:
+			if self.closed:
+				raise RuntimeError("cannot submit to a closed WorkerPool")
+			jobId=next(self.ids)
+			self.jobs[jobId]=(future, {"id": jobId, "rowNo": rowNo, "script": scriptName, "options": options, "comment": comment}, list(extra))
+			self.pending.append(jobId)
+			self.cond.notify_all()
+		return future
+
+	def slots(self):
+		"This function returns the number of jobs the connected workers can run at once"
+		with self.cond:
+			return sum(self.capacity.values())
+
+	def shutdown(self, wait=True):
+		with self.cond:
+			self.closed=True
+			for jobId in self.pending:
+				self.jobs.pop(jobId)[0].cancel()
+			self.pending.clear()
+			self.cond.notify_all()
+		if wait:
+			for thread in self.threads:
+				thread.join()
+
+	def workerLoop(self, address):
+		"This function keeps one worker connected, feeding it jobs up to its thread count and re-queuing its jobs whenever the connection is lost"
+		while not self.closed:
+			try:
+				sock=socket.create_connection(address, timeout=heartbeatTimeout)
+				sock.sendall((json.dumps({"token": self.token})+"\n").encode("UTF-8"))
+				reader=sock.makefile('r', encoding="UTF-8")
+				hello=json.loads(reader.readline())
+				if "error" in hello:
+					print("Worker {}:{} refused the connection: {}".format(address[0],address[1],hello["error"]))
+					sock.close()
+					time.sleep(self.reconnectDelay)
+					continue
+				slots=hello["threads"]
+			except (OSError, ValueError, KeyError):
+				time.sleep(self.reconnectDelay)
+				continue
+			print("Connected to worker {}:{} with {} threads".format(address[0],address[1],slots))
+			with self.cond:
+				self.capacity[address]=slots
+			inflight=set()
+			alive=[True]
+			receiver=threading.Thread(target=self.receiveLoop, args=(reader, inflight, alive), daemon=True)
+			receiver.start()
+			try:
+				while True:
+					with self.cond:
+						while alive[0] and not self.closed and (len(self.pending)==0 or len(inflight)>=slots):
+							self.cond.wait()
+						if not alive[0] or self.closed:
+							break
+						jobId=self.pending.popleft()
+						future=self.jobs[jobId][0]
+						if not (future.running() or future.set_running_or_notify_cancel()):	# Skip jobs cancelled while queued, re-queued jobs are already running
+							del self.jobs[jobId]
+							continue
+						inflight.add(jobId)
+						message=self.jobs[jobId][1]
+					sock.sendall((json.dumps(message)+"\n").encode("UTF-8"))
+			except OSError:
+				pass
+			with self.cond:
+				alive[0]=False
+				self.capacity.pop(address, None)
+				if len(inflight)>0 and not self.closed:
+					print("Lost worker {}:{}, re-queuing {} jobs".format(address[0],address[1],len(inflight)))
+				self.pending.extendleft(sorted(inflight, reverse=True))	# Re-queued jobs go to the front of the queue
+				inflight.clear()
+				self.cond.notify_all()
+			try:
+				sock.shutdown(socket.SHUT_RDWR)
+			except OSError:
+				pass
+			sock.close()
+			receiver.join()
+			if not self.closed:
+				time.sleep(self.reconnectDelay)
+
+	def receiveLoop(self, reader, inflight, alive):
+		"This function reads results and heartbeats from one worker until the connection drops or falls silent"
+		try:
+			for line in reader:
+				message=json.loads(line)
+				if "id" not in message:
+					continue								# Heartbeat
+				with self.cond:
+					if message["id"] not in inflight:
+						continue							# Stale result of a job which was already re-queued
+					inflight.discard(message["id"])
+					(future, job, extra)=self.jobs.pop(message["id"])
+					self.cond.notify_all()
+				if "error" in message:
+					future.set_exception(RuntimeError("worker failed to run {}: {}".format(job["script"],message["error"])))
+				else:
+					future.set_result([row+extra for row in message["rows"]])
+		except (OSError, ValueError):
+			pass
+		with self.cond:
+			alive[0]=False
+			self.cond.notify_all()
+
+#----------------------------------------------------------------------------------------------------------------------------------------------------------
+#			Worker Daemon
+#----------------------------------------------------------------------------------------------------------------------------------------------------------
+def isLoopback(host, port):
+	"This function returns whether every address host resolves to is a loopback address"
+	try:
+		addresses=[info[4][0] for info in socket.getaddrinfo(host or None, port, type=socket.SOCK_STREAM, flags=socket.AI_PASSIVE)]
+	except OSError:
+		return False
+	return len(addresses)>0 and all(ipaddress.ip_address(address.split("%")[0]).is_loopback for address in addresses)
+
+def serveWorker(host, port, threads, token=None):
+	"This function runs a worker daemon which executes simulation jobs from any number of coordinators on a pool of threads. Coordinators must present token, which is required unless the daemon only listens on a loopback interface"
+	from evaluator import runScript
+	from sim_exec import knownScript
+	if token is None and not isLoopback(host, port):
+		raise ValueError("refusing to listen on {} without a shared token, set {} on the workers and the coordinator".format(host or "all interfaces", TOKEN_ENV))
+	executor=concurrent.futures.ThreadPoolExecutor(threads)
+
+	class JobHandler(socketserver.StreamRequestHandler):
+		def handle(self):
+			sendLock=threading.Lock()
+			stop=threading.Event()
+			def send(message):
+				with sendLock:
+					self.wfile.write((json.dumps(message)+"\n").encode("UTF-8"))
+					self.wfile.flush()
+			def runJob(job):
+				try:
+					if not knownScript(job["script"]):			# Never run a program named by a client which is not a scratch program of this tree
+						raise ValueError("unknown script {!r}".format(job["script"]))
+					reply={"id": job["id"], "rows": runScript(job["rowNo"], job["script"], job["options"], job["comment"])}
+				except Exception as error:
+					reply={"id": job["id"], "error": str(error)}
+				try:
+					send(reply)
+				except OSError:
+					pass								# Coordinator is gone and re-queues the job elsewhere
+			def heartbeat():
+				while not stop.wait(heartbeatInterval):
+					try:
+						send({"heartbeat": time.time()})
+					except OSError:
+						return
+			try:
+				self.request.settimeout(heartbeatTimeout)			# A client which sends no token is dropped
+				hello=json.loads(self.rfile.readline())
+				self.request.settimeout(None)
+				offered=hello.get("token")
+				accepted=token is None or (isinstance(offered, str) and hmac.compare_digest(offered.encode("UTF-8"), token.encode("UTF-8")))
+			except (OSError, ValueError, AttributeError):
+				return
+			if not accepted:
+				send({"error": "authentication failed"})
+				print("Refused coordinator {}: bad token".format(self.client_address[0]))
+				return
+			send({"threads": threads})
+			threading.Thread(target=heartbeat, daemon=True).start()
+			try:
+				for line in self.rfile:
+					executor.submit(runJob, json.loads(line))
+			except (OSError, ValueError):
+				pass
+			stop.set()
+
+	class JobServer(socketserver.ThreadingTCPServer):
+		allow_reuse_address=True
+		daemon_threads=True
+
+	with JobServer((host, port), JobHandler) as server:
+		print("Worker listening on {}:{} with {} threads".format(host,port,threads))
+		server.serve_forever()
+
+#----------------------------------------------------------------------------------------------------------------------------------------------------------
+#			MAIN CODE EXECUTION
+#----------------------------------------------------------------------------------------------------------------------------------------------------------
+if __name__ == '__main__':
+	import evaluator
+	import sim_exec
+	from resources import PIN_MODES, ResourceManager
+	from sim_cache import SimCache
+
+	parser=argparse.ArgumentParser(description="Simulation worker daemon, run from the ns-3 top level directory")
+	parser.add_argument("--Host", default="localhost", help="interface to listen on; any other than loopback requires a shared token in "+TOKEN_ENV+" (default: localhost)")
+	parser.add_argument("--Port", type=int, default=5600, help="port to listen on (default: 5600)")
+	parser.add_argument("--Threads", type=int, default=mp.cpu_count(), help="number of simultaneous simulations (default: cpu count)")
+	parser.add_argument("--Cache", default="Sim_Cache.db", help="simulation result cache database (default: Sim_Cache.db)")
+	parser.add_argument("--NoCache", action="store_true", help="always run the simulator instead of reusing cached results")
+	parser.add_argument("--UseWaf", action="store_true", help="run every simulation through ./waf --run instead of the compiled scratch program")
+	parser.add_argument("--Pin", choices=PIN_MODES, default="none", help="pin each simulation process to its own core (core) or to the least loaded NUMA node (numa) (default: none)")
+	parser.add_argument("--MemoryReserve", type=float, default=0.1, help="fraction of the memory free at start which simulations are not admitted into (default: 0.1)")
+	parser.add_argument("--Timeout", type=float, help="kill simulations running longer than this many wall clock seconds per simulated second (default: no timeout)")
+	parser.add_argument("--MinTimeout", type=float, default=60, help="shortest simulation timeout in seconds (default: 60)")
+	parser.add_argument("--DefaultSimTime", type=float, default=120, help="SimTime in seconds of scripts run without a --SimTime option, for the timeout (default: 120)")
+	parser.add_argument("--ResourceUsage", default="Resource_Usage.json", help="file of the peak memory and CPU time recorded per parameter signature, used to admit simulations by free memory (default: Resource_Usage.json)")
+	args=parser.parse_args()
+	sim_exec.useWaf=args.UseWaf
+	sim_exec.resources=ResourceManager(args.Pin, args.MemoryReserve, args.ResourceUsage)
+	sim_exec.timeoutFactor=args.Timeout
+	sim_exec.minTimeout=args.MinTimeout
+	sim_exec.defaultSimTime=args.DefaultSimTime
+	if not args.NoCache:
+		evaluator.simCache=SimCache(args.Cache)
+	try:
+		serveWorker(args.Host, args.Port, args.Threads, os.environ.get(TOKEN_ENV) or None)
+	except ValueError as error:
+		parser.error(str(error))
+	except KeyboardInterrupt:
+		sim_exec.resources.save()
+		sys.exit(0)
@@ -0,0 +1,190 @@
+# Surrogate cost model
+# Gaussian process regression of the cost of evaluated configurations, used to screen bred children so only promising or uncertain ones are simulated
+#
+# Copyright (c) 2026 ParaOptimizationNS3 contributors
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy of this software and associated documentation files (the "Software"),
+# to deal in the Software without restriction, including without limitation the rights to use, copy, modify, merge, publish, distribute, sublicense,
+# and/or sell copies of the Software, and to permit persons to whom the Software is furnished to do so, subject to the following conditions:
+# The above copyright notice and this permission notice shall be included in all copies or substantial portions of the Software.
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS
+# IN THE SOFTWARE.
+
+#import
+import math
+import numbers
+
+import numpy as np
+
+LENGTH_SCALES=[0.1, 0.2, 0.5, 1.0, 2.0]				# Kernel length scales tried on every fit, in units of the encoded trait range
+
+#----------------------------------------------------------------------------------------------------------------------------------------------------------
+#			Parameter Encoding
+#----------------------------------------------------------------------------------------------------------------------------------------------------------
+class ParamEncoder:
+	"Maps trait value lists to vectors: numeric traits scaled to [0,1] over the range of their values, other traits one-hot over their distinct values"
+
+	def __init__(self, Parameters, values):
+		self.numeric=[]
+		self.ranges=[]
+		self.categories=[]
+		for j in range(len(Parameters)):
+			isNumeric=all(isinstance(value, numbers.Number) for value in values[j])
+			self.numeric.append(isNumeric)
+			if isNumeric:
+				low=min(values[j])
+				high=max(values[j])
+				self.ranges.append((low, high-low if high>low else 1))
+				self.categories.append(None)
+			else:
+				self.ranges.append(None)
+				self.categories.append({value: k for k, value in enumerate(dict.fromkeys(values[j]))})
+		self.width=sum(1 if isNumeric else len(self.categories[j]) for j, isNumeric in enumerate(self.numeric))
+
+	def encode(self, traitsList):
+		"This function returns an array with one encoded row per list of trait values"
+		encoded=np.zeros((len(traitsList), self.width))
+		for i, traits in enumerate(traitsList):
+			column=0
+			for j in range(len(self.numeric)):
+				if self.numeric[j]:
+					encoded[i, column]=(traits[j]-self.ranges[j][0])/self.ranges[j][1]
+					column+=1
+				else:
+					if traits[j] in self.categories[j]:								# Unknown values encode as all zeros
+						encoded[i, column+self.categories[j][traits[j]]]=1
+					column+=len(self.categories[j])
+		return encoded
+
+#----------------------------------------------------------------------------------------------------------------------------------------------------------
+#			Gaussian Process
+#----------------------------------------------------------------------------------------------------------------------------------------------------------
+def squaredDistances(A, B):
+	return np.maximum((A*A).sum(1)[:,None]+(B*B).sum(1)[None,:]-2*A@B.T, 0)
+
+class GaussianProcess:
+	"Gaussian process regression with a squared exponential kernel on standardized targets. The length scale is picked from LENGTH_SCALES by marginal likelihood"
+
+	def __init__(self, noise=0.05):
+		self.noise=noise									# Observation noise variance relative to the target variance
+		self.X=None
+
+	def fit(self, X, y):
+		distances=squaredDistances(X, X)
+		yn=(y-y.mean())/(y.std() if y.std()>0 else 1.0)
+		bestLikelihood=-np.inf
+		for lengthScale in LENGTH_SCALES:
+			K=np.exp(-0.5*distances/lengthScale**2)+self.noise*np.eye(len(X))
+			try:
+				Linv=np.linalg.inv(np.linalg.cholesky(K))	# Inverse Cholesky factor, so later solves and updates are matrix products
+			except np.linalg.LinAlgError:
+				continue
+			z=Linv@yn
+			likelihood=-0.5*z@z+np.log(np.diag(Linv)).sum()
+			if likelihood>bestLikelihood:
+				bestLikelihood=likelihood
+				(self.X, self.Linv, self.lengthScale)=(X, Linv, lengthScale)
+		self.setTargets(y)
+
+	def extend(self, Xnew, y):
+		"This function adds rows to the inputs at the current length scale by a block update of the inverse Cholesky factor, O(n^2) per row instead of the O(n^3) of a fit, and sets y as the targets of all rows. Raises LinAlgError if the update is not positive definite"
+		K12=np.exp(-0.5*squaredDistances(self.X, Xnew)/self.lengthScale**2)
+		K22=np.exp(-0.5*squaredDistances(Xnew, Xnew)/self.lengthScale**2)+self.noise*np.eye(len(Xnew))
+		B=(self.Linv@K12).T								# Lower left block of the enlarged Cholesky factor
+		L22inv=np.linalg.inv(np.linalg.cholesky(K22-B@B.T))
+		self.Linv=np.block([[self.Linv, np.zeros((len(self.X), len(Xnew)))], [-L22inv@B@self.Linv, L22inv]])
+		self.X=np.vstack([self.X, Xnew])
+		self.setTargets(y)
+
+	def setTargets(self, y):
+		"This function sets the targets of the fitted inputs, which only needs the factor of the kernel matrix"
+		self.yMean=y.mean()
+		self.yStd=y.std() if y.std()>0 else 1.0
+		self.alpha=self.Linv.T@(self.Linv@((y-self.yMean)/self.yStd))
+
+	def predict(self, Xs):
+		"This function returns the predicted mean and standard deviation at each row of Xs"
+		Ks=np.exp(-0.5*squaredDistances(Xs, self.X)/self.lengthScale**2)
+		mean=Ks@self.alpha
+		v=self.Linv@Ks.T
+		variance=np.maximum(1-(v*v).sum(0), 1e-12)
+		return (mean*self.yStd+self.yMean, np.sqrt(variance)*self.yStd)
+
+#----------------------------------------------------------------------------------------------------------------------------------------------------------
+#			Surrogate
+#----------------------------------------------------------------------------------------------------------------------------------------------------------
+class Surrogate:
+	"Archive of the average cost of every evaluated configuration and a Gaussian process fitted to it, updated whenever results were added since the last prediction"
+
+	def __init__(self, Parameters, values, screenFactor=4, maxPoints=1000, minPoints=8, kappa=1.0):
+		self.encoder=ParamEncoder(Parameters, values)
+		self.screenFactor=screenFactor					# Children bred per child simulated
+		self.maxPoints=maxPoints						# The model is fitted to a subsample of this many configurations, stratified by cost, when the archive is larger
+		self.minPoints=minPoints						# Children are not screened until this many configurations were evaluated
+		self.kappa=kappa								# Weight of uncertainty in the lower confidence bound used for ranking
+		self.archive={}									# tuple of trait values -> [sum of costs, runs]
+		self.model=None
+		self.configs=[]									# Configurations in the model, in the order of its rows
+		self.pending=[]									# Configurations added to the archive since the last fit
+		self.fullSize=0									# Configurations in the model after its last full fit
+		self.dirty=False
+
+	def add(self, traits, cost):
+		"This function adds the cost of one run of a configuration"
+		if tuple(traits) not in self.archive:
+			self.pending.append(tuple(traits))
+		entry=self.archive.setdefault(tuple(traits), [0.0, 0])
+		entry[0]+=cost
+		entry[1]+=1
+		self.dirty=True
+
+	def targets(self, configs):
+		costs=np.array([self.archive[config][0]/self.archive[config][1] for config in configs])
+		return np.log(costs-costs.min()+1)				# Error cases cost 10000 and more, compress them so they do not dominate the fit
+
+	def subsample(self):
+		"This function returns maxPoints configurations of the archive stratified by cost: one at each of maxPoints evenly spaced ranks by average cost, so the model covers expensive regions as well as the best ones"
+		configs=sorted(self.archive, key=lambda config: self.archive[config][0]/self.archive[config][1])
+		if len(configs)<=self.maxPoints:
+			return configs
+		return [configs[i] for i in np.linspace(0, len(configs)-1, self.maxPoints).round().astype(int)]
+
+	def fit(self):
+		"This function updates the model with the configurations evaluated since the last fit and the new average costs. The model is refitted, choosing a new length scale, once it would hold twice the configurations of its last full fit"
+		configs=self.configs+self.pending
+		if self.model is not None and len(configs)<=2*self.fullSize:
+			try:
+				if len(self.pending)>0:
+					self.model.extend(self.encoder.encode(self.pending), self.targets(configs))
+				else:
+					self.model.setTargets(self.targets(configs))
+				(self.configs, self.pending, self.dirty)=(configs, [], False)
+				return
+			except np.linalg.LinAlgError:					# Refit below
+				pass
+		self.configs=self.subsample()
+		self.model=GaussianProcess()
+		self.model.fit(self.encoder.encode(self.configs), self.targets(self.configs))
+		(self.fullSize, self.pending, self.dirty)=(len(self.configs), [], False)
+
+	def select(self, candidates, count):
+		"This function returns the count candidates (lists of trait values) with the lowest predicted cost lower confidence bound, or the first count candidates while the archive is too small"
+		if len(self.archive)<self.minPoints or len(candidates)<=count:
+			return candidates[:count]
+		if self.dirty or self.model is None:
+			self.fit()
+		(mean, std)=self.model.predict(self.encoder.encode(candidates))
+		order=np.argsort(mean-self.kappa*std, kind="stable")[:count]
+		return [candidates[i] for i in sorted(order)]
+
+#----------------------------------------------------------------------------------------------------------------------------------------------------------
+#			Acquisition
+#----------------------------------------------------------------------------------------------------------------------------------------------------------
+def expectedImprovement(mean, std, best):
+	"This function returns the expected improvement below best of predictions with the given means and standard deviations"
+	z=(best-mean)/std
+	cdf=0.5*(1+np.vectorize(math.erf)(z/math.sqrt(2)))
+	pdf=np.exp(-0.5*z*z)/math.sqrt(2*math.pi)
+	return (best-mean)*cdf+std*pdf